@@ -54,10 +54,77 @@ export const createProject = async (formData) => {
   }
 };
 
-// ✅ 사용자별 프로젝트 목록 조회
-export const getProjects = async (user_id) => {
+// ✅ AI 파이프라인 작업 상태 조회
+export const getPipelineJob = async (job_id) => {
   try {
-    const res = await axios.get(`${API_BASE}/projects/${user_id}/`);
+    const res = await axios.get(`${API_BASE}/jobs/${job_id}/`);
+    return res.data;
+  } catch (error) {
+    console.error("❌ 파이프라인 작업 조회 실패:", error.response?.data || error);
+    throw error;
+  }
+};
+
+// ✅ 파이프라인 작업이 끝날 때까지 주기적으로 상태 확인
+export const waitForPipelineJob = async (
+  job_id,
+  { intervalMs = 3000, timeoutMs = 900000, onProgress } = {}
+) => {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const job = await getPipelineJob(job_id);
+    onProgress?.(job);
+    if (job.status === "completed" || job.status === "failed") {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+  throw new Error("AI 이미지 생성 대기 시간이 초과되었습니다.");
+};
+
+// ✅ 파이프라인 진행 상황 실시간 수신 (SSE, async 엔드포인트 — 서버는 ASGI로 실행). 지원하지 않으면 주기적 조회로 대체
+export const streamPipelineJob = (job_id, { onStep, onVariant } = {}) => {
+  if (typeof window === "undefined" || !window.EventSource) {
+    return waitForPipelineJob(job_id);
+  }
+
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE}/jobs/${job_id}/events/async/`);
+    let finished = false;
+    const finish = (callback) => {
+      finished = true;
+      source.close();
+      callback();
+    };
+    const parse = (event) => JSON.parse(event.data);
+
+    source.addEventListener("step", (event) => onStep?.(parse(event)));
+    source.addEventListener("variant", (event) => {
+      const data = parse(event);
+      onStep?.(data);
+      onVariant?.(data);
+    });
+    source.addEventListener("job", (event) => finish(() => resolve(parse(event))));
+    source.addEventListener("timeout", () =>
+      finish(() => reject(new Error("AI 이미지 생성 대기 시간이 초과되었습니다.")))
+    );
+    source.onerror = () => {
+      // 서버가 응답하지 않으면 EventSource가 재연결을 시도한다. 연결 자체가 닫히면 조회 방식으로 전환한다.
+      if (!finished && source.readyState === EventSource.CLOSED) {
+        finish(() => waitForPipelineJob(job_id).then(resolve, reject));
+      }
+    };
+  });
+};
+
+// ✅ 사용자별 프로젝트 목록 조회 (최신순 커서 페이지)
+// 반환값: { results: [...], next_cursor } — next_cursor가 null이면 마지막 페이지
+export const getProjects = async (user_id, { cursor = null, limit } = {}) => {
+  try {
+    const params = {};
+    if (cursor) params.cursor = cursor;
+    if (limit) params.limit = limit;
+    const res = await axios.get(`${API_BASE}/projects/${user_id}/`, { params });
     return res.data;
   } catch (error) {
     console.error("❌ 프로젝트 목록 조회 실패:", error.response?.data || error);
@@ -65,6 +132,20 @@ export const getProjects = async (user_id) => {
   }
 };
 
+// ✅ 대시보드 한 번에 조회: 프로젝트 첫 페이지(표지 이미지·시안 수 포함) + 통계
+// 반환값: { projects: { results, next_cursor }, stats }
+export const getDashboard = async (user_id, { limit } = {}) => {
+  try {
+    const res = await axios.get(`${API_BASE}/dashboard/${user_id}/`, {
+      params: limit ? { limit } : {},
+    });
+    return res.data;
+  } catch (error) {
+    console.error("❌ 대시보드 조회 실패:", error.response?.data || error);
+    throw error;
+  }
+};
+
 // ✅ 프로젝트 생성 이미지 조회
 export const getProjectAiImages = async (project_id) => {
   try {
@@ -77,11 +158,12 @@ export const getProjectAiImages = async (project_id) => {
 };
 
 // ✅ 프로젝트 이미지 부분 수정
-export const refineProjectImage = async (project_id, image_id, refinement_prompt) => {
+// force: true 이면 같은 요청의 이전 결과(메모)를 무시하고 새로 생성
+export const refineProjectImage = async (project_id, image_id, refinement_prompt, { force = false } = {}) => {
   try {
     const res = await axios.post(
       `${API_BASE}/projects/${project_id}/ai-images/${image_id}/refine/`,
-      { refinement_prompt },
+      { refinement_prompt, force },
       { timeout: 180000 }
     );
     return res.data;
@@ -91,6 +173,21 @@ export const refineProjectImage = async (project_id, image_id, refinement_prompt
   }
 };
 
+// ✅ 일괄 부분 수정: 여러 프롬프트를 한 번에 적용 (결과는 한 번에 반환)
+export const refineProjectImageBatch = async (project_id, image_id, refinement_prompts) => {
+  try {
+    const res = await axios.post(
+      `${API_BASE}/projects/${project_id}/ai-images/${image_id}/refine/batch/`,
+      { refinement_prompts },
+      { timeout: 300000 }
+    );
+    return res.data;
+  } catch (error) {
+    console.error("❌ AI 이미지 일괄 부분 수정 실패:", error.response?.data || error);
+    throw error;
+  }
+};
+
 // ✅ 프로젝트 상태 변경 (진행 중 / 완료 / 대기)
 export const updateProjectStatus = async (project_id, newStatus) => {
   try {
@@ -5,7 +5,7 @@ import ProjectStats from "./ProjectStats";
 import ProjectCards from "./ProjectCards";
 import ProjectTable from "./ProjectTable";
 import NewProjectModal from "./NewProjectModal";
-import { getProjects, getStats } from "../api/projectAPI";
+import { getDashboard, getProjects } from "../api/projectAPI";
 import "../App.css";
 
 const DEFAULT_STATS = {
@@ -24,9 +24,30 @@ const normalizeStatus = (rawStatus) => {
   return value;
 };
 
+const normalizeProjects = (items) =>
+  Array.isArray(items)
+    ? items.map((project) => ({
+        ...project,
+        status: normalizeStatus(project.status),
+        project_image:
+          project.project_image || project.imagePreview || project.image || "",
+        created_at:
+          project.created_at || project.createdAt || project.created_at || null,
+        updated_at:
+          project.updated_at || project.updatedAt || project.updated_at || null,
+        residence_type: project.residence_type || "",
+        space_type: project.space_type || "",
+        budget_range: project.budget_range || "",
+        family_type: project.family_type || "",
+        design_style: project.design_style || "",
+      }))
+    : [];
+
 function Dashboard() {
   const [projects, setProjects] = useState([]);
   const [stats, setStats] = useState(DEFAULT_STATS);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const navigate = useNavigate();
 
@@ -104,42 +125,43 @@ function Dashboard() {
   const fetchData = useCallback(async () => {
     if (!userId) {
       setProjects([]);
+      setNextCursor(null);
       setStats(DEFAULT_STATS);
       return;
     }
 
     try {
-      const [projectResponse, statsResponse] = await Promise.all([
-        getProjects(userId),
-        getStats(userId),
-      ]);
-
-      const normalizedProjects = Array.isArray(projectResponse)
-        ? projectResponse.map((project) => ({
-            ...project,
-            status: normalizeStatus(project.status),
-            project_image:
-              project.project_image || project.imagePreview || project.image || "",
-            created_at:
-              project.created_at || project.createdAt || project.created_at || null,
-            updated_at:
-              project.updated_at || project.updatedAt || project.updated_at || null,
-            residence_type: project.residence_type || "",
-            space_type: project.space_type || "",
-            budget_range: project.budget_range || "",
-            family_type: project.family_type || "",
-            design_style: project.design_style || "",
-          }))
-        : [];
+      const { projects: projectPage, stats: statsResponse } = await getDashboard(userId);
 
-      setProjects(normalizedProjects);
+      setProjects(normalizeProjects(projectPage?.results));
+      setNextCursor(projectPage?.next_cursor || null);
       setStats({ ...DEFAULT_STATS, ...(statsResponse || {}) });
     } catch (error) {
       console.error("❌ 대시보드 데이터 로드 실패:", error);
+      setNextCursor(null);
       loadFallbackProjects();
     }
   }, [userId, loadFallbackProjects]);
 
+  // 다음 커서 페이지를 이어 붙인다.
+  const loadMoreProjects = async () => {
+    if (!userId || !nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await getProjects(userId, { cursor: nextCursor });
+      const loaded = normalizeProjects(page?.results);
+      setProjects((prev) => {
+        const seen = new Set(prev.map((project) => project.id));
+        return [...prev, ...loaded.filter((project) => !seen.has(project.id))];
+      });
+      setNextCursor(page?.next_cursor || null);
+    } catch (error) {
+      console.error("❌ 프로젝트 추가 로드 실패:", error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, [fetchData]);
@@ -352,6 +374,28 @@ function Dashboard() {
                 </div>
               </div>
               <ProjectTable projects={projects} onStatusChange={handleStatusUpdated} />
+              {nextCursor && (
+                <div style={{ textAlign: "center", marginTop: "25px" }}>
+                  <button
+                    type="button"
+                    onClick={loadMoreProjects}
+                    disabled={isLoadingMore}
+                    style={{
+                      padding: "12px 32px",
+                      background: "rgba(255, 255, 255, 0.08)",
+                      color: "#fff",
+                      border: "1px solid rgba(255, 255, 255, 0.15)",
+                      borderRadius: "12px",
+                      fontSize: "0.95rem",
+                      fontWeight: 600,
+                      cursor: isLoadingMore ? "default" : "pointer",
+                      opacity: isLoadingMore ? 0.6 : 1,
+                    }}
+                  >
+                    {isLoadingMore ? "불러오는 중..." : "이전 프로젝트 더 보기"}
+                  </button>
+                </div>
+              )}
             </motion.section>
           </>
         ) : (
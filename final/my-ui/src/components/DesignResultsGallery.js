@@ -1,9 +1,10 @@
 import { useEffect, useMemo, useState } from "react";
 import { motion } from "framer-motion";
 import "../App.css";
+import ResponsiveImage from "./ResponsiveImage";
 
 /**
- * @param {Array} concepts - [{ id, title, description, imageUrl }]
+ * @param {Array} concepts - [{ id, title, description, imageUrl, srcSet }]
  * @param {Function} onSelectionChange - callback(selectedIds)
  * @param {number} maxSelectable - maximum cards that can be selected
  * @param {Function} onRequestRefine - callback(conceptIndex)
@@ -109,7 +110,12 @@ function DesignResultsGallery({
               >
                 <div className="design-card__image">
                   {concept.imageUrl ? (
-                    <img src={concept.imageUrl} alt={concept.title} />
+                    <ResponsiveImage
+                      src={concept.imageUrl}
+                      srcSet={concept.srcSet}
+                      sizes="(max-width: 768px) 100vw, 33vw"
+                      alt={concept.title}
+                    />
                   ) : (
                     <div className="design-card__placeholder">
                       <span role="img" aria-label="placeholder">
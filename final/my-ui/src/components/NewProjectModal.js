@@ -1,7 +1,7 @@
 // ✅ NewProjectModal.js (수정 버전)
 import { useState } from "react";
 import { motion, AnimatePresence } from "framer-motion";
-import { createProject } from "../api/projectAPI";
+import { createProject, streamPipelineJob } from "../api/projectAPI";
 import "./NewProjectModal.css";
 
 function NewProjectModal({ onClose, onCreated }) {
@@ -36,6 +36,9 @@ function NewProjectModal({ onClose, onCreated }) {
         : "";
       return `AI 이미지 ${pipelineImageCount}개가 생성되었습니다.${warning}`;
     }
+    if (pipelineResult.status === "running") {
+      return `AI 이미지 생성 중... (${pipelineImageCount}개 완료)`;
+    }
     if (pipelineResult.status === "failed") {
       return `AI 생성이 실패했습니다: ${pipelineResult.reason}`;
     }
@@ -94,7 +97,24 @@ function NewProjectModal({ onClose, onCreated }) {
 
       const result = await createProject(formData);
 
-      setPipelineResult(result.pipeline);
+      if (result.job_id) {
+        setPipelineResult({ status: "running", images: [] });
+        const job = await streamPipelineJob(result.job_id, {
+          onVariant: ({ image_id, image_url }) =>
+            setPipelineResult((prev) => {
+              if (prev?.status !== "running") return prev;
+              const images = [...prev.images, { image_id, image_url }];
+              return {
+                ...prev,
+                images,
+                preview_url: prev.preview_url ?? image_url,
+              };
+            }),
+        });
+        setPipelineResult(job.pipeline);
+      } else {
+        setPipelineResult(result.pipeline);
+      }
       onCreated?.(result);
     } catch (error) {
       console.error("❌ 프로젝트 생성 실패:", error.response?.data || error);
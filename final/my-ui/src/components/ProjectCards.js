@@ -1,5 +1,6 @@
 import { useEffect, useMemo, useState } from "react";
 import "../App.css";
+import ResponsiveImage from "./ResponsiveImage";
 
 const CARDS_PER_PAGE = 4;
 
@@ -38,7 +39,11 @@ function ProjectCards({ projects = [] }) {
       <div className="project-cards">
         {paginatedProjects.length > 0 ? (
           paginatedProjects.map((p) => {
-            const imageSrc = p.project_image || p.imagePreview || p.image || "";
+            const imageSrc =
+              p.cover_image || p.project_image || p.imagePreview || p.image || "";
+            const imageSrcSet = p.cover_image
+              ? p.cover_image_sizes?.srcset
+              : p.project_image_sizes?.srcset;
             const hasImage = Boolean(imageSrc);
 
             return (
@@ -47,7 +52,12 @@ function ProjectCards({ projects = [] }) {
                   className={`project-card__media ${hasImage ? "has-image" : ""}`}
                 >
                   {hasImage ? (
-                    <img src={imageSrc} alt={p.title} />
+                    <ResponsiveImage
+                      src={imageSrc}
+                      srcSet={imageSrcSet}
+                      sizes="(max-width: 768px) 100vw, 320px"
+                      alt={p.title}
+                    />
                   ) : (
                     <div className="project-card__placeholder">
                       <span>이미지가 준비되지 않았습니다</span>
@@ -61,6 +71,7 @@ function ProjectCards({ projects = [] }) {
                     {p.created_at || p.createdAt
                       ? new Date(p.created_at || p.createdAt).toLocaleDateString()
                       : "-"}
+                    {p.variant_count > 0 && ` · AI 시안 ${p.variant_count}개`}
                   </span>
                 </div>
               </div>
@@ -0,0 +1,32 @@
+import { useEffect, useState } from "react";
+
+/**
+ * <img> that prefers the server's thumbnail/medium derivatives.
+ * If a derivative fails to load (e.g. not generated yet), it falls back to the original.
+ *
+ * @param {string} src - full-size image URL
+ * @param {string} srcSet - "url 320w, url 768w, url 1024w" from the list endpoints
+ * @param {string} sizes - rendered width hint for the browser
+ */
+function ResponsiveImage({ src, srcSet, sizes, alt, ...rest }) {
+  const [useDerivatives, setUseDerivatives] = useState(Boolean(srcSet));
+
+  useEffect(() => {
+    setUseDerivatives(Boolean(srcSet));
+  }, [src, srcSet]);
+
+  return (
+    <img
+      {...rest}
+      src={src}
+      srcSet={useDerivatives ? srcSet : undefined}
+      sizes={useDerivatives ? sizes : undefined}
+      alt={alt}
+      loading="lazy"
+      decoding="async"
+      onError={() => setUseDerivatives(false)}
+    />
+  );
+}
+
+export default ResponsiveImage;
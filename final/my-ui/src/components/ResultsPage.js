@@ -35,6 +35,7 @@ function ResultsPage() {
           image.space_type ||
           "생성된 인테리어 디자인",
         imageUrl: image.image_url,
+        srcSet: image.srcset,
         isSelected: image.is_selected,
       }));
       setConcepts(mapped);
@@ -0,0 +1,17 @@
+# gunicorn.conf.py
+# gunicorn myproject.wsgi -c gunicorn.conf.py
+# 진행 상황 SSE(/jobs/<id>/events/async/)를 연결 유지로 보내려면 ASGI로 실행한다:
+#   gunicorn myproject.asgi:application -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py
+# WSGI 워커에서는 스트림 하나가 워커 하나를 점유하므로 동기 /events/ 는 스냅샷만 보낸다.
+# PROMETHEUS_MULTIPROC_DIR 가 설정되어 있으면 /metrics 가 모든 워커의 값을 합산한다.
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 in-flight 게이지가 합계에 남지 않도록 정리한다.
+    from interior.services.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
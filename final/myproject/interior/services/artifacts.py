@@ -0,0 +1,154 @@
+import io
+import threading
+from typing import Dict, Optional, Union
+
+from PIL import Image
+
+from .errors import PipelineStepError
+
+FORMAT_MIMETYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+    "GIF": "image/gif",
+    "BMP": "image/bmp",
+    "TIFF": "image/tiff",
+}
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif", "BMP": "bmp", "TIFF": "tiff"}
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """Return the PIL format name for ``data`` from its magic bytes, or None."""
+    head = bytes(data[:16])
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    return None
+
+
+def sniff_mimetype(data: bytes) -> Optional[str]:
+    return FORMAT_MIMETYPES.get(sniff_format(data) or "")
+
+
+class ImageArtifact:
+    """Encoded image bytes with lazily decoded pixels.
+
+    Bytes received from a provider are kept as-is and handed on untouched when
+    the next consumer accepts their format. Pixels are decoded only when a
+    different format is requested, and each format is encoded at most once.
+    """
+
+    def __init__(
+        self,
+        data: Optional[bytes] = None,
+        *,
+        format: Optional[str] = None,
+        image: Optional[Image.Image] = None,
+    ):
+        if data is None and image is None:
+            raise ValueError("data 또는 image 중 하나는 필요합니다.")
+        self._image = image
+        self._encodings: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.format = None
+        if data is not None:
+            self.format = (format or sniff_format(data) or "").upper() or None
+            if not self.format:
+                # Unknown container: decode once to learn what it is.
+                self._image = self._decode(data)
+                self.format = self._image.format
+            self._encodings[self.format] = bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, format: Optional[str] = None) -> "ImageArtifact":
+        return cls(data, format=format)
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "ImageArtifact":
+        return cls(image=image)
+
+    @staticmethod
+    def _decode(data: bytes) -> Image.Image:
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        except OSError as exc:
+            # Includes UnidentifiedImageError and truncated files.
+            raise PipelineStepError(f"이미지를 해석할 수 없습니다: {exc}") from exc
+        return image
+
+    @property
+    def data(self) -> bytes:
+        """The original encoded bytes (encoding to WEBP if built from pixels only)."""
+        if self.format is None:
+            return self.encoded("WEBP")
+        return self._encodings[self.format]
+
+    @property
+    def mimetype(self) -> str:
+        return FORMAT_MIMETYPES.get(self.format or "WEBP", "application/octet-stream")
+
+    @property
+    def extension(self) -> str:
+        return FORMAT_EXTENSIONS.get(self.format or "WEBP", "bin")
+
+    @property
+    def image(self) -> Image.Image:
+        """Decoded pixels, decoded on first access."""
+        with self._lock:
+            if self._image is None:
+                self._image = self._decode(self._encodings[self.format])
+            return self._image
+
+    def has_encoding(self, format: str) -> bool:
+        return format.upper() in self._encodings
+
+    def encoded(self, format: str = "WEBP", **save_options) -> bytes:
+        """Return the image encoded as ``format``, reusing earlier encodings."""
+        format = format.upper()
+        cached = self._encodings.get(format)
+        if cached is not None:
+            return cached
+
+        image = self.image
+        with self._lock:
+            cached = self._encodings.get(format)
+            if cached is None:
+                buffer = io.BytesIO()
+                image.save(buffer, format=format, **save_options)
+                cached = self._encodings[format] = buffer.getvalue()
+        if self.format is None:
+            self.format = format
+        return cached
+
+    def release_pixels(self) -> None:
+        """Drop decoded pixels once no more transcodes are expected."""
+        with self._lock:
+            if self._encodings:
+                self._image = None
+
+
+ImageLike = Union[ImageArtifact, Image.Image, bytes]
+
+
+def as_artifact(value: ImageLike) -> ImageArtifact:
+    if isinstance(value, ImageArtifact):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return ImageArtifact.from_bytes(bytes(value))
+    return ImageArtifact.from_image(value)
+
+
+__all__ = [
+    "FORMAT_MIMETYPES",
+    "ImageArtifact",
+    "ImageLike",
+    "as_artifact",
+    "sniff_format",
+    "sniff_mimetype",
+]
@@ -0,0 +1,200 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .metrics import record_cache_lookup, record_cache_write
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts) -> str:
+    """Return a sha256 hex digest over ``parts`` (bytes or str)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """Size-bounded, content-addressed byte cache on local disk.
+
+    Entries are plain files under ``root``; reads refresh the file mtime so
+    eviction removes the least recently used entries first. The directory can
+    be shared by several worker processes.
+
+    Writes keep a running byte total, seeded by one scan here, and the
+    directory is only rescanned once that total passes ``max_bytes``. Other
+    processes' writes are picked up by that rescan.
+    """
+
+    def __init__(self, root: str, max_bytes: int, *, name: str = "cache"):
+        self.root = str(root)
+        self.max_bytes = int(max_bytes)
+        self.name = name
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(self.root, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cached:
+                data = cached.read()
+        except FileNotFoundError:
+            self._count("misses")
+            record_cache_lookup(self.name, False)
+            return None
+        except OSError as exc:
+            logger.warning("%s 캐시 읽기 실패(%s): %s", self.name, key, exc)
+            self._count("misses")
+            record_cache_lookup(self.name, False)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        record_cache_lookup(self.name, True)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if not data or len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError as exc:
+            logger.warning("%s 캐시 쓰기 실패(%s): %s", self.name, key, exc)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._counters["writes"] += 1
+            self._bytes += len(data) - replaced
+            over_limit = self._bytes > self.max_bytes
+        evicted = self._evict() if over_limit else 0
+        record_cache_write(self.name, evicted=evicted)
+
+    def _entries(self):
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> int:
+        entries = list(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        evicted = 0
+        if total > self.max_bytes:
+            for path, size, _ in sorted(entries, key=lambda item: item[2]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._bytes = total
+            self._counters["evictions"] += evicted
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        entries = list(self._entries())
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update(
+            {
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+        )
+        return counters
+
+
+class MemoryLRUCache:
+    """In-process byte cache bounded by total size, evicting least recently used."""
+
+    def __init__(self, max_bytes: int, *, name: str = "memory"):
+        self.max_bytes = int(max_bytes)
+        self.name = name
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self._counters["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+        record_cache_lookup(self.name, data is not None)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = data
+            self._bytes += len(data)
+            self._counters["writes"] += 1
+            evicted = 0
+            while self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+                evicted += 1
+            self._counters["evictions"] += evicted
+        record_cache_write(self.name, evicted=evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+        return counters
+
+
+__all__ = ["DiskLRUCache", "MemoryLRUCache", "content_key"]
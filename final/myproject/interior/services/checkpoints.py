@@ -0,0 +1,68 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .artifacts import ImageArtifact
+
+# Stage names shared by the pipeline and checkpoint stores.
+STAGE_NORMALIZE = "normalize"
+STAGE_EMPTY_ROOM = "empty_room"
+
+
+def variant_stage(index: int, stage: str) -> str:
+    """``variant_{index}.{stage}``, e.g. ``variant_2.step3`` or ``variant_2.done``."""
+    return f"variant_{index}.{stage}"
+
+
+@dataclass
+class Checkpoint:
+    stage: str
+    image: Optional[ImageArtifact] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class CheckpointStore:
+    """Where the pipeline keeps finished stages so a re-run can resume.
+
+    The base class stores nothing. Implementations must not raise from
+    :meth:`save`; a lost checkpoint only means the stage runs again.
+    """
+
+    def has(self, stage: str) -> bool:
+        return False
+
+    def load(self, stage: str) -> Optional[Checkpoint]:
+        return None
+
+    def save(self, stage: str, image: Optional[ImageArtifact] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Process-local store, for tests and offline runs."""
+
+    def __init__(self):
+        self._checkpoints: Dict[str, Checkpoint] = {}
+        self._lock = threading.Lock()
+
+    def has(self, stage: str) -> bool:
+        with self._lock:
+            return stage in self._checkpoints
+
+    def load(self, stage: str) -> Optional[Checkpoint]:
+        with self._lock:
+            return self._checkpoints.get(stage)
+
+    def save(self, stage: str, image: Optional[ImageArtifact] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._checkpoints[stage] = Checkpoint(stage, image, dict(meta or {}))
+
+
+__all__ = [
+    "Checkpoint",
+    "CheckpointStore",
+    "MemoryCheckpointStore",
+    "STAGE_EMPTY_ROOM",
+    "STAGE_NORMALIZE",
+    "variant_stage",
+]
@@ -1,9 +1,25 @@
+import asyncio
+import os
+import weakref
+from contextlib import contextmanager
 from functools import lru_cache
+from typing import Dict
 
 import google.generativeai as genai
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from .cache import DiskLRUCache
+from .resilience import (
+    FileStateStore,
+    GuardConfig,
+    GuardedGenerativeModel,
+    GuardedOpenAIClient,
+    ProviderGuardRegistry,
+)
+from .gemini_files import GEMINI_FILE_TTL_SECONDS, GeminiUploadCache
+from .hedging import HedgedCaller, RetryPolicy
 
 
 def _get_setting(name: str) -> str:
@@ -13,16 +29,140 @@ def _get_setting(name: str) -> str:
     return value
 
 
+# Stand-ins installed by override_providers(), keyed by factory.
+_overrides: Dict[str, object] = {}
+
+
+@lru_cache(maxsize=1)
+def get_provider_guards() -> ProviderGuardRegistry:
+    """제공자/모델별 호출 한도와 회로 차단기 상태를 반환한다 (워커 프로세스 간 공유)."""
+    path = getattr(settings, "PROVIDER_GUARD_STATE_PATH", None) or os.path.join(
+        settings.PIPELINE_CACHE_DIR, "provider_guards.json"
+    )
+    breaker = {
+        "failure_threshold": getattr(settings, "PROVIDER_BREAKER_FAILURES", 5),
+        "reset_seconds": getattr(settings, "PROVIDER_BREAKER_RESET_SECONDS", 60),
+        "max_wait_seconds": getattr(settings, "PROVIDER_MAX_WAIT_SECONDS", 30),
+    }
+    defaults = {
+        "openai": GuardConfig(
+            rate_per_minute=getattr(settings, "OPENAI_IMAGE_RATE_PER_MINUTE", 50),
+            burst=getattr(settings, "OPENAI_IMAGE_BURST", 10),
+            **breaker,
+        ),
+        "gemini": GuardConfig(
+            rate_per_minute=getattr(settings, "GEMINI_RATE_PER_MINUTE", 60),
+            burst=getattr(settings, "GEMINI_BURST", 10),
+            **breaker,
+        ),
+    }
+    return ProviderGuardRegistry(
+        FileStateStore(path),
+        defaults=defaults,
+        overrides=getattr(settings, "PROVIDER_GUARD_OVERRIDES", None),
+    )
+
+
 @lru_cache(maxsize=1)
 def get_openai_client() -> OpenAI:
-    """OpenAI 클라이언트를 반환한다."""
+    """OpenAI 클라이언트를 반환한다. 호출은 공유 한도/회로 차단기를 거친다."""
+    if "openai" in _overrides:
+        return _overrides["openai"]
     api_key = _get_setting("OPENAI_TEAM_API_KEY")
-    return OpenAI(api_key=api_key)
+    return GuardedOpenAIClient(OpenAI(api_key=api_key), get_provider_guards())
+
+
+_async_openai_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """현재 이벤트 루프에 묶인 AsyncOpenAI 클라이언트를 반환한다.
+
+    httpx 비동기 커넥션 풀은 생성된 루프에서만 쓸 수 있으므로 루프마다 하나씩 만든다.
+    """
+    if "async_openai" in _overrides:
+        return _overrides["async_openai"]
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        api_key = _get_setting("OPENAI_TEAM_API_KEY")
+        client = GuardedOpenAIClient(AsyncOpenAI(api_key=api_key), get_provider_guards(), is_async=True)
+        _async_openai_clients[loop] = client
+    return client
 
 
 @lru_cache(maxsize=None)
 def get_generative_model(model_name: str = "gemini-2.5-flash-image"):
-    """Gemini GenerativeModel 인스턴스를 반환한다."""
+    """Gemini GenerativeModel 인스턴스를 반환한다. 호출은 공유 한도/회로 차단기를 거친다."""
+    if "generative_model" in _overrides:
+        return _overrides["generative_model"]
     api_key = _get_setting("GEMINI_API_KEY")
     genai.configure(api_key=api_key)
-    return genai.GenerativeModel(model_name)
+    return GuardedGenerativeModel(genai.GenerativeModel(model_name), get_provider_guards(), model_name)
+
+
+@lru_cache(maxsize=1)
+def get_empty_room_cache():
+    """빈 방 이미지 캐시를 반환한다. 용량이 0이면 캐시를 사용하지 않는다."""
+    max_bytes = getattr(settings, "EMPTY_ROOM_CACHE_MAX_BYTES", 0)
+    if not max_bytes:
+        return None
+    root = os.path.join(settings.PIPELINE_CACHE_DIR, "empty_room")
+    return DiskLRUCache(root, max_bytes, name="empty_room")
+
+
+@lru_cache(maxsize=1)
+def get_gemini_upload_cache() -> GeminiUploadCache:
+    """프로세스 전체에서 공유하는 Gemini 업로드 핸들 캐시를 반환한다."""
+    if "upload_cache" in _overrides:
+        return _overrides["upload_cache"]
+    return GeminiUploadCache(
+        ttl_seconds=getattr(settings, "GEMINI_FILE_TTL_SECONDS", GEMINI_FILE_TTL_SECONDS),
+        idle_seconds=getattr(settings, "GEMINI_UPLOAD_IDLE_SECONDS", 2 * 60 * 60),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_gemini_caller() -> HedgedCaller:
+    """Gemini 3단계 호출용 재시도/헤지 실행기를 반환한다 (프로세스 내 지연 통계 공유)."""
+    return HedgedCaller(
+        retry=RetryPolicy(
+            max_attempts=getattr(settings, "GEMINI_RETRY_ATTEMPTS", 3),
+            base_delay=getattr(settings, "GEMINI_RETRY_BASE_DELAY", 1.0),
+            max_delay=getattr(settings, "GEMINI_RETRY_MAX_DELAY", 10.0),
+        ),
+        hedging=getattr(settings, "GEMINI_HEDGE_ENABLED", True),
+        hedge_percentile=getattr(settings, "GEMINI_HEDGE_PERCENTILE", 0.95),
+        hedges_per_minute=getattr(settings, "GEMINI_HEDGES_PER_MINUTE", 10),
+        min_timeout=getattr(settings, "GEMINI_MIN_TIMEOUT_SECONDS", 30),
+    )
+
+
+def _clear_cached_clients() -> None:
+    get_openai_client.cache_clear()
+    get_generative_model.cache_clear()
+    get_gemini_upload_cache.cache_clear()
+    _async_openai_clients.clear()
+
+
+@contextmanager
+def override_providers(*, openai_client=None, async_openai_client=None, generative_model=None, upload_cache=None):
+    """지정한 대체 클라이언트를 위 팩토리들이 반환하게 한다 (벤치마크/오프라인 실행용).
+
+    진입과 종료 시 캐시된 클라이언트를 비워 실제 클라이언트와 섞이지 않게 한다.
+    """
+    previous = dict(_overrides)
+    replacements = {
+        "openai": openai_client,
+        "async_openai": async_openai_client,
+        "generative_model": generative_model,
+        "upload_cache": upload_cache,
+    }
+    _overrides.update({key: value for key, value in replacements.items() if value is not None})
+    _clear_cached_clients()
+    try:
+        yield
+    finally:
+        _overrides.clear()
+        _overrides.update(previous)
+        _clear_cached_clients()
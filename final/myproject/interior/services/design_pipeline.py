@@ -1,16 +1,43 @@
+import asyncio
 import base64
+import inspect
 import io
 import logging
 import mimetypes
 import os
-from typing import Callable, Dict, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import google.generativeai as genai
-from PIL import Image
+from django.db import connections
+from PIL import Image, ImageOps
+
+from .artifacts import ImageArtifact, ImageLike, as_artifact, sniff_mimetype
+from .cache import DiskLRUCache, content_key
+from .checkpoints import STAGE_EMPTY_ROOM, STAGE_NORMALIZE, CheckpointStore, variant_stage
+from .errors import PipelineStepError
+from .gemini_files import GeminiUploadCache
+from .metrics import (
+    NORMALIZE_INPUT,
+    PIPELINE_IN_FLIGHT,
+    STEP3_GENERATE,
+    STEP3_UPLOAD,
+    STEP4,
+    STEP_EMPTY_ROOM,
+    WEBP_ENCODE,
+    observe_step,
+    record_input_normalized,
+    record_transfer,
+    track_in_flight,
+)
 
 logger = logging.getLogger(__name__)
 
 SUPPORTED_IMAGE_MIMETYPES = ("image/jpeg", "image/png", "image/webp")
+EMPTY_ROOM_MODEL = "gpt-image-1"
+REFINEMENT_MODEL = "gpt-image-1"
+DEFAULT_SOURCE_QUALITY = 85
+EXIF_ORIENTATION_TAG = 0x0112
 
 DEFAULT_EMPTY_ROOM_PROMPT = """
 # Your Mission
@@ -26,8 +53,36 @@ DEFAULT_EMPTY_ROOM_PROMPT = """
 """.strip()
 
 
-class PipelineStepError(RuntimeError):
-    """Raised when a pipeline step fails."""
+ProgressCallback = Callable[[str, str, Dict[str, Any]], None]
+VariantCallback = Callable[[Dict[str, object]], Any]
+# A filesystem path, raw bytes, an ImageArtifact or a binary file-like object.
+ImageSource = Union[str, os.PathLike, bytes, ImageArtifact, BinaryIO]
+
+
+class PipelineCancelled(PipelineStepError):
+    """Raised when ``should_stop`` asks a run to give up, e.g. after its job lease was lost."""
+
+
+_CANCELLED_MESSAGE = "파이프라인 실행이 중단되었습니다."
+
+
+def _stopped(should_stop: Optional[Callable[[], bool]]) -> bool:
+    return should_stop is not None and should_stop()
+
+
+def _notify(callback: Optional[ProgressCallback], step: str, state: str, **detail: Any) -> None:
+    if callback is None:
+        return
+    try:
+        callback(step, state, detail)
+    except Exception:  # pragma: no cover - progress reporting must not break the pipeline
+        logger.warning("진행 상황 콜백 실행 실패: %s/%s", step, state, exc_info=True)
+
+
+async def _anotify(callback: Optional[ProgressCallback], step: str, state: str, **detail: Any) -> None:
+    # Callbacks may touch the database, so keep them off the event loop.
+    if callback is not None:
+        await asyncio.to_thread(_notify, callback, step, state, **detail)
 
 
 def _ensure_source_exists(path: str) -> None:
@@ -35,8 +90,10 @@ def _ensure_source_exists(path: str) -> None:
         raise PipelineStepError(f"이미지 파일을 찾을 수 없습니다: {path}")
 
 
-def _detect_mimetype(path: str) -> str:
-    mimetype, _ = mimetypes.guess_type(path)
+def _detect_mimetype(path: str, data: Optional[bytes] = None) -> str:
+    mimetype = sniff_mimetype(data) if data else None
+    if mimetype is None:
+        mimetype, _ = mimetypes.guess_type(path)
     if mimetype not in SUPPORTED_IMAGE_MIMETYPES:
         raise PipelineStepError(
             f"지원하지 않는 이미지 형식입니다: {mimetype or 'unknown'} "
@@ -52,61 +109,94 @@ def _decode_image_bytes(encoded: str) -> bytes:
         raise PipelineStepError("이미지 데이터를 디코딩하지 못했습니다.") from exc
 
 
-def generate_empty_room(
-    original_image_path: str,
-    openai_client,
-    *,
-    prompt: Optional[str] = None,
-    size: str = "1024x1024",
-) -> Image.Image:
-    """Generate an empty room image from the original input."""
-    logger.info("1단계 시작: 빈 방 이미지 생성 (%s)", original_image_path)
-    _ensure_source_exists(original_image_path)
-    mimetype = _detect_mimetype(original_image_path)
+def _artifact(image_bytes: bytes) -> ImageArtifact:
+    artifact = ImageArtifact.from_bytes(image_bytes)
+    if artifact.format is None:
+        raise PipelineStepError("이미지 형식을 인식하지 못했습니다.")
+    return artifact
 
-    with open(original_image_path, "rb") as img_file:
-        image_data = img_file.read()
-
-    payload_prompt = prompt or DEFAULT_EMPTY_ROOM_PROMPT
 
+def _encode_webp(image: ImageLike, error_message: str) -> bytes:
+    artifact = as_artifact(image)
+    if artifact.has_encoding("WEBP"):
+        return artifact.encoded("WEBP")
     try:
-        response = openai_client.images.edit(
-            model="gpt-image-1",
-            image=(os.path.basename(original_image_path), image_data, mimetype),
-            prompt=payload_prompt,
-            size=size,
-        )
+        with observe_step(WEBP_ENCODE):
+            return artifact.encoded("WEBP")
     except Exception as exc:
-        raise PipelineStepError("OpenAI 이미지 편집 API 호출에 실패했습니다.") from exc
+        raise PipelineStepError(error_message) from exc
 
+
+def _openai_image_bytes(response, missing_message: str) -> bytes:
     try:
         encoded = response.data[0].b64_json
     except (AttributeError, IndexError, KeyError) as exc:
-        raise PipelineStepError("OpenAI 응답에 이미지 데이터가 포함되어 있지 않습니다.") from exc
+        raise PipelineStepError(missing_message) from exc
+    return _decode_image_bytes(encoded)
 
-    image_bytes = _decode_image_bytes(encoded)
-    result = Image.open(io.BytesIO(image_bytes))
-    result.load()
-    logger.info("1단계 완료: 빈 방 이미지 생성 성공")
-    return result
 
+def _gemini_image_bytes(response) -> bytes:
+    candidates = getattr(response, "candidates", None)
+    if not candidates:
+        raise PipelineStepError("Gemini 응답에 후보 결과가 없습니다.")
 
-def step3_add_local_furniture(
-    empty_room_image: Image.Image,
-    style_prompt: str,
-    furniture_paths: Optional[Sequence[str]],
-    *,
-    generative_model,
-    upload_file_func: Optional[Callable[[io.BytesIO, str], object]] = None,
-    timeout: int = 180,
-) -> Image.Image:
-    """Apply style and furniture to the empty room using Gemini."""
-    if generative_model is None:
-        raise PipelineStepError("Gemini 모델 인스턴스가 필요합니다.")
+    image_bytes: Optional[bytes] = None
+    text_messages = []
+    for part in candidates[0].content.parts:
+        inline_data = getattr(part, "inline_data", None)
+        if inline_data:
+            data = getattr(inline_data, "data", None)
+            if isinstance(data, str):
+                image_bytes = _decode_image_bytes(data)
+            elif isinstance(data, bytes):
+                image_bytes = data
+            if image_bytes:
+                break
+        text = getattr(part, "text", None)
+        if text:
+            text_messages.append(text)
+
+    if image_bytes is None:
+        detail = " / ".join(text_messages) if text_messages else "이미지 출력 없음"
+        raise PipelineStepError(f"Gemini가 이미지를 반환하지 않았습니다. 응답: {detail}")
+    return image_bytes
 
-    upload_func = upload_file_func or genai.upload_file
 
-    prompt = f"""
+def _source_label(source: ImageSource) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, "name", None) or type(source).__name__
+
+
+def _read_empty_room_source(source: ImageSource) -> Tuple[bytes, str, str]:
+    """Return ``(bytes, mimetype, filename)`` for a path, bytes, artifact or file-like source.
+
+    The mimetype comes from the magic bytes; the file extension is only a
+    fallback for paths.
+    """
+    if isinstance(source, ImageArtifact):
+        data, name = source.data, "source"
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        data, name = bytes(source), "source"
+    elif hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        data, name = source.read(), os.path.basename(getattr(source, "name", "") or "source")
+    else:
+        path = os.fspath(source)
+        _ensure_source_exists(path)
+        with open(path, "rb") as img_file:
+            data, name = img_file.read(), os.path.basename(path)
+
+    if not data:
+        raise PipelineStepError("원본 이미지가 비어 있습니다.")
+    mimetype = _detect_mimetype(name, data)
+    extension = mimetypes.guess_extension(mimetype) or ""
+    return data, mimetype, os.path.splitext(name)[0] + extension
+
+
+def _step3_prompt(style_prompt: str, furniture_paths: Optional[Sequence[str]]) -> str:
+    return f"""
     당신은 AI 인테리어 디자이너입니다.
     '빈 방' 이미지(입력 1)를 베이스로, '가구' 이미지(입력 2...)들을 배치하세요.
 
@@ -127,13 +217,202 @@ def step3_add_local_furniture(
     - 오직 모든 요소가 합성된 최종 이미지 파일 하나만 반환하세요.
     """.strip()
 
-    logger.info("3단계 시작: 스타일 적용 및 가구 배치")
+
+def _target_edge(size: str) -> int:
+    try:
+        return max(int(part) for part in size.lower().split("x"))
+    except ValueError:
+        return 1024
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+
+
+def normalize_input_image(
+    source: ImageSource,
+    *,
+    max_edge: int = 1024,
+    quality: int = DEFAULT_SOURCE_QUALITY,
+) -> Tuple[ImageArtifact, Dict[str, int]]:
+    """Orient, downscale and re-encode the source photo before it is uploaded.
+
+    JPEGs are decoded in draft mode, letting the decoder scale by 1/2 to 1/8
+    instead of decoding every pixel of a 12-48 MP photo. The original bytes
+    are kept when the image is already upright, small enough and re-encoding
+    would not shrink it. Returns the artifact and byte/size statistics.
+    """
+    data, _, _ = _read_empty_room_source(source)
+
+    with observe_step(NORMALIZE_INPUT):
+        try:
+            image = Image.open(io.BytesIO(data))
+            original_size = image.size
+            orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+            if image.format == "JPEG":
+                image.draft("RGB", (max_edge, max_edge))
+            image = ImageOps.exif_transpose(image)
+            resized = max(image.size) > max_edge
+            if resized:
+                image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            if _has_alpha(image):
+                output_format = "WEBP"
+                image.save(buffer, format="WEBP", quality=quality)
+            else:
+                output_format = "JPEG"
+                image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+        except Exception as exc:
+            raise PipelineStepError("원본 이미지를 읽을 수 없습니다.") from exc
+
+    encoded = buffer.getvalue()
+    changed = resized or orientation != 1 or max(image.size) != max(original_size)
+    if changed or len(encoded) < len(data):
+        artifact = ImageArtifact.from_bytes(encoded, format=output_format)
+    else:
+        artifact = ImageArtifact.from_bytes(data)
+
+    normalized_bytes = len(artifact.data)
+    record_input_normalized(len(data), normalized_bytes)
+    stats = {
+        "original_bytes": len(data),
+        "bytes": normalized_bytes,
+        "bytes_saved": len(data) - normalized_bytes,
+        "original_width": original_size[0],
+        "original_height": original_size[1],
+        "width": image.size[0],
+        "height": image.size[1],
+    }
+    logger.info(
+        "원본 이미지 정규화: %dx%d → %dx%d, %d → %d bytes",
+        original_size[0], original_size[1], image.size[0], image.size[1], len(data), normalized_bytes,
+    )
+    return artifact, stats
+
+
+def generate_empty_room(
+    original_image: ImageSource,
+    openai_client,
+    *,
+    prompt: Optional[str] = None,
+    size: str = "1024x1024",
+    cache: Optional[DiskLRUCache] = None,
+) -> ImageArtifact:
+    """Generate an empty room image from the original input.
+
+    With ``cache`` set, results are keyed by the source bytes, prompt and size
+    so a re-uploaded photo skips the OpenAI call.
+    """
+    logger.info("1단계 시작: 빈 방 이미지 생성 (%s)", _source_label(original_image))
+    image_data, mimetype, filename = _read_empty_room_source(original_image)
+    payload_prompt = prompt or DEFAULT_EMPTY_ROOM_PROMPT
+
+    cache_key = None
+    if cache is not None:
+        cache_key = content_key(image_data, payload_prompt, size, EMPTY_ROOM_MODEL)
+        cached = cache.get(cache_key)
+        if cached:
+            logger.info("1단계 완료: 빈 방 이미지 캐시 적중 (%s)", cache_key[:12])
+            return _artifact(cached)
 
     try:
-        base_stream = io.BytesIO()
-        empty_room_image.save(base_stream, format="WEBP")
-        base_stream.seek(0)
-        base_room_file = upload_func(base_stream, mime_type="image/webp")
+        with observe_step(STEP_EMPTY_ROOM):
+            response = openai_client.images.edit(
+                model=EMPTY_ROOM_MODEL,
+                image=(filename, image_data, mimetype),
+                prompt=payload_prompt,
+                size=size,
+            )
+    except PipelineStepError:
+        raise
+    except Exception as exc:
+        raise PipelineStepError("OpenAI 이미지 편집 API 호출에 실패했습니다.") from exc
+
+    image_bytes = _openai_image_bytes(response, "OpenAI 응답에 이미지 데이터가 포함되어 있지 않습니다.")
+    record_transfer("openai", sent=len(image_data), received=len(image_bytes))
+    result = _artifact(image_bytes)
+    if cache_key is not None:
+        cache.set(cache_key, image_bytes)
+    logger.info("1단계 완료: 빈 방 이미지 생성 성공")
+    return result
+
+
+async def agenerate_empty_room(
+    original_image: ImageSource,
+    openai_client,
+    *,
+    prompt: Optional[str] = None,
+    size: str = "1024x1024",
+    cache: Optional[DiskLRUCache] = None,
+) -> ImageArtifact:
+    """Async counterpart of :func:`generate_empty_room` for an ``AsyncOpenAI`` client."""
+    logger.info("1단계 시작: 빈 방 이미지 생성 (%s)", _source_label(original_image))
+    image_data, mimetype, filename = await asyncio.to_thread(_read_empty_room_source, original_image)
+    payload_prompt = prompt or DEFAULT_EMPTY_ROOM_PROMPT
+
+    cache_key = None
+    if cache is not None:
+        cache_key = content_key(image_data, payload_prompt, size, EMPTY_ROOM_MODEL)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached:
+            logger.info("1단계 완료: 빈 방 이미지 캐시 적중 (%s)", cache_key[:12])
+            return _artifact(cached)
+
+    try:
+        with observe_step(STEP_EMPTY_ROOM):
+            response = await openai_client.images.edit(
+                model=EMPTY_ROOM_MODEL,
+                image=(filename, image_data, mimetype),
+                prompt=payload_prompt,
+                size=size,
+            )
+    except PipelineStepError:
+        raise
+    except Exception as exc:
+        raise PipelineStepError("OpenAI 이미지 편집 API 호출에 실패했습니다.") from exc
+
+    image_bytes = _openai_image_bytes(response, "OpenAI 응답에 이미지 데이터가 포함되어 있지 않습니다.")
+    record_transfer("openai", sent=len(image_data), received=len(image_bytes))
+    result = _artifact(image_bytes)
+    if cache_key is not None:
+        await asyncio.to_thread(cache.set, cache_key, image_bytes)
+    logger.info("1단계 완료: 빈 방 이미지 생성 성공")
+    return result
+
+
+def upload_step3_inputs(
+    empty_room_image: ImageLike,
+    furniture_paths: Optional[Sequence[str]],
+    *,
+    upload_file_func: Optional[Callable[[io.BytesIO, str], object]] = None,
+    upload_cache: Optional[GeminiUploadCache] = None,
+) -> Tuple[object, List[object]]:
+    """Upload the empty room and furniture images to Gemini and return their handles."""
+    with observe_step(STEP3_UPLOAD):
+        return _upload_step3_inputs(empty_room_image, furniture_paths, upload_file_func, upload_cache)
+
+
+def _upload_step3_inputs(
+    empty_room_image: ImageLike,
+    furniture_paths: Optional[Sequence[str]],
+    upload_file_func: Optional[Callable[[io.BytesIO, str], object]],
+    upload_cache: Optional[GeminiUploadCache],
+) -> Tuple[object, List[object]]:
+    upload_func = upload_file_func or genai.upload_file
+
+    def _upload(data: bytes, mime_type: str):
+        if upload_cache is not None:
+            return upload_cache.upload(data, mime_type)
+        handle = upload_func(io.BytesIO(data), mime_type=mime_type)
+        record_transfer("gemini", sent=len(data))
+        return handle
+
+    try:
+        base_bytes = _encode_webp(empty_room_image, "빈 방 이미지를 Gemini에 업로드하지 못했습니다.")
+        base_room_file = _upload(base_bytes, "image/webp")
+    except PipelineStepError:
+        raise
     except Exception as exc:
         raise PipelineStepError("빈 방 이미지를 Gemini에 업로드하지 못했습니다.") from exc
 
@@ -154,97 +433,584 @@ def step3_add_local_furniture(
         try:
             with open(path, "rb") as furniture_file:
                 file_bytes = furniture_file.read()
-            furniture_stream = io.BytesIO(file_bytes)
-            furniture_files.append(upload_func(furniture_stream, mime_type=mimetype))
+            furniture_files.append(_upload(file_bytes, mimetype))
             logger.debug("가구 이미지 업로드 완료: %s", path)
         except Exception as exc:
             logger.warning("가구 이미지 업로드 실패(%s): %s", path, exc)
 
-    request_payload = [prompt, base_room_file] + furniture_files
+    return base_room_file, furniture_files
 
-    try:
-        response = generative_model.generate_content(
+
+def step3_add_local_furniture(
+    empty_room_image: ImageLike,
+    style_prompt: str,
+    furniture_paths: Optional[Sequence[str]],
+    *,
+    generative_model,
+    upload_file_func: Optional[Callable[[io.BytesIO, str], object]] = None,
+    uploaded_inputs: Optional[Tuple[object, Sequence[object]]] = None,
+    timeout: int = 180,
+    caller=None,
+    call_stats: Optional[Dict[str, int]] = None,
+) -> ImageArtifact:
+    """Apply style and furniture to the empty room using Gemini.
+
+    Pass ``uploaded_inputs`` from :func:`upload_step3_inputs` to reuse file
+    handles across variants instead of uploading the same images again.
+    With a ``caller`` (see ``hedging.HedgedCaller``) the Gemini request is
+    retried and hedged, and its attempt counts are added to ``call_stats``.
+    """
+    if generative_model is None:
+        raise PipelineStepError("Gemini 모델 인스턴스가 필요합니다.")
+
+    prompt = _step3_prompt(style_prompt, furniture_paths)
+    logger.info("3단계 시작: 스타일 적용 및 가구 배치")
+
+    if uploaded_inputs is None:
+        uploaded_inputs = upload_step3_inputs(
+            empty_room_image,
+            furniture_paths,
+            upload_file_func=upload_file_func,
+        )
+    base_room_file, furniture_files = uploaded_inputs
+
+    request_payload = [prompt, base_room_file] + list(furniture_files)
+
+    def _generate(attempt_timeout: float):
+        return generative_model.generate_content(
             request_payload,
-            request_options={"timeout": timeout},
+            request_options={"timeout": attempt_timeout},
         )
+
+    try:
+        with observe_step(STEP3_GENERATE):
+            if caller is None:
+                response = _generate(timeout)
+            else:
+                response = caller.call(_generate, timeout=timeout, stats=call_stats)
+    except PipelineStepError:
+        raise
     except Exception as exc:
         raise PipelineStepError(
             f"Gemini 이미지 합성 API 호출에 실패했습니다: {exc}"
         ) from exc
 
-    candidates = getattr(response, "candidates", None)
-    if not candidates:
-        raise PipelineStepError("Gemini 응답에 후보 결과가 없습니다.")
+    image_bytes = _gemini_image_bytes(response)
+    record_transfer("gemini", received=len(image_bytes))
+    result = _artifact(image_bytes)
+    logger.info("3단계 완료: 스타일 적용 및 가구 배치 성공")
+    return result
 
-    image_bytes: Optional[bytes] = None
-    text_messages = []
-    for part in candidates[0].content.parts:
-        inline_data = getattr(part, "inline_data", None)
-        if inline_data:
-            data = getattr(inline_data, "data", None)
-            if isinstance(data, str):
-                image_bytes = _decode_image_bytes(data)
-            elif isinstance(data, bytes):
-                image_bytes = data
-            if image_bytes:
-                break
-        text = getattr(part, "text", None)
-        if text:
-            text_messages.append(text)
 
-    if image_bytes is None:
-        detail = " / ".join(text_messages) if text_messages else "이미지 출력 없음"
-        raise PipelineStepError(f"Gemini가 이미지를 반환하지 않았습니다. 응답: {detail}")
+async def astep3_add_local_furniture(
+    empty_room_image: ImageLike,
+    style_prompt: str,
+    furniture_paths: Optional[Sequence[str]],
+    *,
+    generative_model,
+    upload_file_func: Optional[Callable[[io.BytesIO, str], object]] = None,
+    uploaded_inputs: Optional[Tuple[object, Sequence[object]]] = None,
+    timeout: int = 180,
+    caller=None,
+    call_stats: Optional[Dict[str, int]] = None,
+) -> ImageArtifact:
+    """Async counterpart of :func:`step3_add_local_furniture` using ``generate_content_async``."""
+    if generative_model is None:
+        raise PipelineStepError("Gemini 모델 인스턴스가 필요합니다.")
+
+    prompt = _step3_prompt(style_prompt, furniture_paths)
+    logger.info("3단계 시작: 스타일 적용 및 가구 배치")
+
+    if uploaded_inputs is None:
+        uploaded_inputs = await asyncio.to_thread(
+            upload_step3_inputs,
+            empty_room_image,
+            furniture_paths,
+            upload_file_func=upload_file_func,
+        )
+    base_room_file, furniture_files = uploaded_inputs
 
-    result = Image.open(io.BytesIO(image_bytes))
-    result.load()
+    request_payload = [prompt, base_room_file] + list(furniture_files)
+
+    def _generate(attempt_timeout: float):
+        return generative_model.generate_content_async(
+            request_payload,
+            request_options={"timeout": attempt_timeout},
+        )
+
+    try:
+        with observe_step(STEP3_GENERATE):
+            if caller is None:
+                response = await _generate(timeout)
+            else:
+                response = await caller.acall(_generate, timeout=timeout, stats=call_stats)
+    except PipelineStepError:
+        raise
+    except Exception as exc:
+        raise PipelineStepError(
+            f"Gemini 이미지 합성 API 호출에 실패했습니다: {exc}"
+        ) from exc
+
+    image_bytes = _gemini_image_bytes(response)
+    record_transfer("gemini", received=len(image_bytes))
+    result = _artifact(image_bytes)
     logger.info("3단계 완료: 스타일 적용 및 가구 배치 성공")
     return result
 
 
 def step4_iterative_refinement(
-    final_image: Image.Image,
+    final_image: ImageLike,
     refinement_prompt: str,
     openai_client,
     *,
     size: str = "1024x1024",
-    filename: str = "step4_input.webp",
-) -> Image.Image:
-    """Refine the generated image using OpenAI."""
+    filename: Optional[str] = None,
+) -> ImageArtifact:
+    """Refine the generated image using OpenAI.
+
+    The input's encoded bytes are sent as they are; no transcode happens
+    unless ``final_image`` was given as bare pixels.
+    """
     logger.info("4단계 시작: 부분 수정 (prompt=%s)", refinement_prompt)
+    source = as_artifact(final_image)
+    if source.format:
+        image_bytes = source.data
+    else:
+        image_bytes = _encode_webp(source, "최종 이미지를 수정 입력용으로 변환하지 못했습니다.")
+    filename = filename or f"step4_input.{source.extension}"
 
     try:
-        byte_stream = io.BytesIO()
-        final_image.save(byte_stream, format="WEBP")
-        byte_stream.seek(0)
-        image_bytes = byte_stream.read()
+        with observe_step(STEP4):
+            response = openai_client.images.edit(
+                model=REFINEMENT_MODEL,
+                image=(filename, image_bytes, source.mimetype),
+                prompt=refinement_prompt,
+                size=size,
+            )
+    except PipelineStepError:
+        raise
     except Exception as exc:
-        raise PipelineStepError("최종 이미지를 수정 입력용으로 변환하지 못했습니다.") from exc
+        raise PipelineStepError("OpenAI 이미지 수정 API 호출에 실패했습니다.") from exc
 
-    try:
-        response = openai_client.images.edit(
-            model="gpt-image-1",
-            image=(filename, image_bytes, "image/webp"),
-            prompt=refinement_prompt,
-            size=size,
+    refined_bytes = _openai_image_bytes(response, "OpenAI 응답에 수정 이미지 데이터가 없습니다.")
+    record_transfer("openai", sent=len(image_bytes), received=len(refined_bytes))
+    result = _artifact(refined_bytes)
+    logger.info("4단계 완료: 부분 수정 성공")
+    return result
+
+
+async def astep4_iterative_refinement(
+    final_image: ImageLike,
+    refinement_prompt: str,
+    openai_client,
+    *,
+    size: str = "1024x1024",
+    filename: Optional[str] = None,
+) -> ImageArtifact:
+    """Async counterpart of :func:`step4_iterative_refinement` for an ``AsyncOpenAI`` client."""
+    logger.info("4단계 시작: 부분 수정 (prompt=%s)", refinement_prompt)
+    source = as_artifact(final_image)
+    if source.format:
+        image_bytes = source.data
+    else:
+        image_bytes = await asyncio.to_thread(
+            _encode_webp, source, "최종 이미지를 수정 입력용으로 변환하지 못했습니다."
         )
-    except Exception as exc:
-        raise PipelineStepError("OpenAI 이미지 수정 API 호출에 실패했습니다.") from exc
+    filename = filename or f"step4_input.{source.extension}"
 
     try:
-        encoded = response.data[0].b64_json
-    except (AttributeError, IndexError, KeyError) as exc:
-        raise PipelineStepError("OpenAI 응답에 수정 이미지 데이터가 없습니다.") from exc
+        with observe_step(STEP4):
+            response = await openai_client.images.edit(
+                model=REFINEMENT_MODEL,
+                image=(filename, image_bytes, source.mimetype),
+                prompt=refinement_prompt,
+                size=size,
+            )
+    except PipelineStepError:
+        raise
+    except Exception as exc:
+        raise PipelineStepError("OpenAI 이미지 수정 API 호출에 실패했습니다.") from exc
 
-    image_bytes = _decode_image_bytes(encoded)
-    result = Image.open(io.BytesIO(image_bytes))
-    result.load()
+    refined_bytes = _openai_image_bytes(response, "OpenAI 응답에 수정 이미지 데이터가 없습니다.")
+    record_transfer("openai", sent=len(image_bytes), received=len(refined_bytes))
+    result = _artifact(refined_bytes)
     logger.info("4단계 완료: 부분 수정 성공")
     return result
 
 
+def _refinement_source(final_image: ImageLike) -> ImageArtifact:
+    # Encode once up front so concurrent step4 calls all send the same bytes.
+    source = as_artifact(final_image)
+    if not source.format:
+        _encode_webp(source, "최종 이미지를 수정 입력용으로 변환하지 못했습니다.")
+    return source
+
+
+def _refinement_outcome(index: int, prompt: str, outcome) -> Dict[str, object]:
+    if isinstance(outcome, Exception):
+        return {"index": index, "prompt": prompt, "image": None, "error": str(outcome)}
+    return {"index": index, "prompt": prompt, "image": outcome, "error": None}
+
+
+def iter_refine_batch(
+    final_image: ImageLike,
+    prompts: Sequence[str],
+    openai_client,
+    *,
+    size: str = "1024x1024",
+    max_concurrency: int = 4,
+) -> Iterator[Dict[str, object]]:
+    """Run step4 once per prompt on the same source, yielding results as they finish.
+
+    Each item is ``{"index", "prompt", "image", "error"}``; a failed prompt
+    carries its error instead of raising, so the other prompts still finish.
+    """
+    source = _refinement_source(final_image)
+    workers = max(1, min(int(max_concurrency or 1), len(prompts)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refine-batch")
+    try:
+        futures = {
+            executor.submit(step4_iterative_refinement, source, prompt, openai_client, size=size): (index, prompt)
+            for index, prompt in enumerate(prompts, start=1)
+        }
+        for future in as_completed(futures):
+            index, prompt = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:
+                logger.error("일괄 부분 수정 %s번 실패: %s", index, exc)
+                outcome = exc
+            yield _refinement_outcome(index, prompt, outcome)
+    finally:
+        # A closed stream (client went away) must not wait for the remaining calls.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def refine_batch(final_image: ImageLike, prompts: Sequence[str], openai_client, **kwargs) -> List[Dict[str, object]]:
+    """:func:`iter_refine_batch` collected in prompt order."""
+    return sorted(iter_refine_batch(final_image, prompts, openai_client, **kwargs), key=lambda item: item["index"])
+
+
+async def aiter_refine_batch(
+    final_image: ImageLike,
+    prompts: Sequence[str],
+    openai_client,
+    *,
+    size: str = "1024x1024",
+    max_concurrency: int = 4,
+) -> AsyncIterator[Dict[str, object]]:
+    """Async counterpart of :func:`iter_refine_batch` for an ``AsyncOpenAI`` client."""
+    source = await asyncio.to_thread(_refinement_source, final_image)
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency or 1)))
+
+    async def _bounded(index: int, prompt: str) -> Dict[str, object]:
+        async with semaphore:
+            try:
+                outcome = await astep4_iterative_refinement(source, prompt, openai_client, size=size)
+            except Exception as exc:
+                logger.error("일괄 부분 수정 %s번 실패: %s", index, exc)
+                outcome = exc
+        return _refinement_outcome(index, prompt, outcome)
+
+    tasks = [asyncio.ensure_future(_bounded(index, prompt)) for index, prompt in enumerate(prompts, start=1)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def arefine_batch(
+    final_image: ImageLike, prompts: Sequence[str], openai_client, **kwargs
+) -> List[Dict[str, object]]:
+    results = [item async for item in aiter_refine_batch(final_image, prompts, openai_client, **kwargs)]
+    return sorted(results, key=lambda item: item["index"])
+
+
+def _run_variant_task(index: int, *args, **kwargs) -> Dict[str, object]:
+    # Progress and checkpoint writes open connections on the pool thread; close them once per variant.
+    try:
+        return _build_variant(index, *args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def _build_variant(
+    index: int,
+    variation_count: int,
+    empty_room: ImageArtifact,
+    *,
+    openai_client,
+    generative_model,
+    style_prompt: str,
+    refinement_prompt: Optional[str],
+    furniture_paths: Sequence[str],
+    uploaded_inputs: Tuple[object, Sequence[object]],
+    size: str,
+    gemini_timeout: int,
+    gemini_caller,
+    progress_callback: Optional[ProgressCallback],
+    checkpoints: CheckpointStore,
+) -> Dict[str, object]:
+    logger.info("변형 %d/%d 생성 시작", index, variation_count)
+    step = variant_stage(index, "step3")
+    step3_stats: Dict[str, int] = {}
+    with track_in_flight(PIPELINE_IN_FLIGHT, kind="variant"):
+        try:
+            resumed = checkpoints.load(step)
+            if resumed is not None:
+                with_furniture = resumed.image
+                _notify(progress_callback, step, "completed", resumed=True)
+            else:
+                _notify(progress_callback, step, "started")
+                with_furniture = step3_add_local_furniture(
+                    empty_room,
+                    style_prompt,
+                    furniture_paths,
+                    generative_model=generative_model,
+                    uploaded_inputs=uploaded_inputs,
+                    timeout=gemini_timeout,
+                    caller=gemini_caller,
+                    call_stats=step3_stats,
+                )
+                checkpoints.save(step, with_furniture, step3_stats)
+                _notify(progress_callback, step, "completed", **step3_stats)
+
+            final_image = with_furniture
+            if refinement_prompt:
+                step = f"variant_{index}.step4"
+                _notify(progress_callback, step, "started")
+                final_image = step4_iterative_refinement(
+                    with_furniture,
+                    refinement_prompt,
+                    openai_client,
+                    size=size,
+                )
+                _notify(progress_callback, step, "completed")
+        except Exception as exc:
+            _notify(progress_callback, step, "failed", error=str(exc), **step3_stats)
+            raise
+
+    logger.info("변형 %d 생성 완료", index)
+    return {
+        "index": index,
+        "with_furniture": with_furniture,
+        "final_image": final_image,
+        "step_stats": {"step3": step3_stats},
+        "resumed": "step3" if resumed is not None else None,
+    }
+
+
+async def _abuild_variant(
+    index: int,
+    variation_count: int,
+    empty_room: ImageArtifact,
+    *,
+    openai_client,
+    generative_model,
+    style_prompt: str,
+    refinement_prompt: Optional[str],
+    furniture_paths: Sequence[str],
+    uploaded_inputs: Tuple[object, Sequence[object]],
+    size: str,
+    gemini_timeout: int,
+    gemini_caller,
+    progress_callback: Optional[ProgressCallback],
+    checkpoints: CheckpointStore,
+) -> Dict[str, object]:
+    logger.info("변형 %d/%d 생성 시작", index, variation_count)
+    step = variant_stage(index, "step3")
+    step3_stats: Dict[str, int] = {}
+    with track_in_flight(PIPELINE_IN_FLIGHT, kind="variant"):
+        try:
+            resumed = await asyncio.to_thread(checkpoints.load, step)
+            if resumed is not None:
+                with_furniture = resumed.image
+                await _anotify(progress_callback, step, "completed", resumed=True)
+            else:
+                await _anotify(progress_callback, step, "started")
+                with_furniture = await astep3_add_local_furniture(
+                    empty_room,
+                    style_prompt,
+                    furniture_paths,
+                    generative_model=generative_model,
+                    uploaded_inputs=uploaded_inputs,
+                    timeout=gemini_timeout,
+                    caller=gemini_caller,
+                    call_stats=step3_stats,
+                )
+                await asyncio.to_thread(checkpoints.save, step, with_furniture, step3_stats)
+                await _anotify(progress_callback, step, "completed", **step3_stats)
+
+            final_image = with_furniture
+            if refinement_prompt:
+                step = f"variant_{index}.step4"
+                await _anotify(progress_callback, step, "started")
+                final_image = await astep4_iterative_refinement(
+                    with_furniture,
+                    refinement_prompt,
+                    openai_client,
+                    size=size,
+                )
+                await _anotify(progress_callback, step, "completed")
+        except Exception as exc:
+            await _anotify(progress_callback, step, "failed", error=str(exc), **step3_stats)
+            raise
+
+    logger.info("변형 %d 생성 완료", index)
+    return {
+        "index": index,
+        "with_furniture": with_furniture,
+        "final_image": final_image,
+        "step_stats": {"step3": step3_stats},
+        "resumed": "step3" if resumed is not None else None,
+    }
+
+
+def _collect_variants(outcomes: Dict[int, object]) -> Tuple[List[Dict[str, object]], List[str]]:
+    """Split per-index outcomes into ordered variants and error messages.
+
+    Raises when no variant succeeded.
+    """
+    variants: List[Dict[str, object]] = []
+    errors: List[str] = []
+    first_failure: Optional[BaseException] = None
+
+    for index in sorted(outcomes):
+        outcome = outcomes[index]
+        if isinstance(outcome, PipelineStepError):
+            logger.error("변형 %d 생성 실패: %s", index, outcome)
+            errors.append(str(outcome))
+        elif isinstance(outcome, BaseException):
+            logger.error("변형 %d 생성 중 예기치 못한 오류 발생", index, exc_info=outcome)
+            errors.append(f"예기치 못한 오류: {outcome}")
+        else:
+            variants.append(outcome)
+            continue
+        first_failure = first_failure or outcome
+
+    if not variants:
+        if isinstance(first_failure, PipelineStepError):
+            raise first_failure
+        raise PipelineStepError("파이프라인 실행 중 예기치 못한 오류가 발생했습니다.") from first_failure
+
+    return variants, errors
+
+
+def _resumed_variant(index: int) -> Dict[str, object]:
+    # Already stored by an earlier run; the caller holds its saved result.
+    return {"index": index, "with_furniture": None, "final_image": None, "step_stats": {}, "resumed": "done"}
+
+
+def _plan_variants(checkpoints: CheckpointStore, variation_count: int) -> Tuple[List[int], List[int], bool]:
+    """Split variant indexes into finished and pending ones, and tell whether any still needs step3."""
+    indexes = range(1, variation_count + 1)
+    finished = [index for index in indexes if checkpoints.has(variant_stage(index, "done"))]
+    pending = [index for index in indexes if index not in finished]
+    needs_step3 = any(not checkpoints.has(variant_stage(index, "step3")) for index in pending)
+    return finished, pending, needs_step3
+
+
+def _normalize_stage(original_image, checkpoints, progress_callback, **options):
+    resumed = checkpoints.load(STAGE_NORMALIZE)
+    if resumed is not None:
+        _notify(progress_callback, STAGE_NORMALIZE, "completed", resumed=True, **resumed.meta)
+        return resumed.image, dict(resumed.meta)
+
+    _notify(progress_callback, STAGE_NORMALIZE, "started")
+    try:
+        normalized, input_stats = normalize_input_image(original_image, **options)
+    except PipelineStepError as exc:
+        _notify(progress_callback, STAGE_NORMALIZE, "failed", error=str(exc))
+        raise
+    # A stored checkpoint that only failed to load is still current; keep it.
+    if not checkpoints.has(STAGE_NORMALIZE):
+        checkpoints.save(STAGE_NORMALIZE, normalized, input_stats)
+    _notify(progress_callback, STAGE_NORMALIZE, "completed", **input_stats)
+    return normalized, input_stats
+
+
+def _empty_room_stage(original_image, openai_client, checkpoints, progress_callback, **options) -> ImageArtifact:
+    resumed = checkpoints.load(STAGE_EMPTY_ROOM)
+    if resumed is not None:
+        _notify(progress_callback, STAGE_EMPTY_ROOM, "completed", resumed=True)
+        return resumed.image
+
+    _notify(progress_callback, STAGE_EMPTY_ROOM, "started")
+    try:
+        empty_room = generate_empty_room(original_image, openai_client, **options)
+    except PipelineStepError as exc:
+        _notify(progress_callback, STAGE_EMPTY_ROOM, "failed", error=str(exc))
+        raise
+    if not checkpoints.has(STAGE_EMPTY_ROOM):
+        checkpoints.save(STAGE_EMPTY_ROOM, empty_room)
+    _notify(progress_callback, STAGE_EMPTY_ROOM, "completed")
+    return empty_room
+
+
+def _upload_stage(empty_room, furniture_paths, upload_cache, progress_callback):
+    _notify(progress_callback, "gemini_upload", "started")
+    try:
+        uploaded_inputs = upload_step3_inputs(empty_room, furniture_paths, upload_cache=upload_cache)
+    except PipelineStepError as exc:
+        _notify(progress_callback, "gemini_upload", "failed", error=str(exc))
+        raise
+    _notify(progress_callback, "gemini_upload", "completed", furniture=len(uploaded_inputs[1]))
+    return uploaded_inputs
+
+
+async def _anormalize_stage(original_image, checkpoints, progress_callback, **options):
+    resumed = await asyncio.to_thread(checkpoints.load, STAGE_NORMALIZE)
+    if resumed is not None:
+        await _anotify(progress_callback, STAGE_NORMALIZE, "completed", resumed=True, **resumed.meta)
+        return resumed.image, dict(resumed.meta)
+
+    await _anotify(progress_callback, STAGE_NORMALIZE, "started")
+    try:
+        normalized, input_stats = await asyncio.to_thread(normalize_input_image, original_image, **options)
+    except PipelineStepError as exc:
+        await _anotify(progress_callback, STAGE_NORMALIZE, "failed", error=str(exc))
+        raise
+    if not await asyncio.to_thread(checkpoints.has, STAGE_NORMALIZE):
+        await asyncio.to_thread(checkpoints.save, STAGE_NORMALIZE, normalized, input_stats)
+    await _anotify(progress_callback, STAGE_NORMALIZE, "completed", **input_stats)
+    return normalized, input_stats
+
+
+async def _aempty_room_stage(original_image, openai_client, checkpoints, progress_callback, **options) -> ImageArtifact:
+    resumed = await asyncio.to_thread(checkpoints.load, STAGE_EMPTY_ROOM)
+    if resumed is not None:
+        await _anotify(progress_callback, STAGE_EMPTY_ROOM, "completed", resumed=True)
+        return resumed.image
+
+    await _anotify(progress_callback, STAGE_EMPTY_ROOM, "started")
+    try:
+        empty_room = await agenerate_empty_room(original_image, openai_client, **options)
+    except PipelineStepError as exc:
+        await _anotify(progress_callback, STAGE_EMPTY_ROOM, "failed", error=str(exc))
+        raise
+    if not await asyncio.to_thread(checkpoints.has, STAGE_EMPTY_ROOM):
+        await asyncio.to_thread(checkpoints.save, STAGE_EMPTY_ROOM, empty_room)
+    await _anotify(progress_callback, STAGE_EMPTY_ROOM, "completed")
+    return empty_room
+
+
+async def _aupload_stage(empty_room, furniture_paths, upload_cache, progress_callback):
+    await _anotify(progress_callback, "gemini_upload", "started")
+    try:
+        uploaded_inputs = await asyncio.to_thread(
+            upload_step3_inputs, empty_room, furniture_paths, upload_cache=upload_cache
+        )
+    except PipelineStepError as exc:
+        await _anotify(progress_callback, "gemini_upload", "failed", error=str(exc))
+        raise
+    await _anotify(progress_callback, "gemini_upload", "completed", furniture=len(uploaded_inputs[1]))
+    return uploaded_inputs
+
+
 def run_design_pipeline(
-    original_image_path: str,
+    original_image: ImageSource,
     *,
     openai_client,
     generative_model,
@@ -252,62 +1018,207 @@ def run_design_pipeline(
     refinement_prompt: Optional[str] = None,
     furniture_paths: Optional[Sequence[str]] = None,
     size: str = "1024x1024",
+    normalize_input: bool = True,
+    source_max_edge: Optional[int] = None,
+    source_quality: int = DEFAULT_SOURCE_QUALITY,
     gemini_timeout: int = 180,
+    gemini_caller=None,
     variations: int = 1,
+    max_concurrency: int = 4,
+    empty_room_cache: Optional[DiskLRUCache] = None,
+    upload_cache: Optional[GeminiUploadCache] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    variant_callback: Optional[VariantCallback] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
 ) -> Dict[str, object]:
-    """Run the full AI pipeline and return all variants."""
-    empty_room = generate_empty_room(
-        original_image_path,
-        openai_client,
-        size=size,
-    )
+    """Run the full AI pipeline and return all variants.
+
+    ``original_image`` may be a path, bytes, an ImageArtifact or a file-like
+    object, so callers holding the upload in memory need no temporary file.
+    Unless ``normalize_input`` is False it first goes through
+    :func:`normalize_input_image`, bounded by ``source_max_edge`` (default:
+    the longer side of ``size``).
+
+    Variants only depend on the empty room, so up to ``max_concurrency`` of
+    them are generated at once. Results keep index order; the run fails only
+    when no variant succeeds. ``progress_callback(step, state, detail)`` is
+    invoked when each step starts, completes or fails; step3 details carry
+    retry and hedge counts when a ``gemini_caller`` is given.
+    ``variant_callback(variant)`` runs in the calling thread as soon as each
+    variant finishes, so it can be stored before the slower ones are done;
+    if it raises, that variant is reported as failed.
 
-    variants: List[Dict[str, Image.Image]] = []
+    With ``checkpoints``, the normalised input, the empty room and each
+    variant's step3 output are saved as they finish. A later run resumes:
+    saved stages are loaded instead of calling the providers again, and
+    variants with a ``variant_{n}.done`` checkpoint are skipped entirely
+    (reported with ``resumed="done"`` and no image, and not passed to
+    ``variant_callback``).
+
+    ``should_stop()`` is checked before each finished variant is handed to
+    ``variant_callback``. Once it returns True, variants that have not started
+    are cancelled and the run raises :class:`PipelineCancelled`.
+    """
+    checkpoints = checkpoints or CheckpointStore()
     variation_count = max(1, int(variations))
-    errors: List[str] = []
+    finished, pending, needs_step3 = _plan_variants(checkpoints, variation_count)
 
-    for index in range(variation_count):
-        try:
-            logger.info("변형 %d/%d 생성 시작", index + 1, variation_count)
-            with_furniture = step3_add_local_furniture(
+    # Stages before step3 are only needed while some variant still lacks its step3 output.
+    input_stats: Dict[str, int] = {}
+    empty_room = None
+    uploaded_inputs: Tuple[object, Sequence[object]] = (None, [])
+    if needs_step3:
+        if normalize_input:
+            original_image, input_stats = _normalize_stage(
+                original_image,
+                checkpoints,
+                progress_callback,
+                max_edge=source_max_edge or _target_edge(size),
+                quality=source_quality,
+            )
+        empty_room = _empty_room_stage(
+            original_image, openai_client, checkpoints, progress_callback, size=size, cache=empty_room_cache
+        )
+        uploaded_inputs = _upload_stage(empty_room, furniture_paths, upload_cache, progress_callback)
+
+    workers = max(1, min(int(max_concurrency or 1), len(pending) or 1))
+    outcomes: Dict[int, object] = {index: _resumed_variant(index) for index in finished}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="design-variant") as executor:
+        futures = {
+            executor.submit(
+                _run_variant_task,
+                index,
+                variation_count,
                 empty_room,
-                style_prompt,
-                furniture_paths or [],
+                openai_client=openai_client,
                 generative_model=generative_model,
-                timeout=gemini_timeout,
+                style_prompt=style_prompt,
+                refinement_prompt=refinement_prompt,
+                furniture_paths=furniture_paths or [],
+                uploaded_inputs=uploaded_inputs,
+                size=size,
+                gemini_timeout=gemini_timeout,
+                gemini_caller=gemini_caller,
+                progress_callback=progress_callback,
+                checkpoints=checkpoints,
+            ): index
+            for index in pending
+        }
+        for future in as_completed(futures):
+            if _stopped(should_stop):
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+            index = futures[future]
+            try:
+                variant = future.result()
+                if variant_callback is not None:
+                    variant_callback(variant)
+                outcomes[index] = variant
+            except Exception as exc:
+                outcomes[index] = exc
+
+    if _stopped(should_stop):
+        raise PipelineCancelled(_CANCELLED_MESSAGE)
+    variants, errors = _collect_variants(outcomes)
+    return {
+        "input": input_stats,
+        "empty_room": empty_room,
+        "variants": variants,
+        "errors": errors,
+    }
+
+
+async def arun_design_pipeline(
+    original_image: ImageSource,
+    *,
+    openai_client,
+    generative_model,
+    style_prompt: str,
+    refinement_prompt: Optional[str] = None,
+    furniture_paths: Optional[Sequence[str]] = None,
+    size: str = "1024x1024",
+    normalize_input: bool = True,
+    source_max_edge: Optional[int] = None,
+    source_quality: int = DEFAULT_SOURCE_QUALITY,
+    gemini_timeout: int = 180,
+    gemini_caller=None,
+    variations: int = 1,
+    max_concurrency: int = 4,
+    empty_room_cache: Optional[DiskLRUCache] = None,
+    upload_cache: Optional[GeminiUploadCache] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    variant_callback: Optional[VariantCallback] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Dict[str, object]:
+    """Async counterpart of :func:`run_design_pipeline`.
+
+    Expects an ``AsyncOpenAI`` client; variants run as tasks bounded by a
+    semaphore instead of threads. ``variant_callback`` may return an
+    awaitable, which is awaited before the variant counts as done.
+    """
+    checkpoints = checkpoints or CheckpointStore()
+    variation_count = max(1, int(variations))
+    finished, pending, needs_step3 = await asyncio.to_thread(_plan_variants, checkpoints, variation_count)
+
+    input_stats: Dict[str, int] = {}
+    empty_room = None
+    uploaded_inputs: Tuple[object, Sequence[object]] = (None, [])
+    if needs_step3:
+        if normalize_input:
+            original_image, input_stats = await _anormalize_stage(
+                original_image,
+                checkpoints,
+                progress_callback,
+                max_edge=source_max_edge or _target_edge(size),
+                quality=source_quality,
             )
+        empty_room = await _aempty_room_stage(
+            original_image, openai_client, checkpoints, progress_callback, size=size, cache=empty_room_cache
+        )
+        uploaded_inputs = await _aupload_stage(empty_room, furniture_paths, upload_cache, progress_callback)
 
-            final_image = with_furniture
-            if refinement_prompt:
-                final_image = step4_iterative_refinement(
-                    with_furniture,
-                    refinement_prompt,
-                    openai_client,
-                    size=size,
-                )
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency or 1)))
 
-            variants.append(
-                {
-                    "index": index + 1,
-                    "with_furniture": with_furniture,
-                    "final_image": final_image,
-                }
+    async def _bounded(index: int) -> Dict[str, object]:
+        async with semaphore:
+            if _stopped(should_stop):
+                raise PipelineCancelled(_CANCELLED_MESSAGE)
+            variant = await _abuild_variant(
+                index,
+                variation_count,
+                empty_room,
+                openai_client=openai_client,
+                generative_model=generative_model,
+                style_prompt=style_prompt,
+                refinement_prompt=refinement_prompt,
+                furniture_paths=furniture_paths or [],
+                uploaded_inputs=uploaded_inputs,
+                size=size,
+                gemini_timeout=gemini_timeout,
+                gemini_caller=gemini_caller,
+                progress_callback=progress_callback,
+                checkpoints=checkpoints,
             )
-            logger.info("변형 %d 생성 완료", index + 1)
-        except PipelineStepError as exc:
-            logger.error("변형 %d 생성 실패: %s", index + 1, exc)
-            errors.append(str(exc))
-            if not variants:
-                raise
-            break
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.exception("변형 %d 생성 중 예기치 못한 오류 발생", index + 1)
-            errors.append(f"예기치 못한 오류: {exc}")
-            if not variants:
-                raise PipelineStepError("파이프라인 실행 중 예기치 못한 오류가 발생했습니다.") from exc
-            break
+        if _stopped(should_stop):
+            raise PipelineCancelled(_CANCELLED_MESSAGE)
+        if variant_callback is not None:
+            delivered = variant_callback(variant)
+            if inspect.isawaitable(delivered):
+                await delivered
+        return variant
+
+    results = await asyncio.gather(*(_bounded(index) for index in pending), return_exceptions=True)
+    outcomes: Dict[int, object] = {index: _resumed_variant(index) for index in finished}
+    outcomes.update(zip(pending, results))
 
+    if _stopped(should_stop):
+        raise PipelineCancelled(_CANCELLED_MESSAGE)
+    variants, errors = _collect_variants(outcomes)
     return {
+        "input": input_stats,
         "empty_room": empty_room,
         "variants": variants,
         "errors": errors,
@@ -316,8 +1227,22 @@ def run_design_pipeline(
 
 __all__ = [
     "PipelineStepError",
+    "PipelineCancelled",
+    "ImageSource",
+    "ProgressCallback",
+    "VariantCallback",
+    "normalize_input_image",
     "generate_empty_room",
+    "agenerate_empty_room",
+    "upload_step3_inputs",
     "step3_add_local_furniture",
+    "astep3_add_local_furniture",
     "step4_iterative_refinement",
+    "astep4_iterative_refinement",
+    "iter_refine_batch",
+    "aiter_refine_batch",
+    "refine_batch",
+    "arefine_batch",
     "run_design_pipeline",
+    "arun_design_pipeline",
 ]
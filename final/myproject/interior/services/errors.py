@@ -0,0 +1,5 @@
+class PipelineStepError(RuntimeError):
+    """Raised when a pipeline step fails."""
+
+
+__all__ = ["PipelineStepError"]
@@ -0,0 +1,313 @@
+"""Offline stand-ins for the OpenAI and Gemini clients.
+
+They accept the calls the pipeline makes (``images.edit``,
+``generate_content``/``generate_content_async`` and ``upload_file``), wait a
+sampled latency and answer with a generated image, or fail with a retryable
+503 at the configured rate. Used by ``manage.py run_pipeline_benchmark`` to
+measure throughput without spending API credits.
+"""
+import asyncio
+import base64
+import io
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from .gemini_files import GeminiUploadCache
+
+# z-score of the 95th percentile of the standard normal distribution.
+_Z95 = 1.6448536269514722
+
+DEFAULT_RESPONSE_SIZE = (1024, 1024)
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Seconds one call takes: ``fixed`` (a), ``uniform`` (a..b) or ``lognormal`` (median a, p95 b)."""
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """``"0.5"``, ``"fixed:0.5"``, ``"uniform:0.2,1.5"`` or ``"lognormal:8,20"``."""
+        kind, _, values = spec.partition(":")
+        if not values:
+            kind, values = "fixed", kind
+        try:
+            numbers = [float(value) for value in values.split(",")]
+        except ValueError:
+            numbers = []
+        if kind == "fixed" and len(numbers) == 1 and numbers[0] >= 0:
+            return cls("fixed", numbers[0])
+        if kind in ("uniform", "lognormal") and len(numbers) == 2 and 0 <= numbers[0] <= numbers[1]:
+            return cls(kind, numbers[0], numbers[1])
+        raise ValueError(f"지연 분포 형식이 올바르지 않습니다: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            if self.a <= 0:
+                return 0.0
+            sigma = math.log(self.b / self.a) / _Z95
+            return rng.lognormvariate(math.log(self.a), sigma)
+        return self.a
+
+    def describe(self) -> str:
+        if self.kind == "fixed":
+            return f"fixed:{self.a:g}"
+        return f"{self.kind}:{self.a:g},{self.b:g}"
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    # None answers with the requested size (OpenAI) or DEFAULT_RESPONSE_SIZE (Gemini).
+    image_size: Optional[Tuple[int, int]] = None
+    image_format: str = "PNG"
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "latency": self.latency.describe(),
+            "error_rate": self.error_rate,
+            "image_size": "x".join(map(str, self.image_size)) if self.image_size else "requested",
+            "image_format": self.image_format,
+        }
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure; the status code makes it count as retryable."""
+
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_size(size: Optional[str], default: Tuple[int, int] = DEFAULT_RESPONSE_SIZE) -> Tuple[int, int]:
+    """``"1024x1536"`` -> ``(1024, 1536)``; anything else (e.g. ``"auto"``) gives ``default``."""
+    try:
+        width, height = (int(part) for part in (size or "").lower().split("x"))
+    except ValueError:
+        return default
+    return width, height
+
+
+@lru_cache(maxsize=16)
+def fake_image_bytes(width: int, height: int, image_format: str = "PNG") -> bytes:
+    """A gradient with noise, so encoders and decoders do realistic work."""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 32)
+    image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=16)
+def _fake_image_b64(width: int, height: int, image_format: str) -> str:
+    return base64.b64encode(fake_image_bytes(width, height, image_format)).decode("ascii")
+
+
+def fake_photo_bytes(width: int = 1600, height: int = 1200, *, seed: int = 0) -> bytes:
+    """A JPEG "room photo" that differs per seed, so content-keyed caches miss."""
+    rng = random.Random(seed)
+    base = Image.new("RGB", (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    image = Image.blend(base, noise, 0.35)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+class _CallModel:
+    """Draws latency and failure for each call from one seeded generator."""
+
+    def __init__(self, config: FakeProviderConfig, seed: Optional[int]):
+        self.config = config
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def draw(self, timeout: Optional[float] = None) -> Tuple[float, Optional[FakeProviderError]]:
+        with self._lock:
+            self.calls += 1
+            delay = self.config.latency.sample(self._rng)
+            failed = self._rng.random() < self.config.error_rate
+            if timeout is not None and delay > timeout:
+                self.failures += 1
+                return timeout, FakeProviderError("가상 제공자 응답 시간 초과", status_code=504)
+            if failed:
+                self.failures += 1
+                return delay, FakeProviderError("가상 제공자 과부하")
+        return delay, None
+
+    def image_size(self, requested: Optional[str] = None) -> Tuple[int, int]:
+        return self.config.image_size or parse_size(requested)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures}
+
+
+def _edit_response(model: _CallModel, size: Optional[str]):
+    width, height = model.image_size(size)
+    b64_json = _fake_image_b64(width, height, model.config.image_format)
+    return SimpleNamespace(data=[SimpleNamespace(b64_json=b64_json)])
+
+
+class _FakeImages:
+    def __init__(self, model: _CallModel):
+        self._model = model
+
+    def edit(self, *, model=None, image=None, prompt=None, size=None, **kwargs):
+        delay, error = self._model.draw()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return _edit_response(self._model, size)
+
+
+class _FakeAsyncImages:
+    def __init__(self, model: _CallModel):
+        self._model = model
+
+    async def edit(self, *, model=None, image=None, prompt=None, size=None, **kwargs):
+        delay, error = self._model.draw()
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return _edit_response(self._model, size)
+
+
+class FakeOpenAI:
+    """Stand-in for ``openai.OpenAI`` covering ``images.edit``."""
+
+    def __init__(self, config: FakeProviderConfig, *, seed: Optional[int] = None, calls: Optional[_CallModel] = None):
+        self.calls = calls or _CallModel(config, seed)
+        self.images = _FakeImages(self.calls)
+
+
+class FakeAsyncOpenAI:
+    """Stand-in for ``openai.AsyncOpenAI``; usable from any event loop."""
+
+    def __init__(self, config: FakeProviderConfig, *, seed: Optional[int] = None, calls: Optional[_CallModel] = None):
+        self.calls = calls or _CallModel(config, seed)
+        self.images = _FakeAsyncImages(self.calls)
+
+
+class FakeGenerativeModel:
+    """Stand-in for a Gemini ``GenerativeModel`` answering with one inline image.
+
+    A sampled latency above ``request_options["timeout"]`` fails with a 504
+    after the timeout, like a deadline exceeded upstream.
+    """
+
+    def __init__(self, config: FakeProviderConfig, *, seed: Optional[int] = None, model_name: str = "fake-gemini"):
+        self.model_name = model_name
+        self.calls = _CallModel(config, seed)
+
+    def _response(self):
+        width, height = self.calls.config.image_size or DEFAULT_RESPONSE_SIZE
+        image_format = self.calls.config.image_format
+        inline_data = SimpleNamespace(
+            data=fake_image_bytes(width, height, image_format),
+            mime_type=Image.MIME.get(image_format.upper(), "image/png"),
+        )
+        part = SimpleNamespace(inline_data=inline_data, text=None)
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+    @staticmethod
+    def _timeout(request_options) -> Optional[float]:
+        return (request_options or {}).get("timeout")
+
+    def generate_content(self, contents=None, *, request_options=None, **kwargs):
+        delay, error = self.calls.draw(self._timeout(request_options))
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._response()
+
+    async def generate_content_async(self, contents=None, *, request_options=None, **kwargs):
+        delay, error = self.calls.draw(self._timeout(request_options))
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return self._response()
+
+
+class FakeGeminiFiles:
+    """Stand-ins for ``genai.upload_file`` / ``genai.delete_file``; they never fail."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None, *, seed: Optional[int] = None):
+        self.calls = _CallModel(FakeProviderConfig(latency=latency or LatencyModel()), seed)
+
+    def upload_file(self, stream, mime_type=None, **kwargs):
+        delay, _ = self.calls.draw()
+        time.sleep(delay)
+        size = len(stream.getvalue()) if hasattr(stream, "getvalue") else 0
+        return SimpleNamespace(name=f"files/fake-{uuid.uuid4().hex[:12]}", mime_type=mime_type, size_bytes=size)
+
+    def delete_file(self, name):
+        return None
+
+
+class FakeProviders:
+    """One set of stand-ins drawing from a shared seed.
+
+    The sync and async OpenAI fakes share their call counters, so
+    :meth:`stats` reports one number per provider.
+    """
+
+    def __init__(
+        self,
+        *,
+        openai: Optional[FakeProviderConfig] = None,
+        gemini: Optional[FakeProviderConfig] = None,
+        upload_latency: Optional[LatencyModel] = None,
+        seed: Optional[int] = None,
+    ):
+        rng = random.Random(seed)
+        openai_calls = _CallModel(openai or FakeProviderConfig(), rng.randrange(2**32))
+        self.openai_client = FakeOpenAI(openai or FakeProviderConfig(), calls=openai_calls)
+        self.async_openai_client = FakeAsyncOpenAI(openai or FakeProviderConfig(), calls=openai_calls)
+        self.generative_model = FakeGenerativeModel(gemini or FakeProviderConfig(), seed=rng.randrange(2**32))
+        self.files = FakeGeminiFiles(upload_latency, seed=rng.randrange(2**32))
+
+    def upload_cache(self, **kwargs) -> GeminiUploadCache:
+        """A Gemini upload cache that uploads to :attr:`files`."""
+        return GeminiUploadCache(upload_func=self.files.upload_file, delete_func=self.files.delete_file, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "openai": self.openai_client.calls.stats(),
+            "gemini": self.generative_model.calls.stats(),
+            "gemini_files": self.files.calls.stats(),
+        }
+
+
+__all__ = [
+    "DEFAULT_RESPONSE_SIZE",
+    "FakeAsyncOpenAI",
+    "FakeGeminiFiles",
+    "FakeGenerativeModel",
+    "FakeOpenAI",
+    "FakeProviderConfig",
+    "FakeProviderError",
+    "FakeProviders",
+    "LatencyModel",
+    "fake_image_bytes",
+    "fake_photo_bytes",
+    "parse_size",
+]
@@ -0,0 +1,162 @@
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .cache import content_key
+from .metrics import record_cache_lookup, record_cache_write, record_transfer
+
+logger = logging.getLogger(__name__)
+
+# Files uploaded through the Gemini File API are deleted by the provider after 48 hours.
+GEMINI_FILE_TTL_SECONDS = 48 * 60 * 60
+# ``cache`` label of the hit/miss counters in :mod:`metrics`.
+CACHE_NAME = "gemini_upload"
+
+
+@dataclass
+class _UploadedFile:
+    handle: object
+    expires_at: float
+    last_used_at: float
+
+
+class GeminiUploadCache:
+    """Process-wide cache of Gemini file handles keyed by content hash.
+
+    Identical bytes are uploaded once and the handle is reused until shortly
+    before the provider expires it. Concurrent callers uploading the same
+    content wait for the first upload instead of sending a duplicate. Handles
+    idle for ``idle_seconds`` are deleted upstream by a background thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        upload_func: Optional[Callable] = None,
+        delete_func: Optional[Callable[[str], object]] = None,
+        ttl_seconds: int = GEMINI_FILE_TTL_SECONDS,
+        expiry_margin_seconds: int = 60 * 60,
+        idle_seconds: int = 2 * 60 * 60,
+        cleanup_interval_seconds: int = 10 * 60,
+    ):
+        self._upload_func = upload_func
+        self._delete_func = delete_func
+        self.ttl_seconds = max(0, ttl_seconds - expiry_margin_seconds)
+        self.idle_seconds = idle_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._entries: Dict[str, _UploadedFile] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "uploads": 0, "deletes": 0, "bytes_uploaded": 0}
+        self._cleanup_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _upload(self, stream: io.BytesIO, mime_type: str):
+        if self._upload_func is None:
+            import google.generativeai as genai
+
+            self._upload_func = genai.upload_file
+        return self._upload_func(stream, mime_type=mime_type)
+
+    def _delete(self, handle) -> None:
+        name = getattr(handle, "name", None)
+        if not name:
+            return
+        if self._delete_func is None:
+            import google.generativeai as genai
+
+            self._delete_func = genai.delete_file
+        try:
+            self._delete_func(name)
+            with self._lock:
+                self._counters["deletes"] += 1
+        except Exception as exc:
+            logger.debug("Gemini 파일 삭제 실패(%s): %s", name, exc)
+
+    def upload(self, data: bytes, mime_type: str):
+        """Return a Gemini file handle for ``data``, uploading it only when needed."""
+        key = content_key(data, mime_type)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                hit = entry is not None and entry.expires_at > now
+                if hit:
+                    entry.last_used_at = now
+                    self._counters["hits"] += 1
+            record_cache_lookup(CACHE_NAME, hit)
+            if hit:
+                return entry.handle
+
+            handle = self._upload(io.BytesIO(data), mime_type)
+            with self._lock:
+                self._entries[key] = _UploadedFile(
+                    handle=handle,
+                    expires_at=now + self.ttl_seconds,
+                    last_used_at=now,
+                )
+                self._counters["uploads"] += 1
+                self._counters["bytes_uploaded"] += len(data)
+            record_transfer("gemini", sent=len(data))
+            record_cache_write(CACHE_NAME)
+
+        self._ensure_cleanup_thread()
+        return handle
+
+    def purge(self, *, everything: bool = False) -> int:
+        """Forget expired or idle handles and delete them upstream."""
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                expired = entry.expires_at <= now
+                idle = now - entry.last_used_at >= self.idle_seconds
+                if everything or expired or idle:
+                    stale.append(entry)
+                    del self._entries[key]
+                    self._key_locks.pop(key, None)
+
+        for entry in stale:
+            self._delete(entry.handle)
+        return len(stale)
+
+    def _ensure_cleanup_thread(self) -> None:
+        if self._cleanup_thread is not None or self.cleanup_interval_seconds <= 0:
+            return
+        with self._lock:
+            if self._cleanup_thread is not None:
+                return
+            self._cleanup_thread = threading.Thread(
+                target=self._cleanup_loop,
+                name="gemini-upload-cleanup",
+                daemon=True,
+            )
+            self._cleanup_thread.start()
+
+    def _cleanup_loop(self) -> None:
+        while not self._stop.wait(self.cleanup_interval_seconds):
+            try:
+                removed = self.purge()
+                if removed:
+                    logger.info("Gemini 업로드 파일 %d개 정리", removed)
+            except Exception:
+                logger.exception("Gemini 업로드 파일 정리 실패")
+
+    def close(self) -> None:
+        self._stop.set()
+        self.purge(everything=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        return counters
+
+
+__all__ = ["GEMINI_FILE_TTL_SECONDS", "GeminiUploadCache"]
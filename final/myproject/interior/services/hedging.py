@@ -0,0 +1,252 @@
+import asyncio
+import bisect
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from .design_pipeline import PipelineStepError
+from .resilience import is_degraded_error
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STAT_KEYS = ("attempts", "retries", "hedges", "hedge_wins")
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    # Pipeline errors (e.g. an open circuit breaker) are final; only raw provider errors are retried.
+    return not isinstance(exc, PipelineStepError) and is_degraded_error(exc)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt``."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Caps how many hedge requests may be sent per rolling minute."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._sent = []
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            del self._sent[: bisect.bisect_left(self._sent, now - 60)]
+            if len(self._sent) >= self.per_minute:
+                return False
+            self._sent.append(now)
+            return True
+
+
+class HedgedCaller:
+    """Retries transient provider errors and hedges slow calls.
+
+    ``func(timeout)`` performs one provider request. Each attempt gets a
+    timeout derived from the observed p99 latency (capped by the caller's
+    timeout). Once enough samples exist, an attempt still running after the
+    p95 latency is duplicated and the first successful response wins.
+    Counts of attempts, retries and hedges are written into ``stats``.
+    """
+
+    def __init__(
+        self,
+        *,
+        retry: Optional[RetryPolicy] = None,
+        hedging: bool = True,
+        hedge_percentile: float = 0.95,
+        hedges_per_minute: int = 10,
+        min_timeout: float = 30.0,
+        timeout_multiplier: float = 2.0,
+        tracker: Optional[LatencyTracker] = None,
+        max_workers: int = 16,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.budget = HedgeBudget(hedges_per_minute)
+        self.min_timeout = min_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.tracker = tracker or LatencyTracker()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="hedged-call",
+                )
+            return self._executor
+
+    def attempt_timeout(self, timeout: float) -> float:
+        p99 = self.tracker.percentile(0.99)
+        if p99 is None:
+            return timeout
+        return min(timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedging:
+            return None
+        return self.tracker.percentile(self.hedge_percentile)
+
+    @staticmethod
+    def _init_stats(stats: Optional[Dict[str, int]]) -> Dict[str, int]:
+        stats = stats if stats is not None else {}
+        for key in STAT_KEYS:
+            stats.setdefault(key, 0)
+        return stats
+
+    def _timed(self, func: Callable[[float], T], timeout: float) -> T:
+        started = time.monotonic()
+        result = func(timeout)
+        self.tracker.record(time.monotonic() - started)
+        return result
+
+    def _attempt(self, func: Callable[[float], T], timeout: float, stats: Dict[str, int]) -> T:
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(func, timeout)
+
+        pool = self._pool()
+        primary = pool.submit(self._timed, func, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.budget.try_acquire():
+            return primary.result()
+
+        stats["hedges"] += 1
+        logger.info("응답 지연(%.1fs 초과)으로 헤지 요청을 보냅니다.", delay)
+        hedge = pool.submit(self._timed, func, timeout)
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is hedge:
+                        stats["hedge_wins"] += 1
+                    return future.result()
+                first_error = first_error or error
+        raise first_error
+
+    def call(self, func: Callable[[float], T], *, timeout: float, stats: Optional[Dict[str, int]] = None) -> T:
+        stats = self._init_stats(stats)
+        attempt_timeout = self.attempt_timeout(timeout)
+        for attempt in range(1, self.retry.max_attempts + 1):
+            stats["attempts"] += 1
+            try:
+                return self._attempt(func, attempt_timeout, stats)
+            except Exception as exc:
+                if attempt >= self.retry.max_attempts or not is_retryable_error(exc):
+                    raise
+                stats["retries"] += 1
+                delay = self.retry.backoff(attempt)
+                logger.warning("일시적 오류로 재시도합니다(%d/%d, %.1fs 후): %s", attempt, self.retry.max_attempts, delay, exc)
+                time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _atimed(self, func: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        started = time.monotonic()
+        result = await func(timeout)
+        self.tracker.record(time.monotonic() - started)
+        return result
+
+    async def _aattempt(self, func: Callable[[float], Awaitable[T]], timeout: float, stats: Dict[str, int]) -> T:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._atimed(func, timeout)
+
+        primary = asyncio.ensure_future(self._atimed(func, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.budget.try_acquire():
+            return await primary
+
+        stats["hedges"] += 1
+        logger.info("응답 지연(%.1fs 초과)으로 헤지 요청을 보냅니다.", delay)
+        hedge = asyncio.ensure_future(self._atimed(func, timeout))
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            stats["hedge_wins"] += 1
+                        return task.result()
+                    first_error = first_error or error
+        finally:
+            for task in pending:
+                task.cancel()
+        raise first_error
+
+    async def acall(
+        self,
+        func: Callable[[float], Awaitable[T]],
+        *,
+        timeout: float,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> T:
+        stats = self._init_stats(stats)
+        attempt_timeout = self.attempt_timeout(timeout)
+        for attempt in range(1, self.retry.max_attempts + 1):
+            stats["attempts"] += 1
+            try:
+                return await self._aattempt(func, attempt_timeout, stats)
+            except Exception as exc:
+                if attempt >= self.retry.max_attempts or not is_retryable_error(exc):
+                    raise
+                stats["retries"] += 1
+                delay = self.retry.backoff(attempt)
+                logger.warning("일시적 오류로 재시도합니다(%d/%d, %.1fs 후): %s", attempt, self.retry.max_attempts, delay, exc)
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+
+__all__ = [
+    "HedgeBudget",
+    "HedgedCaller",
+    "LatencyTracker",
+    "RetryPolicy",
+    "is_retryable_error",
+]
@@ -0,0 +1,195 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - metrics become no-ops without the client
+    prometheus_client = None
+
+# Step names used as the ``step`` label of PIPELINE_STEP_SECONDS.
+NORMALIZE_INPUT = "normalize_input"
+STEP_EMPTY_ROOM = "generate_empty_room"
+STEP3_UPLOAD = "step3_upload"
+STEP3_GENERATE = "step3_generate"
+STEP4 = "step4"
+WEBP_ENCODE = "webp_encode"
+STORAGE_SAVE = "storage_save"
+DB_INSERT = "db_insert"
+
+STEP_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, amount):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+if prometheus_client is not None:
+    PIPELINE_STEP_SECONDS = Histogram(
+        "pipeline_step_seconds",
+        "Duration of each design pipeline step.",
+        ["step"],
+        buckets=STEP_BUCKETS,
+    )
+    PIPELINE_IN_FLIGHT = Gauge(
+        "pipeline_in_flight",
+        "Pipelines and variants currently being generated.",
+        ["kind"],
+        multiprocess_mode="livesum",
+    )
+    PROVIDER_IN_FLIGHT = Gauge(
+        "provider_requests_in_flight",
+        "Provider requests currently awaiting a response.",
+        ["provider"],
+        multiprocess_mode="livesum",
+    )
+    PROVIDER_ERRORS = Counter(
+        "provider_errors",
+        "Failed or rejected provider requests.",
+        ["provider", "kind"],
+    )
+    PROVIDER_BYTES_SENT = Counter(
+        "provider_bytes_sent",
+        "Image bytes sent to AI providers.",
+        ["provider"],
+    )
+    PROVIDER_BYTES_RECEIVED = Counter(
+        "provider_bytes_received",
+        "Image bytes received from AI providers.",
+        ["provider"],
+    )
+    INPUT_BYTES = Counter(
+        "pipeline_input_bytes",
+        "Source image bytes before and after input normalisation.",
+        ["stage"],
+    )
+    CACHE_LOOKUPS = Counter(
+        "cache_lookups",
+        "Cache lookups by cache name and result (hit or miss).",
+        ["cache", "result"],
+    )
+    CACHE_WRITES = Counter(
+        "cache_writes",
+        "Entries written to each cache.",
+        ["cache"],
+    )
+    CACHE_EVICTIONS = Counter(
+        "cache_evictions",
+        "Entries evicted from each cache to stay within its size limit.",
+        ["cache"],
+    )
+else:
+    PIPELINE_STEP_SECONDS = PIPELINE_IN_FLIGHT = PROVIDER_IN_FLIGHT = _NoopMetric()
+    PROVIDER_ERRORS = PROVIDER_BYTES_SENT = PROVIDER_BYTES_RECEIVED = INPUT_BYTES = _NoopMetric()
+    CACHE_LOOKUPS = CACHE_WRITES = CACHE_EVICTIONS = _NoopMetric()
+
+
+@contextmanager
+def observe_step(step: str):
+    """Record the duration of ``step`` whether it succeeds or fails."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STEP_SECONDS.labels(step=step).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_in_flight(gauge, **labels):
+    metric = gauge.labels(**labels)
+    metric.inc()
+    try:
+        yield
+    finally:
+        metric.dec()
+
+
+def record_transfer(provider: str, *, sent: int = 0, received: int = 0) -> None:
+    if sent:
+        PROVIDER_BYTES_SENT.labels(provider=provider).inc(sent)
+    if received:
+        PROVIDER_BYTES_RECEIVED.labels(provider=provider).inc(received)
+
+
+def record_input_normalized(original_bytes: int, normalized_bytes: int) -> None:
+    INPUT_BYTES.labels(stage="original").inc(original_bytes)
+    INPUT_BYTES.labels(stage="normalized").inc(normalized_bytes)
+
+
+def record_provider_error(provider: str, kind: str) -> None:
+    PROVIDER_ERRORS.labels(provider=provider, kind=kind).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_cache_write(cache: str, *, evicted: int = 0) -> None:
+    CACHE_WRITES.labels(cache=cache).inc()
+    if evicted:
+        CACHE_EVICTIONS.labels(cache=cache).inc(evicted)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Return the text exposition of all metrics and its content type.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set (gunicorn workers plus the pipeline
+    worker), samples written by every process are aggregated.
+    """
+    if prometheus_client is None:
+        return b"# prometheus_client is not installed\n", "text/plain; version=0.0.4; charset=utf-8"
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited worker (gunicorn ``child_exit`` hook)."""
+    if prometheus_client is not None and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
+__all__ = [
+    "DB_INSERT",
+    "NORMALIZE_INPUT",
+    "PIPELINE_IN_FLIGHT",
+    "PROVIDER_IN_FLIGHT",
+    "STEP3_GENERATE",
+    "STEP3_UPLOAD",
+    "STEP4",
+    "STEP_EMPTY_ROOM",
+    "STORAGE_SAVE",
+    "WEBP_ENCODE",
+    "mark_process_dead",
+    "observe_step",
+    "record_cache_lookup",
+    "record_cache_write",
+    "record_input_normalized",
+    "record_provider_error",
+    "record_transfer",
+    "render_latest",
+    "track_in_flight",
+]
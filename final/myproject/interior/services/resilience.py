@@ -0,0 +1,347 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .design_pipeline import PipelineStepError
+from .metrics import PROVIDER_IN_FLIGHT, record_provider_error, track_in_flight
+
+logger = logging.getLogger(__name__)
+
+DEGRADED_STATUS_CODES = {408, 429}
+DEGRADED_ERROR_NAMES = (
+    "RateLimit",
+    "ResourceExhausted",
+    "Timeout",
+    "DeadlineExceeded",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "APIConnectionError",
+)
+DEGRADED_MESSAGE_MARKERS = (
+    "quota",
+    "rate limit",
+    "resource_exhausted",
+    "resource exhausted",
+    "429",
+    "unavailable",
+    "overloaded",
+    "timed out",
+    "deadline",
+)
+
+
+class ProviderUnavailableError(PipelineStepError):
+    """Raised without calling the provider when it is rate limited or its circuit is open."""
+
+
+def is_degraded_error(exc: BaseException) -> bool:
+    """Return True for errors that mean the provider is overloaded rather than the request being bad."""
+    for attr in ("status_code", "code"):
+        code = getattr(exc, attr, None)
+        if isinstance(code, int) and (code in DEGRADED_STATUS_CODES or code >= 500):
+            return True
+    name = type(exc).__name__
+    if any(marker in name for marker in DEGRADED_ERROR_NAMES):
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in DEGRADED_MESSAGE_MARKERS)
+
+
+class FileStateStore:
+    """JSON state shared by every process on the host, serialised with ``flock``."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    @contextmanager
+    def locked(self):
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            handle.seek(0)
+            raw = handle.read()
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                logger.warning("제공자 상태 파일이 손상되어 초기화합니다: %s", self.path)
+                state = {}
+            try:
+                yield state
+            finally:
+                handle.seek(0)
+                handle.truncate()
+                json.dump(state, handle)
+                handle.flush()
+
+    def read(self) -> Dict[str, Any]:
+        with self.locked() as state:
+            return json.loads(json.dumps(state))
+
+
+@dataclass(frozen=True)
+class GuardConfig:
+    rate_per_minute: float = 60.0
+    burst: int = 10
+    failure_threshold: int = 5
+    reset_seconds: float = 60.0
+    probe_timeout_seconds: float = 300.0
+    max_wait_seconds: float = 30.0
+
+
+class ProviderGuard:
+    """Token bucket plus circuit breaker for one provider/model pair.
+
+    State lives in a :class:`FileStateStore` so all gunicorn workers on the
+    host draw from the same bucket and see the same breaker.
+    """
+
+    def __init__(self, key: str, store: FileStateStore, config: GuardConfig):
+        self.key = key
+        self.provider = key.split(":", 1)[0]
+        self.store = store
+        self.config = config
+
+    @property
+    def _rate(self) -> float:
+        return max(self.config.rate_per_minute, 0.001) / 60.0
+
+    def _entry(self, state: Dict[str, Any], now: float) -> Dict[str, Any]:
+        return state.setdefault(
+            self.key,
+            {
+                "tokens": float(self.config.burst),
+                "refilled_at": now,
+                "breaker": "closed",
+                "failures": 0,
+                "open_until": 0.0,
+                "probe_until": 0.0,
+                "calls": 0,
+                "rejected": 0,
+                "degraded_errors": 0,
+                "last_error": None,
+            },
+        )
+
+    def _reserve(self) -> float:
+        """Take a token, or return how long to wait for one."""
+        now = time.time()
+        with self.store.locked() as state:
+            entry = self._entry(state, now)
+
+            if entry["breaker"] == "open":
+                if now < entry["open_until"]:
+                    entry["rejected"] += 1
+                    raise ProviderUnavailableError(
+                        f"{self.key} 제공자가 불안정하여 요청을 차단했습니다. "
+                        f"{int(entry['open_until'] - now) + 1}초 후 다시 시도해주세요."
+                    )
+                entry["breaker"] = "half_open"
+                entry["probe_until"] = 0.0
+
+            if entry["breaker"] == "half_open" and now < entry["probe_until"]:
+                entry["rejected"] += 1
+                raise ProviderUnavailableError(f"{self.key} 제공자 복구 여부를 확인하는 중입니다.")
+
+            elapsed = max(0.0, now - entry["refilled_at"])
+            entry["tokens"] = min(float(self.config.burst), entry["tokens"] + elapsed * self._rate)
+            entry["refilled_at"] = now
+            if entry["tokens"] < 1.0:
+                return (1.0 - entry["tokens"]) / self._rate
+
+            entry["tokens"] -= 1.0
+            entry["calls"] += 1
+            if entry["breaker"] == "half_open":
+                entry["probe_until"] = now + self.config.probe_timeout_seconds
+            return 0.0
+
+    def _rate_limited(self, waited: float, wait: float) -> None:
+        if waited + wait > self.config.max_wait_seconds:
+            with self.store.locked() as state:
+                self._entry(state, time.time())["rejected"] += 1
+            raise ProviderUnavailableError(f"{self.key} 호출 한도에 도달했습니다. 잠시 후 다시 시도해주세요.")
+
+    def acquire(self) -> None:
+        waited = 0.0
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            self._rate_limited(waited, wait)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self) -> None:
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._reserve)
+            if wait <= 0:
+                return
+            self._rate_limited(waited, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def record_success(self) -> None:
+        with self.store.locked() as state:
+            entry = self._entry(state, time.time())
+            entry["breaker"] = "closed"
+            entry["failures"] = 0
+            entry["probe_until"] = 0.0
+
+    def record_failure(self, exc: BaseException) -> None:
+        record_provider_error(self.provider, "degraded" if is_degraded_error(exc) else "error")
+        now = time.time()
+        with self.store.locked() as state:
+            entry = self._entry(state, now)
+            if not is_degraded_error(exc):
+                # The provider answered; a bad request says nothing about its health.
+                if entry["breaker"] == "half_open":
+                    entry["breaker"] = "closed"
+                    entry["failures"] = 0
+                return
+
+            entry["failures"] += 1
+            entry["degraded_errors"] += 1
+            entry["last_error"] = f"{type(exc).__name__}: {exc}"[:300]
+            if entry["breaker"] == "half_open" or entry["failures"] >= self.config.failure_threshold:
+                entry["breaker"] = "open"
+                entry["open_until"] = now + self.config.reset_seconds
+                logger.warning("%s 회로 차단기 열림 (%d회 연속 실패)", self.key, entry["failures"])
+
+    def call(self, func: Callable, *args, **kwargs):
+        try:
+            self.acquire()
+        except ProviderUnavailableError:
+            record_provider_error(self.provider, "rejected")
+            raise
+        try:
+            with track_in_flight(PROVIDER_IN_FLIGHT, provider=self.provider):
+                result = func(*args, **kwargs)
+        except Exception as exc:
+            self.record_failure(exc)
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, func: Callable, *args, **kwargs):
+        try:
+            await self.aacquire()
+        except ProviderUnavailableError:
+            record_provider_error(self.provider, "rejected")
+            raise
+        try:
+            with track_in_flight(PROVIDER_IN_FLIGHT, provider=self.provider):
+                result = await func(*args, **kwargs)
+        except Exception as exc:
+            await asyncio.to_thread(self.record_failure, exc)
+            raise
+        await asyncio.to_thread(self.record_success)
+        return result
+
+
+class ProviderGuardRegistry:
+    """Creates guards per ``provider:model`` key from a default config plus overrides."""
+
+    def __init__(
+        self,
+        store: FileStateStore,
+        *,
+        defaults: Optional[Dict[str, GuardConfig]] = None,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.store = store
+        self.defaults = defaults or {}
+        self.overrides = overrides or {}
+        self._guards: Dict[str, ProviderGuard] = {}
+
+    def guard(self, provider: str, model: Optional[str]) -> ProviderGuard:
+        key = f"{provider}:{model or 'default'}"
+        guard = self._guards.get(key)
+        if guard is None:
+            config = self.defaults.get(provider, GuardConfig())
+            override = self.overrides.get(key)
+            if override:
+                config = GuardConfig(**{**config.__dict__, **override})
+            guard = self._guards.setdefault(key, ProviderGuard(key, self.store, config))
+        return guard
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the shared state of every guard for monitoring."""
+        now = time.time()
+        providers = {}
+        for key, entry in self.store.read().items():
+            breaker = entry.get("breaker", "closed")
+            if breaker == "open" and now >= entry.get("open_until", 0):
+                breaker = "half_open"
+            providers[key] = {
+                "state": breaker,
+                "consecutive_failures": entry.get("failures", 0),
+                "open_for_seconds": max(0.0, round(entry.get("open_until", 0) - now, 1)),
+                "tokens": round(entry.get("tokens", 0.0), 2),
+                "calls": entry.get("calls", 0),
+                "rejected": entry.get("rejected", 0),
+                "degraded_errors": entry.get("degraded_errors", 0),
+                "last_error": entry.get("last_error"),
+            }
+        return providers
+
+
+class _GuardedImages:
+    def __init__(self, images, registry: ProviderGuardRegistry, is_async: bool):
+        self._images = images
+        self._registry = registry
+        self._is_async = is_async
+
+    def edit(self, **kwargs):
+        guard = self._registry.guard("openai", kwargs.get("model"))
+        if self._is_async:
+            return guard.acall(self._images.edit, **kwargs)
+        return guard.call(self._images.edit, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._images, name)
+
+
+class GuardedOpenAIClient:
+    """Wraps an ``OpenAI``/``AsyncOpenAI`` client so ``images.edit`` goes through the guards."""
+
+    def __init__(self, client, registry: ProviderGuardRegistry, *, is_async: bool = False):
+        self._client = client
+        self.images = _GuardedImages(client.images, registry, is_async)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class GuardedGenerativeModel:
+    """Wraps a Gemini ``GenerativeModel`` so content generation goes through the guards."""
+
+    def __init__(self, model, registry: ProviderGuardRegistry, model_name: str):
+        self._model = model
+        self._guard = registry.guard("gemini", model_name)
+
+    def generate_content(self, *args, **kwargs):
+        return self._guard.call(self._model.generate_content, *args, **kwargs)
+
+    async def generate_content_async(self, *args, **kwargs):
+        return await self._guard.acall(self._model.generate_content_async, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+__all__ = [
+    "FileStateStore",
+    "GuardConfig",
+    "GuardedGenerativeModel",
+    "GuardedOpenAIClient",
+    "ProviderGuard",
+    "ProviderGuardRegistry",
+    "ProviderUnavailableError",
+    "is_degraded_error",
+]
@@ -0,0 +1,70 @@
+import io
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from interior.services.artifacts import ImageArtifact, sniff_format
+from interior.services.design_pipeline import PipelineStepError
+from interior.services.fakes import fake_image_bytes
+
+
+def encode(image_format, size=(8, 6)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (10, 20, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class ImageArtifactTests(SimpleTestCase):
+    def test_sniffed_bytes_are_kept_without_decoding(self):
+        png = fake_image_bytes(8, 6)
+        artifact = ImageArtifact.from_bytes(png)
+
+        self.assertEqual(artifact.format, "PNG")
+        self.assertIs(artifact.encoded("PNG"), artifact.data)
+        self.assertEqual(artifact.data, png)
+        self.assertIsNone(artifact._image)
+
+    def test_each_format_is_encoded_once(self):
+        artifact = ImageArtifact.from_bytes(fake_image_bytes(8, 6))
+
+        first = artifact.encoded("WEBP")
+
+        self.assertIs(artifact.encoded("webp"), first)
+        self.assertEqual(sniff_format(first), "WEBP")
+        self.assertEqual(artifact.format, "PNG")
+
+    def test_containers_sniff_format_does_not_know_keep_their_bytes(self):
+        for image_format, mimetype in (("BMP", "image/bmp"), ("TIFF", "image/tiff")):
+            original = encode(image_format)
+
+            artifact = ImageArtifact.from_bytes(original)
+
+            self.assertEqual(artifact.format, image_format)
+            self.assertEqual(artifact.data, original)
+            self.assertEqual(artifact.mimetype, mimetype)
+            self.assertEqual(artifact.image.size, (8, 6))
+
+    def test_unreadable_bytes_raise_a_pipeline_error(self):
+        with self.assertRaises(PipelineStepError):
+            ImageArtifact.from_bytes(b"not an image at all")
+
+    def test_truncated_image_raises_a_pipeline_error_on_decode(self):
+        artifact = ImageArtifact.from_bytes(encode("PNG", (64, 64))[:60])
+
+        with self.assertRaises(PipelineStepError):
+            artifact.encoded("WEBP")
+
+    def test_pixels_only_artifact_defaults_to_webp(self):
+        artifact = ImageArtifact.from_image(Image.new("RGB", (4, 4)))
+
+        self.assertEqual(sniff_format(artifact.data), "WEBP")
+        self.assertEqual(artifact.format, "WEBP")
+
+    def test_released_pixels_are_decoded_again(self):
+        artifact = ImageArtifact.from_bytes(fake_image_bytes(8, 6))
+        artifact.encoded("WEBP")
+
+        artifact.release_pixels()
+
+        self.assertIsNone(artifact._image)
+        self.assertEqual(artifact.image.size, (8, 6))
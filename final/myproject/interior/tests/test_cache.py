@@ -0,0 +1,132 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from interior.services.cache import DiskLRUCache, content_key
+from interior.services.design_pipeline import generate_empty_room
+from interior.services.fakes import FakeOpenAI, FakeProviderConfig, fake_photo_bytes
+
+from .test_metrics import sample
+
+
+class ContentKeyTests(SimpleTestCase):
+    def test_parts_are_length_prefixed(self):
+        self.assertNotEqual(content_key("ab", "c"), content_key("a", "bc"))
+
+    def test_str_and_bytes_parts_agree(self):
+        self.assertEqual(content_key("방", b"x"), content_key("방".encode(), "x"))
+
+
+class DiskLRUCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def cache(self, max_bytes=100):
+        return DiskLRUCache(self.directory.name, max_bytes, name="test")
+
+    def test_round_trip_and_counters(self):
+        cache = self.cache()
+        key = content_key("a")
+
+        self.assertIsNone(cache.get(key))
+        cache.set(key, b"data")
+
+        self.assertEqual(cache.get(key), b"data")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["writes"]), (1, 1, 1))
+        self.assertEqual((stats["entries"], stats["bytes"]), (1, 4))
+
+    def test_entries_are_shared_between_instances(self):
+        key = content_key("shared")
+        self.cache().set(key, b"data")
+
+        self.assertEqual(self.cache().get(key), b"data")
+
+    def test_evicts_least_recently_used_first(self):
+        cache = self.cache(max_bytes=100)
+        old, recent = content_key("old"), content_key("recent")
+        cache.set(old, b"o" * 40)
+        cache.set(recent, b"r" * 40)
+        os.utime(cache._path(old), (1000, 1000))
+        os.utime(cache._path(recent), (2000, 2000))
+        # A read refreshes the entry, so "old" becomes the most recently used.
+        cache.get(old)
+
+        cache.set(content_key("new"), b"n" * 40)
+
+        self.assertEqual(cache.get(old), b"o" * 40)
+        self.assertIsNone(cache.get(recent))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["bytes"], 100)
+
+    def test_writes_under_the_budget_do_not_rescan_the_directory(self):
+        self.cache().set(content_key("existing"), b"e" * 30)
+        cache = self.cache(max_bytes=100)
+
+        with mock.patch.object(cache, "_entries", wraps=cache._entries) as scan:
+            cache.set(content_key("a"), b"a" * 30)
+            cache.set(content_key("a"), b"a" * 30)
+            cache.set(content_key("b"), b"b" * 30)
+            self.assertEqual(scan.call_count, 0)
+
+            cache.set(content_key("c"), b"c" * 30)
+            self.assertEqual(scan.call_count, 1)
+
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache._bytes, 90)
+
+    def test_hits_misses_and_evictions_are_exported_per_cache(self):
+        cache = DiskLRUCache(self.directory.name, 50, name="test_export")
+        before = {
+            "hit": sample("cache_lookups_total", cache="test_export", result="hit"),
+            "miss": sample("cache_lookups_total", cache="test_export", result="miss"),
+            "evictions": sample("cache_evictions_total", cache="test_export"),
+        }
+
+        cache.get(content_key("a"))
+        cache.set(content_key("a"), b"a" * 30)
+        cache.get(content_key("a"))
+        cache.set(content_key("b"), b"b" * 30)
+
+        self.assertEqual(sample("cache_lookups_total", cache="test_export", result="hit") - before["hit"], 1)
+        self.assertEqual(sample("cache_lookups_total", cache="test_export", result="miss") - before["miss"], 1)
+        self.assertEqual(sample("cache_evictions_total", cache="test_export") - before["evictions"], 1)
+
+    def test_entries_larger_than_the_budget_are_not_stored(self):
+        cache = self.cache(max_bytes=10)
+        key = content_key("big")
+
+        cache.set(key, b"x" * 11)
+
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()["writes"], 0)
+
+
+class EmptyRoomCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = DiskLRUCache(directory.name, 10 * 1024 * 1024, name="empty_room")
+        self.client = FakeOpenAI(FakeProviderConfig(image_size=(32, 32)), seed=0)
+        self.photo = fake_photo_bytes(64, 48)
+
+    def test_same_source_and_settings_skip_the_provider(self):
+        hits = sample("cache_lookups_total", cache="empty_room", result="hit")
+
+        first = generate_empty_room(self.photo, self.client, size="32x32", cache=self.cache)
+        second = generate_empty_room(self.photo, self.client, size="32x32", cache=self.cache)
+
+        self.assertEqual(self.client.calls.calls, 1)
+        self.assertEqual(first.image.size, second.image.size)
+        self.assertEqual(sample("cache_lookups_total", cache="empty_room", result="hit") - hits, 1)
+
+    def test_other_size_prompt_or_source_misses(self):
+        generate_empty_room(self.photo, self.client, size="32x32", cache=self.cache)
+        generate_empty_room(self.photo, self.client, size="64x64", cache=self.cache)
+        generate_empty_room(self.photo, self.client, size="32x32", prompt="다른 프롬프트", cache=self.cache)
+        generate_empty_room(fake_photo_bytes(64, 48, seed=1), self.client, size="32x32", cache=self.cache)
+
+        self.assertEqual(self.client.calls.calls, 4)
@@ -0,0 +1,83 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from interior.services.checkpoints import STAGE_EMPTY_ROOM, STAGE_NORMALIZE, MemoryCheckpointStore, variant_stage
+from interior.services.design_pipeline import arun_design_pipeline
+from interior.services.fakes import FakeProviders, fake_photo_bytes
+
+from .test_design_pipeline import SMALL, ConcurrencyProbe, run_pipeline
+
+
+class RecordingStore(MemoryCheckpointStore):
+    """Counts saves per stage; ``unreadable`` stages are stored but fail to load."""
+
+    def __init__(self, unreadable=()):
+        super().__init__()
+        self.unreadable = set(unreadable)
+        self.saves = []
+
+    def load(self, stage):
+        if stage in self.unreadable:
+            return None
+        return super().load(stage)
+
+    def save(self, stage, image=None, meta=None):
+        self.saves.append(stage)
+        super().save(stage, image, meta)
+
+
+class PipelineCheckpointTests(SimpleTestCase):
+    def test_first_run_saves_every_stage(self):
+        store = RecordingStore()
+
+        run_pipeline(ConcurrencyProbe(delay=0), variations=2, checkpoints=store)
+
+        self.assertEqual(store.saves[:2], [STAGE_NORMALIZE, STAGE_EMPTY_ROOM])
+        self.assertIn(variant_stage(1, "step3"), store.saves)
+        self.assertIn(variant_stage(2, "step3"), store.saves)
+
+    def test_rerun_resumes_without_saving_or_calling_providers(self):
+        store = RecordingStore()
+        run_pipeline(ConcurrencyProbe(delay=0), variations=2, checkpoints=store)
+        store.saves.clear()
+        model = ConcurrencyProbe(delay=0)
+
+        result = run_pipeline(model, variations=2, checkpoints=store)
+
+        self.assertEqual(store.saves, [])
+        self.assertEqual(model.started, 0)
+        self.assertEqual(len(result["variants"]), 2)
+
+    def test_stage_already_stored_is_not_written_again(self):
+        store = RecordingStore(unreadable={STAGE_NORMALIZE, STAGE_EMPTY_ROOM})
+        store.save(STAGE_NORMALIZE)
+        store.save(STAGE_EMPTY_ROOM)
+        store.saves.clear()
+
+        run_pipeline(ConcurrencyProbe(delay=0), variations=1, checkpoints=store)
+
+        self.assertNotIn(STAGE_NORMALIZE, store.saves)
+        self.assertNotIn(STAGE_EMPTY_ROOM, store.saves)
+        self.assertIn(variant_stage(1, "step3"), store.saves)
+
+    def test_async_stage_already_stored_is_not_written_again(self):
+        store = RecordingStore(unreadable={STAGE_NORMALIZE, STAGE_EMPTY_ROOM})
+        store.save(STAGE_NORMALIZE)
+        store.save(STAGE_EMPTY_ROOM)
+        store.saves.clear()
+        providers = FakeProviders(openai=SMALL, gemini=SMALL, seed=0)
+
+        asyncio.run(
+            arun_design_pipeline(
+                fake_photo_bytes(160, 120),
+                openai_client=providers.async_openai_client,
+                generative_model=providers.generative_model,
+                style_prompt="모던",
+                size="64x64",
+                upload_cache=providers.upload_cache(),
+                checkpoints=store,
+            )
+        )
+
+        self.assertEqual(store.saves, [variant_stage(1, "step3")])
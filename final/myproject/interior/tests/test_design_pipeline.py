@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from interior.services.design_pipeline import PipelineCancelled, PipelineStepError, arun_design_pipeline, run_design_pipeline
+from interior.services.fakes import (
+    FakeGenerativeModel,
+    FakeProviderConfig,
+    FakeProviderError,
+    FakeProviders,
+    fake_photo_bytes,
+)
+
+SMALL = FakeProviderConfig(image_size=(64, 64))
+
+
+class ConcurrencyProbe(FakeGenerativeModel):
+    """Fake Gemini model that records how many calls overlap and fails chosen calls."""
+
+    def __init__(self, *, delay=0.05, fail_calls=()):
+        super().__init__(SMALL, seed=0)
+        self.delay = delay
+        self.fail_calls = set(fail_calls)
+        self.active = 0
+        self.peak = 0
+        self.started = 0
+        self.threads = set()
+        self._probe_lock = threading.Lock()
+
+    def generate_content(self, contents=None, *, request_options=None, **kwargs):
+        with self._probe_lock:
+            self.started += 1
+            call = self.started
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.current_thread().name)
+        try:
+            time.sleep(self.delay)
+            if call in self.fail_calls:
+                raise FakeProviderError("가상 실패")
+            return super().generate_content(contents, request_options=request_options, **kwargs)
+        finally:
+            with self._probe_lock:
+                self.active -= 1
+
+
+def run_pipeline(model, **kwargs):
+    providers = FakeProviders(openai=SMALL, gemini=SMALL, seed=0)
+    options = {
+        "openai_client": providers.openai_client,
+        "generative_model": model,
+        "style_prompt": "모던",
+        "size": "64x64",
+        "upload_cache": providers.upload_cache(),
+    }
+    options.update(kwargs)
+    return run_design_pipeline(fake_photo_bytes(160, 120), **options)
+
+
+class VariantConcurrencyTests(SimpleTestCase):
+    def test_variants_run_in_parallel_up_to_the_bound(self):
+        model = ConcurrencyProbe()
+
+        result = run_pipeline(model, variations=5, max_concurrency=2)
+
+        self.assertEqual(model.peak, 2)
+        self.assertEqual([variant["index"] for variant in result["variants"]], [1, 2, 3, 4, 5])
+        self.assertEqual(result["errors"], [])
+        self.assertTrue(all(name.startswith("design-variant") for name in model.threads))
+
+    def test_concurrency_never_exceeds_the_variant_count(self):
+        model = ConcurrencyProbe()
+
+        run_pipeline(model, variations=2, max_concurrency=8)
+
+        self.assertLessEqual(model.peak, 2)
+
+    def test_failed_variant_does_not_fail_the_run(self):
+        model = ConcurrencyProbe(fail_calls={2})
+
+        result = run_pipeline(model, variations=4, max_concurrency=4)
+
+        self.assertEqual(len(result["variants"]), 3)
+        self.assertEqual(len(result["errors"]), 1)
+        indexes = [variant["index"] for variant in result["variants"]]
+        self.assertEqual(indexes, sorted(indexes))
+
+    def test_run_fails_when_no_variant_succeeds(self):
+        model = ConcurrencyProbe(fail_calls={1, 2, 3})
+
+        with self.assertRaises(PipelineStepError):
+            run_pipeline(model, variations=3, max_concurrency=3)
+
+    def test_progress_callback_runs_on_pool_threads(self):
+        events = []
+        lock = threading.Lock()
+
+        def record(step, state, detail):
+            with lock:
+                events.append((step, state, threading.current_thread().name))
+
+        run_pipeline(ConcurrencyProbe(), variations=3, max_concurrency=3, progress_callback=record)
+
+        step3 = [event for event in events if event[0].endswith(".step3")]
+        self.assertEqual(len(step3), 6)
+        self.assertTrue(all(name.startswith("design-variant") for _, _, name in step3))
+        self.assertIn(("empty_room", "completed"), [(step, state) for step, state, _ in events])
+
+
+class CancellationTests(SimpleTestCase):
+    def test_stop_skips_delivery_and_unstarted_variants(self):
+        model = ConcurrencyProbe()
+        delivered = []
+
+        with self.assertRaises(PipelineCancelled):
+            run_pipeline(
+                model,
+                variations=4,
+                max_concurrency=1,
+                variant_callback=delivered.append,
+                should_stop=lambda: len(delivered) >= 1,
+            )
+
+        self.assertEqual(len(delivered), 1)
+        self.assertLess(model.started, 4)
+
+    def test_async_stop_skips_delivery_and_unstarted_variants(self):
+        providers = FakeProviders(openai=SMALL, gemini=SMALL, seed=0)
+        model = FakeGenerativeModel(SMALL, seed=0)
+        delivered = []
+
+        with self.assertRaises(PipelineCancelled):
+            asyncio.run(
+                arun_design_pipeline(
+                    fake_photo_bytes(160, 120),
+                    openai_client=providers.async_openai_client,
+                    generative_model=model,
+                    style_prompt="모던",
+                    size="64x64",
+                    upload_cache=providers.upload_cache(),
+                    variations=4,
+                    max_concurrency=1,
+                    variant_callback=delivered.append,
+                    should_stop=lambda: len(delivered) >= 1,
+                )
+            )
+
+        self.assertEqual(len(delivered), 1)
+        self.assertLess(model.calls.calls, 4)
@@ -0,0 +1,87 @@
+import base64
+import io
+import random
+import statistics
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from interior.services import clients
+from interior.services.fakes import (
+    FakeGenerativeModel,
+    FakeOpenAI,
+    FakeProviderConfig,
+    FakeProviderError,
+    FakeProviders,
+    LatencyModel,
+    parse_size,
+)
+
+
+class LatencyModelTests(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(LatencyModel.parse("0.5"), LatencyModel("fixed", 0.5))
+        self.assertEqual(LatencyModel.parse("uniform:0.2,1.5"), LatencyModel("uniform", 0.2, 1.5))
+        self.assertEqual(LatencyModel.parse("lognormal:8,20").describe(), "lognormal:8,20")
+        for spec in ("", "fixed:-1", "uniform:2,1", "lognormal:1", "normal:1,2", "fixed:abc"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                LatencyModel.parse(spec)
+
+    def test_lognormal_matches_its_median_and_p95(self):
+        rng = random.Random(0)
+        model = LatencyModel.parse("lognormal:1,3")
+
+        samples = sorted(model.sample(rng) for _ in range(20000))
+
+        self.assertAlmostEqual(statistics.median(samples), 1.0, delta=0.05)
+        self.assertAlmostEqual(samples[int(len(samples) * 0.95)], 3.0, delta=0.2)
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("1536x1024"), (1536, 1024))
+        self.assertEqual(parse_size("auto"), (1024, 1024))
+        self.assertIsNone(parse_size("bad", default=None))
+
+
+class FakeProviderTests(SimpleTestCase):
+    def test_openai_answers_with_the_requested_size(self):
+        response = FakeOpenAI(FakeProviderConfig()).images.edit(prompt="p", size="48x32")
+
+        image = Image.open(io.BytesIO(base64.b64decode(response.data[0].b64_json)))
+        self.assertEqual(image.size, (48, 32))
+
+    def test_error_rate_is_reproducible_per_seed(self):
+        def failures(seed):
+            model = FakeOpenAI(FakeProviderConfig(error_rate=0.3), seed=seed)
+            outcomes = []
+            for _ in range(50):
+                try:
+                    model.images.edit(prompt="p", size="8x8")
+                    outcomes.append(False)
+                except FakeProviderError as exc:
+                    self.assertEqual(exc.status_code, 503)
+                    outcomes.append(True)
+            return outcomes
+
+        self.assertEqual(failures(1), failures(1))
+        self.assertTrue(5 < sum(failures(1)) < 25)
+
+    def test_gemini_latency_above_the_timeout_fails_with_504(self):
+        model = FakeGenerativeModel(FakeProviderConfig(latency=LatencyModel("fixed", 0.05)))
+
+        with self.assertRaises(FakeProviderError) as raised:
+            model.generate_content("p", request_options={"timeout": 0.01})
+
+        self.assertEqual(raised.exception.status_code, 504)
+        self.assertEqual(model.calls.stats(), {"calls": 1, "failures": 1})
+
+    def test_override_providers_swaps_the_factories_and_restores_them(self):
+        providers = FakeProviders(seed=0)
+
+        with clients.override_providers(
+            openai_client=providers.openai_client, generative_model=providers.generative_model
+        ):
+            self.assertIs(clients.get_openai_client(), providers.openai_client)
+            self.assertIs(clients.get_generative_model(), providers.generative_model)
+
+        self.assertNotIn("openai", clients._overrides)
+        self.assertNotIn("generative_model", clients._overrides)
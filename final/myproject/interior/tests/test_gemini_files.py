@@ -0,0 +1,94 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from interior.services.gemini_files import GeminiUploadCache
+
+from .test_metrics import sample
+
+
+class RecordingFiles:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.uploads = []
+        self.deleted = []
+        self._lock = threading.Lock()
+
+    def upload(self, stream, mime_type=None):
+        time.sleep(self.delay)
+        with self._lock:
+            self.uploads.append((stream.getvalue(), mime_type))
+            return SimpleNamespace(name=f"files/{len(self.uploads)}")
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+
+class GeminiUploadCacheTests(SimpleTestCase):
+    def cache(self, files, **kwargs):
+        kwargs.setdefault("cleanup_interval_seconds", 0)
+        return GeminiUploadCache(upload_func=files.upload, delete_func=files.delete, **kwargs)
+
+    def test_identical_content_is_uploaded_once(self):
+        files = RecordingFiles()
+        cache = self.cache(files)
+
+        first = cache.upload(b"room", "image/webp")
+        second = cache.upload(b"room", "image/webp")
+
+        self.assertIs(first, second)
+        self.assertEqual(len(files.uploads), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_hits_and_uploads_are_exported(self):
+        before = [sample("cache_lookups_total", cache="gemini_upload", result=result) for result in ("hit", "miss")]
+        cache = self.cache(RecordingFiles())
+
+        for _ in range(3):
+            cache.upload(b"exported", "image/webp")
+
+        after = [sample("cache_lookups_total", cache="gemini_upload", result=result) for result in ("hit", "miss")]
+        self.assertEqual([now - then for now, then in zip(after, before)], [2, 1])
+
+    def test_mime_type_is_part_of_the_key(self):
+        files = RecordingFiles()
+        cache = self.cache(files)
+
+        cache.upload(b"room", "image/webp")
+        cache.upload(b"room", "image/png")
+
+        self.assertEqual(len(files.uploads), 2)
+
+    def test_concurrent_callers_share_one_upload(self):
+        files = RecordingFiles(delay=0.1)
+        cache = self.cache(files)
+        handles = []
+
+        threads = [threading.Thread(target=lambda: handles.append(cache.upload(b"room", "image/webp"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(files.uploads), 1)
+        self.assertEqual(len({id(handle) for handle in handles}), 1)
+
+    def test_handles_near_provider_expiry_are_uploaded_again(self):
+        files = RecordingFiles()
+        cache = self.cache(files, ttl_seconds=60, expiry_margin_seconds=60)
+
+        cache.upload(b"room", "image/webp")
+        cache.upload(b"room", "image/webp")
+
+        self.assertEqual(len(files.uploads), 2)
+
+    def test_purge_deletes_idle_handles_upstream(self):
+        files = RecordingFiles()
+        cache = self.cache(files, idle_seconds=0)
+        handle = cache.upload(b"room", "image/webp")
+
+        self.assertEqual(cache.purge(), 1)
+        self.assertEqual(files.deleted, [handle.name])
+        self.assertEqual(cache.stats()["entries"], 0)
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from interior.services.design_pipeline import PipelineStepError
+from interior.services.hedging import HedgeBudget, HedgedCaller, LatencyTracker, RetryPolicy
+
+NO_BACKOFF = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def warmed_tracker(latency=0.01, samples=20):
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(latency)
+    return tracker
+
+
+class SlowFirstCall:
+    """Provider whose first request hangs and later ones answer at once."""
+
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, timeout):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.delay)
+            return "slow"
+        return "fast"
+
+    async def acall(self, timeout):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.delay)
+            return "slow"
+        return "fast"
+
+
+class RetryTests(SimpleTestCase):
+    def test_transient_errors_are_retried(self):
+        outcomes = [RateLimitError("429"), RateLimitError("429"), "ok"]
+
+        def provider(timeout):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        stats = {}
+        result = HedgedCaller(retry=NO_BACKOFF, hedging=False).call(provider, timeout=5, stats=stats)
+
+        self.assertEqual(result, "ok")
+        self.assertEqual((stats["attempts"], stats["retries"]), (3, 2))
+
+    def test_bad_requests_and_pipeline_errors_are_not_retried(self):
+        for error in (ValueError("invalid image"), PipelineStepError("rate limit 차단")):
+            calls = []
+
+            def provider(timeout):
+                calls.append(timeout)
+                raise error
+
+            with self.assertRaises(type(error)):
+                HedgedCaller(retry=NO_BACKOFF, hedging=False).call(provider, timeout=5)
+            self.assertEqual(len(calls), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        def provider(timeout):
+            raise RateLimitError("429")
+
+        stats = {}
+        with self.assertRaises(RateLimitError):
+            HedgedCaller(retry=NO_BACKOFF, hedging=False).call(provider, timeout=5, stats=stats)
+        self.assertEqual(stats["attempts"], 3)
+
+
+class HedgingTests(SimpleTestCase):
+    def test_no_hedge_until_enough_samples(self):
+        provider = SlowFirstCall(delay=0.1)
+        stats = {}
+
+        result = HedgedCaller(tracker=LatencyTracker(min_samples=20)).call(provider, timeout=5, stats=stats)
+
+        self.assertEqual(result, "slow")
+        self.assertEqual(stats["hedges"], 0)
+
+    def test_slow_call_is_hedged_and_the_hedge_wins(self):
+        provider = SlowFirstCall()
+        stats = {}
+
+        result = HedgedCaller(tracker=warmed_tracker()).call(provider, timeout=5, stats=stats)
+
+        self.assertEqual(result, "fast")
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 1))
+
+    def test_hedges_stop_when_the_budget_is_spent(self):
+        provider = SlowFirstCall(delay=0.1)
+        stats = {}
+
+        result = HedgedCaller(tracker=warmed_tracker(), hedges_per_minute=0).call(provider, timeout=5, stats=stats)
+
+        self.assertEqual(result, "slow")
+        self.assertEqual(stats["hedges"], 0)
+
+    def test_async_slow_call_is_hedged(self):
+        provider = SlowFirstCall()
+        stats = {}
+
+        result = asyncio.run(HedgedCaller(tracker=warmed_tracker()).acall(provider.acall, timeout=5, stats=stats))
+
+        self.assertEqual(result, "fast")
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_attempt_timeout_follows_p99_within_bounds(self):
+        caller = HedgedCaller(tracker=warmed_tracker(latency=20), min_timeout=30, timeout_multiplier=2)
+
+        self.assertEqual(caller.attempt_timeout(120), 40)
+        self.assertEqual(caller.attempt_timeout(35), 35)
+        self.assertEqual(HedgedCaller().attempt_timeout(120), 120)
+
+    def test_budget_is_per_rolling_minute(self):
+        budget = HedgeBudget(2)
+
+        self.assertEqual([budget.try_acquire() for _ in range(3)], [True, True, False])
@@ -0,0 +1,57 @@
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from interior.services.metrics import (
+    PROVIDER_IN_FLIGHT,
+    STEP3_GENERATE,
+    STEP_EMPTY_ROOM,
+    record_provider_error,
+    track_in_flight,
+)
+
+from .test_design_pipeline import ConcurrencyProbe, run_pipeline
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class PipelineMetricsTests(SimpleTestCase):
+    def test_pipeline_run_records_step_durations(self):
+        before = {step: sample("pipeline_step_seconds_count", step=step) for step in (STEP_EMPTY_ROOM, STEP3_GENERATE)}
+
+        run_pipeline(ConcurrencyProbe(delay=0), variations=2, max_concurrency=2)
+
+        self.assertEqual(sample("pipeline_step_seconds_count", step=STEP_EMPTY_ROOM) - before[STEP_EMPTY_ROOM], 1)
+        self.assertEqual(sample("pipeline_step_seconds_count", step=STEP3_GENERATE) - before[STEP3_GENERATE], 2)
+
+    def test_in_flight_gauge_returns_to_zero_after_errors(self):
+        with self.assertRaises(ValueError):
+            with track_in_flight(PROVIDER_IN_FLIGHT, provider="test"):
+                self.assertEqual(sample("provider_requests_in_flight", provider="test"), 1)
+                raise ValueError
+
+        self.assertEqual(sample("provider_requests_in_flight", provider="test"), 0)
+
+    def test_provider_errors_are_counted_by_kind(self):
+        before = sample("provider_errors_total", provider="test", kind="rejected")
+
+        record_provider_error("test", "rejected")
+
+        self.assertEqual(sample("provider_errors_total", provider="test", kind="rejected") - before, 1)
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    def test_exposes_text_format(self):
+        record_provider_error("test", "degraded")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b'provider_errors_total{kind="degraded",provider="test"}', response.content)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_rejects_unlisted_addresses(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.0.0.1").status_code, 200)
@@ -0,0 +1,55 @@
+import io
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from interior.services.design_pipeline import PipelineStepError, normalize_input_image
+from interior.services.fakes import fake_image_bytes, fake_photo_bytes
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def rotated_jpeg(width, height, orientation=6):
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION_TAG] = orientation
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 80, 40)).save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+class NormalizeInputTests(SimpleTestCase):
+    def test_large_photo_is_downscaled_to_the_edge(self):
+        artifact, stats = normalize_input_image(fake_photo_bytes(1600, 1200), max_edge=400)
+
+        self.assertEqual(artifact.format, "JPEG")
+        self.assertEqual(artifact.image.size, (400, 300))
+        self.assertEqual((stats["original_width"], stats["width"], stats["height"]), (1600, 400, 300))
+        self.assertEqual(stats["bytes"], len(artifact.data))
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_exif_orientation_is_applied(self):
+        artifact, stats = normalize_input_image(rotated_jpeg(80, 40), max_edge=400)
+
+        self.assertEqual(artifact.image.size, (40, 80))
+        self.assertEqual((stats["width"], stats["height"]), (40, 80))
+
+    def test_small_upright_image_keeps_its_bytes(self):
+        original = fake_image_bytes(8, 8)
+
+        artifact, stats = normalize_input_image(original, max_edge=400)
+
+        self.assertEqual(artifact.data, original)
+        self.assertEqual(stats["bytes_saved"], 0)
+
+    def test_transparency_is_kept_as_webp(self):
+        buffer = io.BytesIO()
+        Image.new("RGBA", (600, 300), (0, 0, 0, 0)).save(buffer, format="PNG")
+
+        artifact, _ = normalize_input_image(buffer.getvalue(), max_edge=300)
+
+        self.assertEqual(artifact.format, "WEBP")
+        self.assertEqual(artifact.image.mode, "RGBA")
+
+    def test_unreadable_source_raises_a_pipeline_error(self):
+        with self.assertRaises(PipelineStepError):
+            normalize_input_image(b"not an image", max_edge=400)
@@ -0,0 +1,113 @@
+import asyncio
+import base64
+import threading
+import time
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from interior.services.artifacts import ImageArtifact
+from interior.services.design_pipeline import arefine_batch, iter_refine_batch, refine_batch
+from interior.services.fakes import FakeProviderError, fake_image_bytes, fake_photo_bytes
+
+RESULT = fake_image_bytes(32, 32)
+RESULT_B64 = base64.b64encode(RESULT).decode("ascii")
+PROMPTS = ["소파 교체", "벽지 변경", "조명 추가", "러그 추가", "커튼 변경"]
+
+
+class EditProbe:
+    """OpenAI-shaped client that records overlapping ``images.edit`` calls and fails chosen prompts."""
+
+    def __init__(self, *, delay=0.03, fail_prompts=()):
+        self.delay = delay
+        self.fail_prompts = set(fail_prompts)
+        self.active = 0
+        self.peak = 0
+        self.sent = []
+        self._lock = threading.Lock()
+        self.images = SimpleNamespace(edit=self.edit)
+
+    def _enter(self, image):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.sent.append(image)
+
+    def _leave(self):
+        with self._lock:
+            self.active -= 1
+
+    def _response(self, prompt):
+        if prompt in self.fail_prompts:
+            raise FakeProviderError("가상 실패")
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=RESULT_B64)])
+
+    def edit(self, *, model=None, image=None, prompt=None, size=None, **kwargs):
+        self._enter(image)
+        try:
+            time.sleep(self.delay)
+            return self._response(prompt)
+        finally:
+            self._leave()
+
+
+class AsyncEditProbe(EditProbe):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.images = SimpleNamespace(edit=self.aedit)
+
+    async def aedit(self, *, model=None, image=None, prompt=None, size=None, **kwargs):
+        self._enter(image)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._response(prompt)
+        finally:
+            self._leave()
+
+
+class RefineBatchTests(SimpleTestCase):
+    def test_results_come_back_in_prompt_order_with_bounded_concurrency(self):
+        client = EditProbe()
+
+        results = refine_batch(fake_photo_bytes(64, 48), PROMPTS, client, max_concurrency=2)
+
+        self.assertEqual([item["index"] for item in results], [1, 2, 3, 4, 5])
+        self.assertEqual([item["prompt"] for item in results], PROMPTS)
+        self.assertTrue(all(item["error"] is None and item["image"].data == RESULT for item in results))
+        self.assertEqual(client.peak, 2)
+
+    def test_source_is_encoded_once_and_shared(self):
+        client = EditProbe(delay=0)
+
+        refine_batch(ImageArtifact.from_image(Image.new("RGB", (32, 24), (200, 180, 160))), PROMPTS[:3], client)
+
+        sent = [image[1] for image in client.sent]
+        self.assertEqual(len(sent), 3)
+        self.assertTrue(all(data is sent[0] for data in sent))
+
+    def test_a_failed_prompt_does_not_fail_the_others(self):
+        results = refine_batch(fake_photo_bytes(64, 48), PROMPTS[:3], EditProbe(fail_prompts={"벽지 변경"}))
+
+        self.assertIsNone(results[1]["image"])
+        self.assertIn("OpenAI", results[1]["error"])
+        self.assertEqual([item["error"] for item in (results[0], results[2])], [None, None])
+
+    def test_iterator_yields_as_calls_finish(self):
+        client = EditProbe(delay=0.02)
+
+        first = next(iter_refine_batch(fake_photo_bytes(64, 48), PROMPTS, client, max_concurrency=5))
+
+        self.assertIsNone(first["error"])
+        self.assertIn(first["prompt"], PROMPTS)
+
+
+class AsyncRefineBatchTests(SimpleTestCase):
+    def test_semaphore_bounds_calls_and_order_is_kept(self):
+        client = AsyncEditProbe(fail_prompts={"러그 추가"})
+
+        results = asyncio.run(arefine_batch(fake_photo_bytes(64, 48), PROMPTS, client, max_concurrency=3))
+
+        self.assertEqual([item["prompt"] for item in results], PROMPTS)
+        self.assertEqual([item["error"] is not None for item in results], [False, False, False, True, False])
+        self.assertEqual(client.peak, 3)
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from interior.services.resilience import (
+    FileStateStore,
+    GuardConfig,
+    ProviderGuard,
+    ProviderGuardRegistry,
+    ProviderUnavailableError,
+    is_degraded_error,
+)
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class Provider:
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+class DegradedErrorTests(SimpleTestCase):
+    def test_overload_errors_are_degraded(self):
+        for exc in (StatusError(429), StatusError(503), RateLimitError("slow down"), ValueError("Quota exceeded")):
+            self.assertTrue(is_degraded_error(exc), exc)
+
+    def test_bad_requests_are_not(self):
+        for exc in (StatusError(400), ValueError("invalid image")):
+            self.assertFalse(is_degraded_error(exc), exc)
+
+
+class ProviderGuardTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "providers.json")
+
+    def guard(self, **config):
+        config.setdefault("max_wait_seconds", 0)
+        # A fresh store per guard, as each worker process opens its own.
+        return ProviderGuard("openai:test", FileStateStore(self.path), GuardConfig(**config))
+
+    def test_burst_is_shared_between_processes(self):
+        first, second = self.guard(burst=2, rate_per_minute=1), self.guard(burst=2, rate_per_minute=1)
+
+        first.call(Provider())
+        second.call(Provider())
+
+        provider = Provider()
+        with self.assertRaises(ProviderUnavailableError):
+            first.call(provider)
+        self.assertEqual(provider.calls, 0)
+
+    def test_waits_for_a_token_within_max_wait(self):
+        guard = self.guard(burst=1, rate_per_minute=600, max_wait_seconds=1)
+        guard.call(Provider())
+
+        started = time.monotonic()
+        guard.call(Provider())
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+    def test_breaker_opens_after_consecutive_degraded_failures(self):
+        guard = self.guard(failure_threshold=2, reset_seconds=60)
+        for _ in range(2):
+            with self.assertRaises(RateLimitError):
+                guard.call(Provider(RateLimitError("429")))
+
+        provider = Provider()
+        with self.assertRaises(ProviderUnavailableError):
+            self.guard(failure_threshold=2).call(provider)
+        self.assertEqual(provider.calls, 0)
+
+    def test_bad_requests_do_not_open_the_breaker(self):
+        guard = self.guard(failure_threshold=1)
+        with self.assertRaises(StatusError):
+            guard.call(Provider(StatusError(400)))
+
+        self.assertEqual(guard.call(Provider()), "ok")
+
+    def test_half_open_allows_one_probe_and_closes_on_success(self):
+        guard = self.guard(failure_threshold=1, reset_seconds=0.05)
+        with self.assertRaises(RateLimitError):
+            guard.call(Provider(RateLimitError("429")))
+        time.sleep(0.1)
+
+        guard.acquire()
+        # A second caller is turned away while the probe is outstanding.
+        with self.assertRaises(ProviderUnavailableError):
+            self.guard(failure_threshold=1).acquire()
+        guard.record_success()
+
+        self.assertEqual(guard.call(Provider()), "ok")
+
+    def test_failed_probe_reopens_the_breaker(self):
+        guard = self.guard(failure_threshold=1, reset_seconds=0.05)
+        with self.assertRaises(RateLimitError):
+            guard.call(Provider(RateLimitError("429")))
+        time.sleep(0.1)
+
+        with self.assertRaises(RateLimitError):
+            guard.call(Provider(RateLimitError("429")))
+
+        with self.assertRaises(ProviderUnavailableError):
+            guard.call(Provider())
+
+    def test_snapshot_reports_shared_state(self):
+        registry = ProviderGuardRegistry(
+            FileStateStore(self.path), overrides={"gemini:flash": {"failure_threshold": 1, "max_wait_seconds": 0}}
+        )
+        guard = registry.guard("gemini", "flash")
+        with self.assertRaises(RateLimitError):
+            guard.call(Provider(RateLimitError("429")))
+
+        snapshot = registry.snapshot()["gemini:flash"]
+
+        self.assertEqual(snapshot["state"], "open")
+        self.assertEqual(snapshot["calls"], 1)
+        self.assertEqual(snapshot["degraded_errors"], 1)
+        self.assertIn("RateLimitError", snapshot["last_error"])
@@ -1,3 +1,15 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from .services.metrics import render_latest
+
+
+# ✅ Prometheus 수집용 /metrics (gunicorn 워커와 파이프라인 워커의 값을 합산)
+@require_GET
+def metrics(request):
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", None)
+    if allowed and request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden("metrics 접근이 허용되지 않은 주소입니다.")
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'project_app.middleware.CompressionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -50,6 +51,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'myproject.wsgi.application'
+ASGI_APPLICATION = 'myproject.asgi.application'
 
 if env("DATABASE_URL", default=None):
     DATABASES = {
@@ -78,11 +80,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # orjson으로 직렬화 (기존 JSONRenderer와 같은 바이트 출력, orjson이 없으면 기존 렌더러 사용)
+    'DEFAULT_RENDERER_CLASSES': [
+        'project_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# 응답 압축 (Accept-Encoding에 따라 brotli 우선, gzip). 이 크기 미만의 응답은 압축하지 않는다
+COMPRESSION_MIN_BYTES = env.int("COMPRESSION_MIN_BYTES", default=1024)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=5)
+
 
 # === AWS S3 설정 ===
 AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID", default=None)
@@ -97,6 +108,13 @@ if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY and AWS_STORAGE_BUCKET_NAME:
     )
     AWS_DEFAULT_ACL = None
     AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "max-age=86400"}
+    # 결과 업로드 스레드마다 S3 클라이언트를 재사용하고, 연결 풀은 동시 업로드 수에 맞춘다.
+    from botocore.config import Config as BotoConfig
+
+    AWS_S3_CLIENT_CONFIG = BotoConfig(
+        max_pool_connections=env.int("AWS_S3_MAX_POOL_CONNECTIONS", default=16),
+        retries={"max_attempts": 3, "mode": "standard"},
+    )
     AWS_LOCATION = env("AWS_LOCATION", default="project-images")
     MEDIA_URL = env(
         "MEDIA_URL",
@@ -116,6 +134,82 @@ else:
             "BACKEND": "django.core.files.storage.FileSystemStorage",
         }
     }
+# 휴대폰 사진(수 MB)이 임시 파일을 거치지 않고 메모리에서 바로 저장소로 전달되도록 한도를 올린다.
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int("FILE_UPLOAD_MAX_MEMORY_SIZE", default=20 * 1024 * 1024)
+
+# === AI 파이프라인 작업 큐 ===
+PIPELINE_JOB_LEASE_SECONDS = env.int("PIPELINE_JOB_LEASE_SECONDS", default=120)
+PIPELINE_JOB_MAX_ATTEMPTS = env.int("PIPELINE_JOB_MAX_ATTEMPTS", default=3)
+PIPELINE_JOB_POLL_INTERVAL = env.float("PIPELINE_JOB_POLL_INTERVAL", default=2.0)
+PIPELINE_JOB_RETRY_DELAY_SECONDS = env.int("PIPELINE_JOB_RETRY_DELAY_SECONDS", default=30)
+# 진행 상황 SSE 스트림 (pipeline_job.progress 폴링 주기 / 최대 유지 시간)
+# 연결을 유지하는 /events/async/ 스트림은 ASGI 서버(myproject.asgi)에서만 워커를 점유하지 않는다.
+# WSGI의 /events/ 는 현재까지의 이벤트만 보내고 클라이언트가 재연결한다.
+PIPELINE_EVENT_POLL_INTERVAL = env.float("PIPELINE_EVENT_POLL_INTERVAL", default=0.5)
+PIPELINE_EVENT_KEEPALIVE_SECONDS = env.int("PIPELINE_EVENT_KEEPALIVE_SECONDS", default=15)
+PIPELINE_EVENT_STREAM_TIMEOUT = env.int("PIPELINE_EVENT_STREAM_TIMEOUT", default=900)
+# 한 작업 안에서 동시에 생성할 변형 수 (Gemini/OpenAI 동시 호출 상한)
+PIPELINE_VARIANT_CONCURRENCY = env.int("PIPELINE_VARIANT_CONCURRENCY", default=4)
+
+# 원본 사진 정규화 (EXIF 회전 → 긴 변 축소 → 재인코딩). 0이면 출력 크기의 긴 변을 사용
+PIPELINE_SOURCE_MAX_EDGE = env.int("PIPELINE_SOURCE_MAX_EDGE", default=0)
+PIPELINE_SOURCE_QUALITY = env.int("PIPELINE_SOURCE_QUALITY", default=85)
+
+# 목록/갤러리용 파생 이미지 (원본 옆에 <이름>__w<너비>.webp 로 저장, srcset 제공)
+IMAGE_THUMBNAIL_WIDTH = env.int("IMAGE_THUMBNAIL_WIDTH", default=320)
+IMAGE_MEDIUM_WIDTH = env.int("IMAGE_MEDIUM_WIDTH", default=768)
+IMAGE_FULL_WIDTH = env.int("IMAGE_FULL_WIDTH", default=1024)
+IMAGE_DERIVATIVE_QUALITY = env.int("IMAGE_DERIVATIVE_QUALITY", default=80)
+# 시퀀스가 없는 테이블의 ID를 프로세스마다 미리 예약해 두는 블록 크기 (id_counter 테이블)
+ID_ALLOCATOR_BLOCK_SIZE = env.int("ID_ALLOCATOR_BLOCK_SIZE", default=20)
+# 일괄 부분 수정: 한 요청의 최대 프롬프트 수와 동시 OpenAI 호출 수
+REFINE_BATCH_MAX_PROMPTS = env.int("REFINE_BATCH_MAX_PROMPTS", default=8)
+REFINE_BATCH_CONCURRENCY = env.int("REFINE_BATCH_CONCURRENCY", default=4)
+# 부분 수정 결과 메모 (같은 원본·프롬프트·크기·모델이면 기존 결과 반환, force=true로 무시)
+REFINE_MEMO_TTL_SECONDS = env.int("REFINE_MEMO_TTL_SECONDS", default=7 * 24 * 60 * 60)
+REFINE_MEMO_MAX_ENTRIES = env.int("REFINE_MEMO_MAX_ENTRIES", default=10000)
+# 프로젝트 목록 커서 페이지 크기 (?limit= 으로 조정, 최대값 제한)
+PROJECT_PAGE_SIZE = env.int("PROJECT_PAGE_SIZE", default=20)
+PROJECT_PAGE_MAX_SIZE = env.int("PROJECT_PAGE_MAX_SIZE", default=100)
+# 결과 이미지(원본 + 파생) 동시 업로드 수 — 프로세스 공유 스레드 풀
+RESULT_UPLOAD_CONCURRENCY = env.int("RESULT_UPLOAD_CONCURRENCY", default=8)
+
+# 단계별 체크포인트(정규화 입력, 빈 방, 변형별 3단계 결과)를 저장소에 남겨 재시도·재실행 시 이어서 진행
+PIPELINE_CHECKPOINTS_ENABLED = env.bool("PIPELINE_CHECKPOINTS_ENABLED", default=True)
+
+# 로컬 디스크 캐시 (여러 워커 프로세스가 공유)
+PIPELINE_CACHE_DIR = env("PIPELINE_CACHE_DIR", default=str(BASE_DIR / "var" / "cache"))
+EMPTY_ROOM_CACHE_MAX_BYTES = env.int("EMPTY_ROOM_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+# 저장된 결과 이미지 읽기 캐시 (메모리 → 디스크 → 저장소), 부분 수정 시 재다운로드를 피한다
+IMAGE_CACHE_MEMORY_BYTES = env.int("IMAGE_CACHE_MEMORY_BYTES", default=64 * 1024 * 1024)
+IMAGE_CACHE_DISK_BYTES = env.int("IMAGE_CACHE_DISK_BYTES", default=1024 * 1024 * 1024)
+# Gemini 업로드 파일 재사용 (제공자 만료 48시간, 유휴 파일은 백그라운드에서 삭제)
+GEMINI_FILE_TTL_SECONDS = env.int("GEMINI_FILE_TTL_SECONDS", default=48 * 60 * 60)
+GEMINI_UPLOAD_IDLE_SECONDS = env.int("GEMINI_UPLOAD_IDLE_SECONDS", default=2 * 60 * 60)
+
+# 제공자 호출 한도(토큰 버킷)와 회로 차단기 — 상태 파일로 워커 프로세스 간 공유
+OPENAI_IMAGE_RATE_PER_MINUTE = env.float("OPENAI_IMAGE_RATE_PER_MINUTE", default=50)
+OPENAI_IMAGE_BURST = env.int("OPENAI_IMAGE_BURST", default=10)
+GEMINI_RATE_PER_MINUTE = env.float("GEMINI_RATE_PER_MINUTE", default=60)
+GEMINI_BURST = env.int("GEMINI_BURST", default=10)
+PROVIDER_BREAKER_FAILURES = env.int("PROVIDER_BREAKER_FAILURES", default=5)
+PROVIDER_BREAKER_RESET_SECONDS = env.float("PROVIDER_BREAKER_RESET_SECONDS", default=60)
+PROVIDER_MAX_WAIT_SECONDS = env.float("PROVIDER_MAX_WAIT_SECONDS", default=30)
+PROVIDER_GUARD_STATE_PATH = env("PROVIDER_GUARD_STATE_PATH", default=None)
+
+# Gemini 3단계 호출 재시도(지터 백오프)와 헤지 요청 — 관측된 p95 지연을 넘기면 중복 요청
+GEMINI_TIMEOUT_SECONDS = env.int("GEMINI_TIMEOUT_SECONDS", default=180)
+GEMINI_MIN_TIMEOUT_SECONDS = env.float("GEMINI_MIN_TIMEOUT_SECONDS", default=30)
+GEMINI_RETRY_ATTEMPTS = env.int("GEMINI_RETRY_ATTEMPTS", default=3)
+GEMINI_RETRY_BASE_DELAY = env.float("GEMINI_RETRY_BASE_DELAY", default=1.0)
+GEMINI_RETRY_MAX_DELAY = env.float("GEMINI_RETRY_MAX_DELAY", default=10.0)
+GEMINI_HEDGE_ENABLED = env.bool("GEMINI_HEDGE_ENABLED", default=True)
+GEMINI_HEDGE_PERCENTILE = env.float("GEMINI_HEDGE_PERCENTILE", default=0.95)
+GEMINI_HEDGES_PER_MINUTE = env.int("GEMINI_HEDGES_PER_MINUTE", default=10)
+
+# Prometheus 지표 — 여러 프로세스 합산 시 PROMETHEUS_MULTIPROC_DIR 환경변수를 서버 시작 전에 지정
+METRICS_ALLOWED_IPS = env.list("METRICS_ALLOWED_IPS", default=[])
+
 # ==== SAFETY MODE ====
 # prevent Django from running migrations automatically
 MIGRATION_MODULES = {
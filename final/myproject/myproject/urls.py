@@ -1,5 +1,8 @@
 from django.urls import path, include
 
+from interior.views import metrics
+
 urlpatterns = [
     path('api/', include('project_app.urls')),  # ✅ 우리 실제 앱
+    path('metrics', metrics, name='metrics'),  # ✅ Prometheus 지표
 ]
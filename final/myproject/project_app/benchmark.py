@@ -0,0 +1,426 @@
+# project_app/benchmark.py
+"""Offline throughput benchmark for the design pipeline and its endpoints.
+
+Providers are replaced by :mod:`interior.services.fakes` through
+``clients.override_providers``, so a run costs no API credits; storage and
+the database are the configured ones. Each scenario reports latency
+percentiles, throughput, CPU time and peak RSS, and the report is written as
+sorted JSON so two versions can be diffed. See
+``manage.py run_pipeline_benchmark``.
+"""
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from interior.services.clients import (
+    get_gemini_caller,
+    get_generative_model,
+    get_openai_client,
+    get_provider_guards,
+    override_providers,
+)
+from interior.services.design_pipeline import run_design_pipeline
+from interior.services.fakes import FakeProviders, fake_photo_bytes
+from interior.services.resilience import GuardedGenerativeModel, GuardedOpenAIClient
+
+from .jobs import run_worker
+from .models import PipelineJob
+
+logger = logging.getLogger(__name__)
+
+FINISHED_JOB_STATUSES = ("completed", "failed")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Linearly interpolated percentile, ``fraction`` in [0, 1]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs: fall back to the lifetime peak (kilobytes on Linux, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == "Darwin" else peak * 1024
+
+
+class ResourceSampler:
+    """Measures CPU time and samples RSS while a scenario runs."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_rss = max(self.peak_rss, _current_rss())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self) -> "ResourceSampler":
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self._thread = threading.Thread(target=self._sample, name="benchmark-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wall_seconds = time.perf_counter() - self.started
+        self.cpu_seconds = time.process_time() - self.cpu_started
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, _current_rss())
+
+
+def _summary(
+    name: str,
+    params: Dict[str, Any],
+    outcomes: List[Tuple[float, Optional[str]]],
+    sampler: ResourceSampler,
+    providers: FakeProviders,
+    stats_before: Dict[str, Dict[str, int]],
+    **extra,
+) -> Dict[str, Any]:
+    latencies = [seconds for seconds, error in outcomes if error is None]
+    errors = [error for _, error in outcomes if error is not None]
+    provider_calls = {
+        provider: {key: value - stats_before[provider][key] for key, value in counters.items()}
+        for provider, counters in providers.stats().items()
+    }
+
+    def _round(value):
+        return None if value is None else round(value, 4)
+
+    return {
+        "name": name,
+        "params": params,
+        "requests": len(outcomes),
+        "succeeded": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "latency_seconds": {
+            "p50": _round(percentile(latencies, 0.50)),
+            "p95": _round(percentile(latencies, 0.95)),
+            "p99": _round(percentile(latencies, 0.99)),
+            "mean": _round(sum(latencies) / len(latencies)) if latencies else None,
+            "max": _round(max(latencies)) if latencies else None,
+        },
+        "throughput_per_second": _round(len(latencies) / sampler.wall_seconds if sampler.wall_seconds else 0.0),
+        "wall_seconds": _round(sampler.wall_seconds),
+        "cpu_seconds": _round(sampler.cpu_seconds),
+        "cpu_utilisation": _round(sampler.cpu_seconds / sampler.wall_seconds if sampler.wall_seconds else 0.0),
+        "peak_rss_bytes": sampler.peak_rss,
+        "provider_calls": provider_calls,
+        **extra,
+    }
+
+
+def _run_concurrently(
+    request: Callable[[int], Optional[str]], count: int, concurrency: int
+) -> List[Tuple[float, Optional[str]]]:
+    """Call ``request(i)`` ``count`` times from ``concurrency`` threads; it returns an error or None."""
+
+    def _timed(index: int) -> Tuple[float, Optional[str]]:
+        started = time.perf_counter()
+        try:
+            error = request(index)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            connections.close_all()
+        return time.perf_counter() - started, error
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="benchmark-client") as executor:
+        return list(executor.map(_timed, range(count)))
+
+
+class Benchmark:
+    """Runs scenarios against one set of fake providers and collects the report."""
+
+    def __init__(self, providers: FakeProviders, *, guards: bool = False, seed: int = 0):
+        self.providers = providers
+        self.guards = guards
+        self.seed = seed
+        self.scenarios: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def installed(self):
+        """Serve the fakes from the client factories; wrapped in the provider guards if asked."""
+        openai_client = self.providers.openai_client
+        async_openai_client = self.providers.async_openai_client
+        generative_model = self.providers.generative_model
+        if self.guards:
+            registry = get_provider_guards()
+            openai_client = GuardedOpenAIClient(openai_client, registry)
+            async_openai_client = GuardedOpenAIClient(async_openai_client, registry, is_async=True)
+            generative_model = GuardedGenerativeModel(generative_model, registry, generative_model.model_name)
+        upload_cache = self.providers.upload_cache()
+        try:
+            with override_providers(
+                openai_client=openai_client,
+                async_openai_client=async_openai_client,
+                generative_model=generative_model,
+                upload_cache=upload_cache,
+            ):
+                yield
+        finally:
+            upload_cache.close()
+
+    def _record(self, name, params, outcomes, sampler, stats_before, **extra) -> Dict[str, Any]:
+        summary = _summary(name, params, outcomes, sampler, self.providers, stats_before, **extra)
+        self.scenarios.append(summary)
+        logger.info(
+            "벤치마크 %s %s: p50=%s p95=%s 처리량=%s/s 오류=%d",
+            name,
+            params,
+            summary["latency_seconds"]["p50"],
+            summary["latency_seconds"]["p95"],
+            summary["throughput_per_second"],
+            summary["errors"],
+        )
+        return summary
+
+    def pipeline(
+        self,
+        variant_counts: Iterable[int],
+        *,
+        iterations: int,
+        concurrency: int,
+        source_size: Tuple[int, int] = (1600, 1200),
+        size: str = "1024x1024",
+        refinement_prompt: Optional[str] = None,
+    ) -> None:
+        """``run_design_pipeline`` without storage or the database, once per variant count.
+
+        Each run gets its own source photo and a cold upload cache, and the
+        empty-room cache is off, so every run calls every provider.
+        """
+        for variations in variant_counts:
+            count = iterations * concurrency
+            sources = [
+                fake_photo_bytes(*source_size, seed=self.seed + variations * 1000 + index)
+                for index in range(count)
+            ]
+            images = [0] * count
+
+            def _request(index: int) -> Optional[str]:
+                upload_cache = self.providers.upload_cache(cleanup_interval_seconds=0)
+                try:
+                    result = run_design_pipeline(
+                        sources[index],
+                        openai_client=get_openai_client(),
+                        generative_model=get_generative_model(),
+                        style_prompt="현실적인 가구 배치를 적용해주세요.",
+                        refinement_prompt=refinement_prompt,
+                        size=size,
+                        source_max_edge=getattr(settings, "PIPELINE_SOURCE_MAX_EDGE", None),
+                        source_quality=getattr(settings, "PIPELINE_SOURCE_QUALITY", 85),
+                        gemini_caller=get_gemini_caller(),
+                        variations=variations,
+                        max_concurrency=getattr(settings, "PIPELINE_VARIANT_CONCURRENCY", 4),
+                        upload_cache=upload_cache,
+                    )
+                finally:
+                    upload_cache.close()
+                images[index] = len(result.get("variants") or [])
+                if result.get("errors"):
+                    return f"partial: {result['errors'][0]}"
+                return None
+
+            stats_before = self.providers.stats()
+            with ResourceSampler() as sampler:
+                outcomes = _run_concurrently(_request, count, concurrency)
+            self._record(
+                "pipeline",
+                {
+                    "variations": variations,
+                    "concurrency": concurrency,
+                    "runs": count,
+                    "size": size,
+                    "refine": bool(refinement_prompt),
+                },
+                outcomes,
+                sampler,
+                stats_before,
+                images_per_second=round(sum(images) / sampler.wall_seconds, 4) if sampler.wall_seconds else 0.0,
+            )
+
+    def create_project(
+        self,
+        *,
+        user_id: str,
+        clients: int,
+        requests: int,
+        variations: int = 1,
+        use_async: bool = False,
+        workers: int = 2,
+        source_size: Tuple[int, int] = (1600, 1200),
+        timeout: float = 600.0,
+    ) -> None:
+        """POST ``create_project`` and wait for its pipeline job, end to end.
+
+        The sync view only enqueues, so ``workers`` in-process worker threads
+        run the jobs; the async view runs the pipeline inside the request.
+        Every request creates a real project, so use a dedicated user.
+        """
+        url = reverse("project-create-async" if use_async else "project-create")
+        photos = [fake_photo_bytes(*source_size, seed=self.seed + index) for index in range(requests)]
+        stop_event = threading.Event()
+        worker_threads = []
+
+        def _work(index: int) -> None:
+            try:
+                run_worker(worker_id=f"benchmark:{os.getpid()}:{index}", poll_interval=0.05, stop_event=stop_event)
+            finally:
+                connections.close_all()
+
+        def _wait_for_job(job_id: int) -> Optional[str]:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                job_status, error = PipelineJob.objects.filter(pk=job_id).values_list("status", "error").get()
+                if job_status in FINISHED_JOB_STATUSES:
+                    return None if job_status == "completed" else f"job failed: {error}"
+                time.sleep(0.05)
+            return "job timeout"
+
+        def _request(index: int) -> Optional[str]:
+            upload = SimpleUploadedFile(f"room_{index}.jpg", photos[index], content_type="image/jpeg")
+            response = Client().post(
+                url,
+                {
+                    "user_id": user_id,
+                    "title": f"[benchmark] {index}",
+                    "image_variations": variations,
+                    "image": upload,
+                },
+            )
+            if response.status_code not in (201, 202):
+                return f"HTTP {response.status_code}"
+            if use_async:
+                return None
+            return _wait_for_job(response.json()["job_id"])
+
+        if not use_async:
+            for index in range(max(1, workers)):
+                thread = threading.Thread(target=_work, args=(index,), name=f"benchmark-worker-{index}", daemon=True)
+                thread.start()
+                worker_threads.append(thread)
+
+        stats_before = self.providers.stats()
+        try:
+            with ResourceSampler() as sampler:
+                outcomes = _run_concurrently(_request, requests, clients)
+        finally:
+            stop_event.set()
+            for thread in worker_threads:
+                thread.join()
+        self._record(
+            "create_project",
+            {
+                "clients": clients,
+                "requests": requests,
+                "variations": variations,
+                "async": use_async,
+                "workers": 0 if use_async else workers,
+            },
+            outcomes,
+            sampler,
+            stats_before,
+        )
+
+    def refine(
+        self,
+        *,
+        project_id: str,
+        image_id: int,
+        clients: int,
+        requests: int,
+        prompt: str = "소파 색을 따뜻한 베이지로 바꿔주세요.",
+        use_async: bool = False,
+        use_memo: bool = False,
+    ) -> None:
+        """POST ``refine_project_image`` for one stored image.
+
+        Requests bypass the refinement memo (``force``) unless ``use_memo``,
+        otherwise all but the first would be memo hits.
+        """
+        url = reverse(
+            "project-ai-image-refine-async" if use_async else "project-ai-image-refine",
+            args=[project_id, image_id],
+        )
+
+        def _request(index: int) -> Optional[str]:
+            payload = {"refinement_prompt": prompt, "force": not use_memo}
+            response = Client().post(url, json.dumps(payload), content_type="application/json")
+            if response.status_code not in (200, 201):
+                return f"HTTP {response.status_code}"
+            return None
+
+        stats_before = self.providers.stats()
+        with ResourceSampler() as sampler:
+            outcomes = _run_concurrently(_request, requests, clients)
+        self._record(
+            "refine_project_image",
+            {"clients": clients, "requests": requests, "async": use_async, "memo": use_memo},
+            outcomes,
+            sampler,
+            stats_before,
+        )
+
+    def report(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "generated_at": timezone.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "config": config,
+            "scenarios": self.scenarios,
+        }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(report, output, ensure_ascii=False, indent=2, sort_keys=True)
+        output.write("\n")
+
+
+__all__ = ["Benchmark", "ResourceSampler", "git_revision", "percentile", "write_report"]
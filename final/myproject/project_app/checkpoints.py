@@ -0,0 +1,153 @@
+# project_app/checkpoints.py
+"""Pipeline checkpoints kept in storage, indexed by ``pipeline_checkpoint``.
+
+One row per (project, stage) points at the stage's image in storage. A row
+only counts when its fingerprint matches the current run: a new source photo
+or different output size invalidates every stage, and a different style or
+refinement prompt invalidates only the per-variant ones. Each row stays the
+same across retries and new jobs for the same project, so a re-run resumes.
+"""
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from interior.services.artifacts import ImageArtifact
+from interior.services.cache import content_key
+from interior.services.checkpoints import STAGE_EMPTY_ROOM, STAGE_NORMALIZE, Checkpoint, CheckpointStore
+
+logger = logging.getLogger(__name__)
+
+# Stages that depend only on the source photo and output size.
+INPUT_STAGES = (STAGE_NORMALIZE, STAGE_EMPTY_ROOM)
+
+
+def pipeline_fingerprints(source_sha256: str, options: Dict[str, Any]) -> Dict[str, str]:
+    """Fingerprints of the inputs each kind of stage depends on."""
+    inputs = content_key(
+        source_sha256,
+        str(options.get("size") or "1024x1024"),
+        str(options.get("source_max_edge") or 0),
+        str(options.get("source_quality") or 0),
+    )
+    variants = content_key(
+        inputs,
+        options.get("style_prompt") or "",
+        options.get("refinement_prompt") or "",
+        json.dumps(sorted(options.get("furniture_paths") or [])),
+    )
+    return {"inputs": inputs, "variants": variants}
+
+
+class StorageCheckpointStore(CheckpointStore):
+    def __init__(self, project_id, fingerprints: Dict[str, str], *, job_id: Optional[int] = None):
+        self.project_id = str(project_id)
+        self.fingerprints = fingerprints
+        self.job_id = job_id
+        self._rows: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, stage: str) -> str:
+        return self.fingerprints["inputs" if stage in INPUT_STAGES else "variants"]
+
+    def _load_rows(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._rows is None:
+                rows = {}
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            """
+                            SELECT stage, fingerprint, storage_path, meta
+                            FROM pipeline_checkpoint
+                            WHERE project_id = %s;
+                            """,
+                            [self.project_id],
+                        )
+                        for stage, fingerprint, storage_path, meta in cursor.fetchall():
+                            if isinstance(meta, str):
+                                meta = json.loads(meta)
+                            rows[stage] = {"fingerprint": fingerprint, "storage_path": storage_path, "meta": meta or {}}
+                except Exception as exc:
+                    logger.warning("체크포인트 조회 실패(project_id=%s): %s", self.project_id, exc)
+                self._rows = rows
+            return self._rows
+
+    def _row(self, stage: str) -> Optional[Dict[str, Any]]:
+        row = self._load_rows().get(stage)
+        if row is None or row["fingerprint"] != self._fingerprint(stage):
+            return None
+        return row
+
+    def has(self, stage: str) -> bool:
+        return self._row(stage) is not None
+
+    def load(self, stage: str) -> Optional[Checkpoint]:
+        row = self._row(stage)
+        if row is None:
+            return None
+        image = None
+        if row["storage_path"]:
+            try:
+                with default_storage.open(row["storage_path"], "rb") as stored:
+                    image = ImageArtifact.from_bytes(stored.read())
+            except Exception as exc:
+                logger.warning("체크포인트 이미지 읽기 실패(%s): %s", row["storage_path"], exc)
+                return None
+        logger.info("체크포인트에서 재개(project_id=%s, stage=%s)", self.project_id, stage)
+        return Checkpoint(stage, image, dict(row["meta"]))
+
+    def save(self, stage: str, image: Optional[ImageArtifact] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        fingerprint = self._fingerprint(stage)
+        previous = self._load_rows().get(stage)
+        try:
+            storage_path = None
+            if image is not None:
+                name = f"checkpoints/{self.project_id}/{stage}_{fingerprint[:12]}.{image.extension}"
+                storage_path = default_storage.save(name, ContentFile(image.data))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO pipeline_checkpoint (project_id, stage, fingerprint, job_id, storage_path, meta)
+                    VALUES (%s, %s, %s, %s, %s, %s::jsonb)
+                    ON CONFLICT (project_id, stage) DO UPDATE SET
+                        fingerprint = EXCLUDED.fingerprint,
+                        job_id = EXCLUDED.job_id,
+                        storage_path = EXCLUDED.storage_path,
+                        meta = EXCLUDED.meta,
+                        created_at = NOW();
+                    """,
+                    [
+                        self.project_id,
+                        stage,
+                        fingerprint,
+                        self.job_id,
+                        storage_path,
+                        json.dumps(meta or {}, cls=DjangoJSONEncoder),
+                    ],
+                )
+        except Exception as exc:
+            logger.warning("체크포인트 저장 실패(project_id=%s, stage=%s): %s", self.project_id, stage, exc)
+            return
+
+        with self._lock:
+            self._rows[stage] = {"fingerprint": fingerprint, "storage_path": storage_path, "meta": dict(meta or {})}
+        old_path = previous and previous.get("storage_path")
+        if old_path and old_path != storage_path:
+            try:
+                default_storage.delete(old_path)
+            except Exception as exc:
+                logger.warning("이전 체크포인트 이미지 삭제 실패(%s): %s", old_path, exc)
+
+
+def checkpoints_enabled() -> bool:
+    return getattr(settings, "PIPELINE_CHECKPOINTS_ENABLED", True)
+
+
+__all__ = ["StorageCheckpointStore", "checkpoints_enabled", "pipeline_fingerprints"]
@@ -0,0 +1,147 @@
+# project_app/conditional.py
+"""Conditional GET for the polled listings.
+
+Each listing has a validator query: one aggregate over the rows the response
+is built from, returning an ETag and a Last-Modified time. When the client's
+``If-None-Match`` / ``If-Modified-Since`` still match, the view never runs
+and a 304 goes back without a row being loaded. Responses carry
+``Cache-Control: private, no-cache`` so browsers always revalidate.
+
+``project.update_date`` moves on status changes and whenever result images
+are added (see ``ResultPersister.insert_rows``), which is what makes it
+usable as Last-Modified for both listings.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from django.db import DatabaseError, connection
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+logger = logging.getLogger(__name__)
+
+# Bump when a listing's payload format changes, so cached bodies are not reused.
+PAYLOAD_VERSION = "1"
+
+Validators = Tuple[Optional[str], Optional[datetime]]
+
+
+def _etag(*parts) -> str:
+    return hashlib.sha256("|".join(map(str, (PAYLOAD_VERSION,) + parts)).encode()).hexdigest()[:32]
+
+
+def _fetchone(sql: str, params) -> tuple:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def projects_validators(request, user_id) -> Validators:
+    """Projects (count, latest update) plus their images (count, newest, selection)."""
+    row = _fetchone(
+        """
+        SELECT p.n, p.latest, i.n, i.newest, i.selected
+        FROM (
+            SELECT COUNT(*) AS n, MAX(update_date) AS latest FROM project WHERE user_id = %s
+        ) AS p,
+        (
+            SELECT COUNT(*) AS n,
+                   MAX(i.image_id) AS newest,
+                   COALESCE(SUM(i.image_id) FILTER (WHERE UPPER(i.is_selected) = 'Y'), 0) AS selected
+            FROM ai_make_image AS i
+            JOIN project AS q ON q.project_id = i.project_id
+            WHERE q.user_id = %s
+        ) AS i;
+        """,
+        [user_id, user_id],
+    )
+    # Different cursors and page sizes are different resources.
+    return _etag("projects", user_id, request.GET.urlencode(), *row), row[1]
+
+
+def project_images_validators(request, project_id) -> Validators:
+    row = _fetchone(
+        """
+        SELECT p.update_date, i.n, i.digest
+        FROM (SELECT 1) AS one
+        LEFT JOIN project AS p ON p.project_id = %s
+        CROSS JOIN (
+            SELECT COUNT(*) AS n,
+                   md5(string_agg(image_id::text || ':' || COALESCE(is_selected, ''), ',' ORDER BY image_id)) AS digest
+            FROM ai_make_image
+            WHERE project_id = %s
+        ) AS i;
+        """,
+        [project_id, project_id],
+    )
+    return _etag("images", project_id, *row), row[0]
+
+
+def stats_validators(request, user_id) -> Validators:
+    """The summary row; none without one, since the fallback aggregate has no version."""
+    row = _fetchone(
+        """
+        SELECT s.total_projects, s.in_progress, s.completed, s.updated_at,
+               GREATEST(s.updated_at, CURRENT_DATE::timestamptz), CURRENT_DATE
+        FROM project_stats AS s
+        WHERE s.user_id = %s;
+        """,
+        [user_id],
+    )
+    if row is None:
+        return None, None
+    # recent_increase changes at midnight, so the date is part of the version.
+    return _etag("stats", user_id, *row), row[4]
+
+
+def dashboard_validators(request, user_id) -> Validators:
+    projects_etag, projects_modified = projects_validators(request, user_id)
+    stats_etag, stats_modified = stats_validators(request, user_id)
+    if stats_etag is None:
+        return None, None
+    return _etag("dashboard", projects_etag, stats_etag), max(projects_modified or stats_modified, stats_modified)
+
+
+def conditional_get(validators: Callable[..., Validators]):
+    """Answer GET/HEAD with 304 when the client's validators still match ``validators(request, ...)``."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            try:
+                etag, last_modified = validators(request, *args, **kwargs)
+            except DatabaseError as exc:
+                logger.warning("조건부 요청 검증값 조회 실패(%s): %s", view.__name__, exc)
+                etag, last_modified = None, None
+            etag = quote_etag(etag) if etag else None
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+                if timestamp and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(timestamp)
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "conditional_get",
+    "dashboard_validators",
+    "project_images_validators",
+    "projects_validators",
+    "stats_validators",
+]
@@ -0,0 +1,166 @@
+# project_app/derivatives.py
+"""Responsive derivatives of stored images.
+
+Every stored image ``name.ext`` gets smaller WEBP copies saved next to it as
+``name__w{width}.webp``. The keys are deterministic, so list endpoints build
+the derivative URLs from the stored URL alone, without touching storage.
+"""
+import io
+import logging
+import posixpath
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from interior.services.artifacts import ImageLike, as_artifact
+from interior.services.metrics import STORAGE_SAVE, WEBP_ENCODE, observe_step
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_SUFFIX = "__w"
+
+
+def derivative_widths() -> Dict[str, int]:
+    """``{"thumbnail": 320, "medium": 768}`` unless overridden in settings."""
+    return {
+        "thumbnail": getattr(settings, "IMAGE_THUMBNAIL_WIDTH", 320),
+        "medium": getattr(settings, "IMAGE_MEDIUM_WIDTH", 768),
+    }
+
+
+def _full_width() -> int:
+    return getattr(settings, "IMAGE_FULL_WIDTH", 1024)
+
+
+def _derivative_path(path: str, width: int) -> str:
+    stem, _ext = posixpath.splitext(path)
+    return f"{stem}{DERIVATIVE_SUFFIX}{width}.webp"
+
+
+def derivative_name(storage_name: str, width: int) -> str:
+    """Storage key of the ``width`` derivative of ``storage_name``."""
+    return _derivative_path(storage_name, width)
+
+
+def derivative_url(url: Optional[str], width: int) -> Optional[str]:
+    """URL of the ``width`` derivative, derived from the original's URL."""
+    if not url:
+        return url
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=_derivative_path(parts.path, width), query=""))
+
+
+def storage_name_from_url(url: str) -> Optional[str]:
+    """Recover the storage key from a URL produced by ``default_storage.url``."""
+    path = urlsplit(url).path
+    media_path = urlsplit(settings.MEDIA_URL).path
+    if media_path and path.startswith(media_path):
+        return path[len(media_path):]
+    return None
+
+
+def responsive_urls(url: Optional[str]) -> Dict[str, Optional[str]]:
+    """Thumbnail/medium/full URLs plus a ``srcset`` string for ``url``."""
+    if not url:
+        return {"thumbnail_url": None, "medium_url": None, "full_url": url, "srcset": None}
+
+    widths = derivative_widths()
+    candidates = [(derivative_url(url, width), width) for width in sorted(widths.values())]
+    candidates.append((url, _full_width()))
+    return {
+        "thumbnail_url": derivative_url(url, widths["thumbnail"]),
+        "medium_url": derivative_url(url, widths["medium"]),
+        "full_url": url,
+        "srcset": ", ".join(f"{candidate} {width}w" for candidate, width in candidates),
+    }
+
+
+def _load_pixels(image: ImageLike, max_width: int) -> Image.Image:
+    artifact = as_artifact(image)
+    if artifact.format == "JPEG" and artifact.has_encoding("JPEG"):
+        # JPEG can decode at a fraction of full size, far cheaper for big uploads.
+        pixels = Image.open(io.BytesIO(artifact.data))
+        pixels.draft("RGB", (max_width, max_width))
+        pixels = ImageOps.exif_transpose(pixels)
+    else:
+        pixels = ImageOps.exif_transpose(artifact.image)
+    if pixels.mode not in ("RGB", "RGBA"):
+        pixels = pixels.convert("RGBA" if "A" in pixels.getbands() else "RGB")
+    return pixels
+
+
+def build_derivatives(image: ImageLike, *, quality: Optional[int] = None) -> Dict[int, bytes]:
+    """Encode one WEBP per derivative width.
+
+    Images narrower than a width are stored at their own size, so every key
+    always exists and ``srcset`` never points at a missing object.
+    """
+    quality = quality or getattr(settings, "IMAGE_DERIVATIVE_QUALITY", 80)
+    widths = sorted(set(derivative_widths().values()), reverse=True)
+    pixels = _load_pixels(image, widths[0])
+
+    encoded = {}
+    with observe_step(WEBP_ENCODE):
+        for width in widths:
+            resized = pixels
+            if pixels.width > width:
+                height = max(1, round(pixels.height * width / pixels.width))
+                resized = pixels.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format="WEBP", quality=quality, method=4)
+            encoded[width] = buffer.getvalue()
+            # The next, smaller width is resized from this one.
+            pixels = resized
+    return encoded
+
+
+def _save_exact(name: str, data: bytes) -> str:
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
+def save_derivatives(storage_name: str, image: ImageLike) -> Dict[int, str]:
+    """Store every derivative of ``storage_name``; returns ``{width: key}``."""
+    saved = {}
+    for width, data in build_derivatives(image).items():
+        with observe_step(STORAGE_SAVE):
+            saved[width] = _save_exact(derivative_name(storage_name, width), data)
+    return saved
+
+
+def has_derivatives(storage_name: str) -> bool:
+    """True when every derivative of ``storage_name`` is already stored."""
+    widths = set(derivative_widths().values())
+    return all(default_storage.exists(derivative_name(storage_name, width)) for width in widths)
+
+
+def try_save_derivatives(storage_name: str, image: ImageLike) -> bool:
+    """Like :func:`save_derivatives`, but a failure only logs a warning.
+
+    The original is already stored; the clients fall back to it when a
+    derivative is missing.
+    """
+    try:
+        save_derivatives(storage_name, image)
+    except Exception as exc:
+        logger.warning("파생 이미지 생성 실패(%s): %s", storage_name, exc)
+        return False
+    return True
+
+
+__all__ = [
+    "build_derivatives",
+    "derivative_name",
+    "derivative_url",
+    "derivative_widths",
+    "has_derivatives",
+    "responsive_urls",
+    "save_derivatives",
+    "storage_name_from_url",
+    "try_save_derivatives",
+]
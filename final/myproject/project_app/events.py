@@ -0,0 +1,154 @@
+# project_app/events.py
+"""Server-sent event streams of pipeline job progress.
+
+The worker appends every step transition to ``pipeline_job_event`` (see
+:class:`jobs.JobProgressRecorder`). These generators poll the job row and the
+events after the last one sent, so the stream works no matter which process
+runs the job.
+
+Only the async stream stays open for the whole job, and it needs an ASGI
+server: under WSGI any open stream pins a worker thread and a database
+connection. The sync views answer with :func:`job_events_snapshot` instead,
+one batch of events plus a ``retry:`` hint, and the browser's
+``EventSource`` reconnects with ``Last-Event-ID`` for the next batch.
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from .models import PipelineJob
+
+TERMINAL_STATUSES = ("completed", "failed")
+RETRY_MS = 3000
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def format_sse(event: str, data, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    payload = json.dumps(data, ensure_ascii=False, cls=DjangoJSONEncoder)
+    lines.extend(f"data: {line}" for line in payload.splitlines())
+    return "\n".join(lines) + "\n\n"
+
+
+def _event_name(event) -> str:
+    # A completed persist step means a variant image is stored and viewable.
+    if event.get("step", "").endswith(".persist") and event.get("state") == "completed":
+        return "variant"
+    return "step"
+
+
+def _load_job(job_id: int) -> Optional[PipelineJob]:
+    return (
+        PipelineJob.objects.filter(pk=job_id)
+        .only("job_id", "project_id", "status", "attempts", "result", "error")
+        .first()
+    )
+
+
+def _load_events(job_id: int, last_seq: int) -> List[Dict[str, Any]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT seq, step, attempt, detail::text
+            FROM pipeline_job_event
+            WHERE job_id = %s AND seq > %s
+            ORDER BY seq;
+            """,
+            [job_id, last_seq],
+        )
+        rows = cursor.fetchall()
+    return [{"seq": seq, "step": step, "attempt": attempt, **json.loads(detail)} for seq, step, attempt, detail in rows]
+
+
+def _load_snapshot(job_id: int, last_seq: int) -> Tuple[Optional[PipelineJob], List[Dict[str, Any]]]:
+    # The job first: every event written before it turned terminal is then visible below.
+    job = _load_job(job_id)
+    if job is None:
+        return None, []
+    return job, _load_events(job_id, last_seq)
+
+
+class _JobEventCursor:
+    """Turns successive job snapshots into SSE chunks not sent yet."""
+
+    def __init__(self, job_id: int, last_seq: int):
+        self.job_id = job_id
+        self.last_seq = last_seq
+
+    def advance(self, snapshot: Tuple[Optional[PipelineJob], List[Dict[str, Any]]]) -> Tuple[List[str], bool]:
+        job, events = snapshot
+        if job is None:
+            return [format_sse("error", {"error": "작업을 찾을 수 없습니다."})], True
+
+        chunks = []
+        for event in events:
+            if event["seq"] > self.last_seq:
+                self.last_seq = event["seq"]
+                chunks.append(format_sse(_event_name(event), event, event_id=self.last_seq))
+
+        if job.status in TERMINAL_STATUSES:
+            chunks.append(
+                format_sse(
+                    "job",
+                    {
+                        "job_id": job.job_id,
+                        "project_id": job.project_id,
+                        "status": job.status,
+                        "error": job.error,
+                        "pipeline": job.result or {"status": job.status, "reason": job.error, "images": []},
+                    },
+                )
+            )
+            return chunks, True
+        return chunks, False
+
+
+def _timeout_chunk(job_id: int) -> str:
+    return format_sse("timeout", {"job_id": job_id, "error": "진행 상황 스트림 시간이 초과되었습니다."})
+
+
+def job_events_snapshot(job_id: int, *, last_seq: int = 0) -> str:
+    """The events after ``last_seq`` (and the result once terminal) in one response body."""
+    chunks, _ = _JobEventCursor(job_id, last_seq).advance(_load_snapshot(job_id, last_seq))
+    return f"retry: {RETRY_MS}\n\n" + "".join(chunks)
+
+
+async def astream_job_events(job_id: int, *, last_seq: int = 0) -> AsyncIterator[str]:
+    """Yield SSE chunks for ``job_id`` until it completes, fails or the stream times out."""
+    poll_interval = _setting("PIPELINE_EVENT_POLL_INTERVAL", 0.5)
+    keepalive = _setting("PIPELINE_EVENT_KEEPALIVE_SECONDS", 15)
+    deadline = time.monotonic() + _setting("PIPELINE_EVENT_STREAM_TIMEOUT", 900)
+    cursor = _JobEventCursor(job_id, last_seq)
+    last_sent = time.monotonic()
+    load_snapshot = sync_to_async(_load_snapshot)
+
+    yield f"retry: {RETRY_MS}\n\n"
+    while True:
+        chunks, done = cursor.advance(await load_snapshot(job_id, cursor.last_seq))
+        for chunk in chunks:
+            yield chunk
+            last_sent = time.monotonic()
+        if done:
+            return
+        if time.monotonic() >= deadline:
+            yield _timeout_chunk(job_id)
+            return
+        if time.monotonic() - last_sent >= keepalive:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(poll_interval)
+
+
+__all__ = ["astream_job_events", "format_sse", "job_events_snapshot"]
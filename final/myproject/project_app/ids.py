@@ -0,0 +1,181 @@
+# project_app/ids.py
+"""Primary key allocation for the legacy tables.
+
+``project``, ``customize_req`` and ``ai_make_image`` take explicit ids. They
+come from ``nextval`` on the column's own sequence (serial/identity) or on the
+``<table>_<column>_seq`` sequence added by migration 0010, so ids increase in
+insert order across processes and listings can keep ordering by id.
+
+Without either sequence each process reserves a block of ids from the
+``id_counter`` table and hands them out from memory. Ids stay unique but two
+processes interleave their blocks, so id order no longer follows time.
+"""
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+PROJECT = ("project", "project_id")
+CUSTOMIZE_REQ = ("customize_req", "req_id")
+AI_MAKE_IMAGE = ("ai_make_image", "image_id")
+
+_UNKNOWN = object()
+
+# MAX() over the numeric values only: project_id is VARCHAR in the team schema.
+_NUMERIC_MAX_SQL = "COALESCE(MAX(CASE WHEN {column}::text ~ '^[0-9]+$' THEN {column}::text::bigint END), 0)"
+
+
+class IdAllocator:
+    """Hands out unique ids for ``table.column``.
+
+    Blocks reserved from ``id_counter`` are committed on a separate autocommit
+    connection, so a rolled-back insert only leaves a gap and never gives an
+    id back. That connection is opened once and reused for later blocks.
+    """
+
+    def __init__(self, table: str, column: str, *, block_size: Optional[int] = None, using: str = DEFAULT_DB_ALIAS):
+        self.table = table
+        self.column = column
+        self.using = using
+        self.block_size = block_size or getattr(settings, "ID_ALLOCATOR_BLOCK_SIZE", 20)
+        self._lock = threading.Lock()
+        self._sequence = _UNKNOWN
+        self._next = 0
+        self._end = 0
+        self._pid = os.getpid()
+        self._connection = None
+
+    @property
+    def counter_name(self) -> str:
+        return f"{self.table}.{self.column}"
+
+    def _sequence_name(self, cursor) -> Optional[str]:
+        if self._sequence is _UNKNOWN:
+            sequence = None
+            if connections[self.using].vendor == "postgresql":
+                cursor.execute(
+                    "SELECT COALESCE(pg_get_serial_sequence(%s, %s), to_regclass(%s)::text);",
+                    [self.table, self.column, f"{self.table}_{self.column}_seq"],
+                )
+                sequence = cursor.fetchone()[0]
+            self._sequence = sequence
+            if sequence:
+                logger.info("ID 할당 방식(%s): 시퀀스 %s", self.counter_name, sequence)
+            else:
+                logger.warning(
+                    "ID 할당 방식(%s): 시퀀스가 없어 블록 예약을 사용합니다(ID 순서가 생성 순서와 다를 수 있음)",
+                    self.counter_name,
+                )
+        return self._sequence
+
+    def _counter_connection(self):
+        # Its own connection: the reservation must not be undone by, or hold
+        # its row lock until the end of, the caller's transaction.
+        if self._connection is None:
+            self._connection = connections.create_connection(self.using)
+            # Any thread may reserve the next block; self._lock serialises use.
+            self._connection.inc_thread_sharing()
+        return self._connection
+
+    def _discard_connection(self) -> None:
+        conn, self._connection = self._connection, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _reserve_block(self, size: int) -> Tuple[int, int]:
+        try:
+            return self._reserve_block_once(size)
+        except (InterfaceError, OperationalError):
+            # The server closed the idle connection; reconnect once.
+            self._discard_connection()
+            return self._reserve_block_once(size)
+
+    def _reserve_block_once(self, size: int) -> Tuple[int, int]:
+        with self._counter_connection().cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO id_counter (name, next_value)
+                SELECT %s, {_NUMERIC_MAX_SQL.format(column=self.column)} + 1 FROM {self.table}
+                ON CONFLICT (name) DO NOTHING;
+                """,
+                [self.counter_name],
+            )
+            cursor.execute(
+                """
+                UPDATE id_counter SET next_value = next_value + %s, updated_at = NOW()
+                WHERE name = %s
+                RETURNING next_value - %s;
+                """,
+                [size, self.counter_name, size],
+            )
+            start = cursor.fetchone()[0]
+        return start, start + size
+
+    def allocate(self, count: int = 1) -> List[int]:
+        """Return ``count`` unused ids in ascending order."""
+        if count <= 0:
+            return []
+
+        with connections[self.using].cursor() as cursor:
+            sequence = self._sequence_name(cursor)
+            if sequence:
+                cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s);", [sequence, count])
+                return [row[0] for row in cursor.fetchall()]
+
+        ids: List[int] = []
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's block and socket may be in use there as well.
+                self._pid = os.getpid()
+                self._next = self._end = 0
+                self._connection = None
+            while len(ids) < count:
+                if self._next >= self._end:
+                    self._next, self._end = self._reserve_block(max(self.block_size, count - len(ids)))
+                take = min(count - len(ids), self._end - self._next)
+                ids.extend(range(self._next, self._next + take))
+                self._next += take
+        return ids
+
+    def next_id(self) -> int:
+        return self.allocate(1)[0]
+
+
+_allocators: Dict[Tuple[str, str], IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(target: Tuple[str, str]) -> IdAllocator:
+    """Process-wide allocator for ``(table, column)``."""
+    with _allocators_lock:
+        allocator = _allocators.get(target)
+        if allocator is None:
+            allocator = _allocators[target] = IdAllocator(*target)
+        return allocator
+
+
+def allocate_ids(target: Tuple[str, str], count: int) -> List[int]:
+    return get_allocator(target).allocate(count)
+
+
+def next_id(target: Tuple[str, str]) -> int:
+    return get_allocator(target).next_id()
+
+
+__all__ = [
+    "AI_MAKE_IMAGE",
+    "CUSTOMIZE_REQ",
+    "IdAllocator",
+    "PROJECT",
+    "allocate_ids",
+    "get_allocator",
+    "next_id",
+]
@@ -0,0 +1,92 @@
+# project_app/image_cache.py
+"""Read-through cache of stored images, keyed by storage path.
+
+Lookups go memory → local disk → ``default_storage.open``. Each tier that
+misses is filled on the way back. Stored names are never reused (new images
+always get a fresh random name), so entries never go stale.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from interior.services.cache import DiskLRUCache, MemoryLRUCache, content_key
+from interior.services.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# ``cache`` label for lookups answered by any tier; each tier also counts under its own name.
+CACHE_NAME = "image"
+
+
+class TieredImageCache:
+    def __init__(
+        self,
+        memory: Optional[MemoryLRUCache] = None,
+        disk: Optional[DiskLRUCache] = None,
+        storage=None,
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.storage = storage or default_storage
+        self.storage_reads = 0
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return content_key("storage", name)
+
+    def get(self, name: str) -> bytes:
+        """Return the bytes stored under ``name``; raises if storage cannot read it."""
+        key = self._key(name)
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                record_cache_lookup(CACHE_NAME, True)
+                return data
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                if self.memory is not None:
+                    self.memory.set(key, data)
+                record_cache_lookup(CACHE_NAME, True)
+                return data
+
+        record_cache_lookup(CACHE_NAME, False)
+        with self.storage.open(name, "rb") as stored:
+            data = stored.read()
+        self.storage_reads += 1
+        self.put(name, data)
+        return data
+
+    def put(self, name: str, data: bytes) -> None:
+        """Write ``data`` through to every tier (used right after storing an image)."""
+        key = self._key(name)
+        if self.memory is not None:
+            self.memory.set(key, data)
+        if self.disk is not None:
+            self.disk.set(key, data)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "memory": self.memory.stats() if self.memory is not None else None,
+            "disk": self.disk.stats() if self.disk is not None else None,
+            "storage_reads": self.storage_reads,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_image_cache() -> TieredImageCache:
+    """프로세스 전체에서 공유하는 저장 이미지 캐시를 반환한다. 용량이 0인 계층은 사용하지 않는다."""
+    memory_bytes = getattr(settings, "IMAGE_CACHE_MEMORY_BYTES", 0)
+    disk_bytes = getattr(settings, "IMAGE_CACHE_DISK_BYTES", 0)
+    memory = MemoryLRUCache(memory_bytes, name="image_memory") if memory_bytes else None
+    disk = None
+    if disk_bytes:
+        disk = DiskLRUCache(os.path.join(settings.PIPELINE_CACHE_DIR, "images"), disk_bytes, name="image_disk")
+    return TieredImageCache(memory, disk)
+
+
+__all__ = ["TieredImageCache", "get_image_cache"]
@@ -0,0 +1,687 @@
+# project_app/jobs.py
+"""Database-backed queue for AI design pipeline jobs.
+
+``create_project`` enqueues a row in ``pipeline_job`` and returns right away;
+``manage.py run_pipeline_worker`` claims rows with a lease, keeps the lease
+alive with heartbeats while the pipeline runs and stores the outcome.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import InterfaceError, OperationalError, connection
+from django.utils import timezone
+
+from interior.services.checkpoints import CheckpointStore, variant_stage
+from interior.services.clients import (
+    get_async_openai_client,
+    get_empty_room_cache,
+    get_gemini_caller,
+    get_gemini_upload_cache,
+    get_generative_model,
+    get_openai_client,
+)
+from interior.services.design_pipeline import (
+    PipelineCancelled,
+    PipelineStepError,
+    arun_design_pipeline,
+    run_design_pipeline,
+)
+from interior.services.metrics import PIPELINE_IN_FLIGHT, track_in_flight
+
+from .checkpoints import StorageCheckpointStore, checkpoints_enabled, pipeline_fingerprints
+from .derivatives import has_derivatives, try_save_derivatives
+from .models import PipelineJob
+from .persistence import ResultPersister, result_filename
+
+logger = logging.getLogger(__name__)
+
+
+CLAIM_SQL = """
+UPDATE pipeline_job
+SET status = 'running',
+    locked_by = %s,
+    attempts = attempts + 1,
+    lease_expires_at = NOW() + make_interval(secs => %s),
+    heartbeat_at = NOW(),
+    started_at = COALESCE(started_at, NOW()),
+    updated_at = NOW()
+WHERE job_id = (
+    SELECT job_id
+    FROM pipeline_job
+    WHERE (status = 'queued' AND run_after <= NOW())
+       OR (status = 'running' AND lease_expires_at < NOW() AND attempts < max_attempts)
+    ORDER BY job_id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING job_id;
+"""
+
+EXPIRE_SQL = """
+UPDATE pipeline_job
+SET status = 'failed',
+    error = %s,
+    locked_by = NULL,
+    lease_expires_at = NULL,
+    finished_at = NOW(),
+    updated_at = NOW()
+WHERE status = 'running' AND lease_expires_at < NOW() AND attempts >= max_attempts;
+"""
+
+RENEW_SQL = """
+UPDATE pipeline_job
+SET heartbeat_at = NOW(),
+    lease_expires_at = NOW() + make_interval(secs => %s),
+    updated_at = NOW()
+WHERE job_id = %s AND locked_by = %s AND status = 'running';
+"""
+
+# A new attempt starts with empty step states; last_seq carries over so event ids keep increasing.
+RESET_PROGRESS_SQL = """
+UPDATE pipeline_job
+SET progress = jsonb_build_object(
+        'steps', '{}'::jsonb,
+        'current', NULL,
+        'attempt', %s::integer,
+        'last_seq', COALESCE((progress ->> 'last_seq')::integer, 0)
+    ),
+    updated_at = NOW()
+WHERE job_id = %s;
+"""
+
+RECORD_EVENT_SQL = """
+WITH job AS (
+    UPDATE pipeline_job
+    SET progress = jsonb_set(
+            jsonb_set(
+                progress,
+                ARRAY['steps', %(step)s],
+                COALESCE(progress #> ARRAY['steps', %(step)s], '{}'::jsonb) || %(entry)s::jsonb
+            ),
+            '{last_seq}',
+            to_jsonb(COALESCE((progress ->> 'last_seq')::integer, 0) + 1)
+        ) || jsonb_build_object('current', %(step)s::text),
+        updated_at = NOW()
+    WHERE job_id = %(job_id)s AND locked_by IS NOT DISTINCT FROM %(worker_id)s
+    RETURNING job_id, (progress ->> 'last_seq')::integer AS seq
+)
+INSERT INTO pipeline_job_event (job_id, seq, attempt, step, state, detail)
+SELECT job_id, seq, %(attempt)s, %(step)s, %(state)s, %(entry)s::jsonb FROM job;
+"""
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def enqueue_pipeline_job(
+    *,
+    project_id,
+    req_id,
+    user_id: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int] = None,
+) -> PipelineJob:
+    """Insert a queued job; call inside the transaction that creates the project."""
+    return PipelineJob.objects.create(
+        project_id=project_id,
+        req_id=req_id,
+        user_id=user_id,
+        payload=payload,
+        progress={"steps": {}, "current": None},
+        max_attempts=max_attempts or _setting("PIPELINE_JOB_MAX_ATTEMPTS", 3),
+    )
+
+
+def claim_next_job(worker_id: str, lease_seconds: int) -> Optional[PipelineJob]:
+    """Lease the oldest runnable job (queued, or running with an expired lease)."""
+    with connection.cursor() as cursor:
+        cursor.execute(EXPIRE_SQL, ["작업 임대가 만료되었고 재시도 횟수를 초과했습니다."])
+        cursor.execute(CLAIM_SQL, [worker_id, lease_seconds])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+    return PipelineJob.objects.get(pk=row[0])
+
+
+def renew_lease(job_id: int, worker_id: str, lease_seconds: int) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(RENEW_SQL, [lease_seconds, job_id, worker_id])
+        return cursor.rowcount == 1
+
+
+def complete_job(job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+    now = timezone.now()
+    updated = PipelineJob.objects.filter(pk=job_id, locked_by=worker_id).update(
+        status="completed",
+        result=result,
+        error=None,
+        locked_by=None,
+        lease_expires_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    return updated == 1
+
+
+def fail_job(job: PipelineJob, worker_id: str, reason: str) -> str:
+    """Requeue the job with a delay, or mark it failed once attempts run out."""
+    now = timezone.now()
+    jobs = PipelineJob.objects.filter(pk=job.job_id, locked_by=worker_id)
+
+    if job.attempts < job.max_attempts:
+        delay = _setting("PIPELINE_JOB_RETRY_DELAY_SECONDS", 30) * job.attempts
+        jobs.update(
+            status="queued",
+            error=reason,
+            locked_by=None,
+            lease_expires_at=None,
+            run_after=now + timedelta(seconds=delay),
+            updated_at=now,
+        )
+        return "queued"
+
+    jobs.update(
+        status="failed",
+        error=reason,
+        result={"status": "failed", "reason": reason},
+        locked_by=None,
+        lease_expires_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    return "failed"
+
+
+class JobHeartbeat:
+    """Background thread that keeps a job lease alive while it runs."""
+
+    def __init__(self, job_id: int, worker_id: str, lease_seconds: int):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pipeline-job-{job_id}-heartbeat",
+            daemon=True,
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        interval = max(1.0, self.lease_seconds / 3)
+        try:
+            while not self._stop.wait(interval):
+                try:
+                    if not renew_lease(self.job_id, self.worker_id, self.lease_seconds):
+                        logger.warning("작업 임대를 잃었습니다(job_id=%s)", self.job_id)
+                        self.lost = True
+                        return
+                except Exception:
+                    logger.exception("작업 하트비트 갱신 실패(job_id=%s)", self.job_id)
+        finally:
+            connection.close()
+
+
+class JobProgressRecorder:
+    """Pipeline progress callback that records step states for ``pipeline_job``.
+
+    Every call appends a row to ``pipeline_job_event`` with a sequence number
+    that keeps increasing across attempts, which the event stream uses as its
+    event id. ``pipeline_job.progress`` only keeps the latest state per step.
+    Both writes are one statement, and the job row lock it takes makes events
+    commit in sequence order. Completed and failed steps carry
+    ``duration_ms`` measured from their start.
+
+    Callbacks arrive from the variant threads, and each writes on its own
+    thread's connection. Events from a worker that no longer holds the lease
+    are dropped.
+    """
+
+    def __init__(self, job: PipelineJob):
+        self.job_id = job.job_id
+        self.worker_id = job.locked_by
+        self.attempt = job.attempts
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        with connection.cursor() as cursor:
+            cursor.execute(RESET_PROGRESS_SQL, [self.attempt, self.job_id])
+
+    def __call__(self, step: str, state: str, detail: Dict[str, Any]) -> None:
+        entry = {"state": state, "at": timezone.now().isoformat()}
+        entry.update(detail)
+        with self._lock:
+            now = time.monotonic()
+            if state == "started":
+                self._started[step] = now
+            elif step in self._started:
+                entry["duration_ms"] = int((now - self._started[step]) * 1000)
+
+        params = {
+            "job_id": self.job_id,
+            "worker_id": self.worker_id,
+            "attempt": self.attempt,
+            "step": step,
+            "state": state,
+            "entry": json.dumps(entry, cls=DjangoJSONEncoder),
+        }
+        try:
+            self._record(params)
+        except (InterfaceError, OperationalError):
+            # The thread's connection went stale between runs; reconnect once.
+            connection.close()
+            self._record(params)
+
+    @staticmethod
+    def _record(params: Dict[str, Any]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_EVENT_SQL, params)
+
+
+def save_pipeline_variants(
+    variants: List[Dict[str, Any]],
+    *,
+    project_id,
+    req_id,
+    user_login_id: str,
+) -> List[Dict[str, Any]]:
+    """Upload the variant images concurrently, then insert their ``ai_make_image`` rows at once."""
+    persister = ResultPersister()
+    for offset, variant in enumerate(variants):
+        final_image = variant.get("final_image")
+        if final_image is None:
+            continue
+        index = variant.get("index", offset + 1)
+        persister.add(final_image, name=result_filename(user_login_id, f"result_{index}"), meta={"index": index})
+    return persister.persist(project_id=project_id, req_id=req_id)
+
+
+def _read_source(source_path: str) -> bytes:
+    try:
+        with default_storage.open(source_path, "rb") as source_file:
+            return source_file.read()
+    except (FileNotFoundError, OSError) as exc:
+        raise PipelineStepError(f"원본 이미지를 불러오지 못했습니다: {source_path}") from exc
+
+
+def _pipeline_options(payload: Dict[str, Any], progress_callback) -> Dict[str, Any]:
+    return {
+        "style_prompt": payload.get("style_prompt") or "현실적인 가구 배치를 적용해주세요.",
+        "refinement_prompt": payload.get("refinement_prompt"),
+        "furniture_paths": None,
+        "variations": payload.get("variations") or 1,
+        "max_concurrency": _setting("PIPELINE_VARIANT_CONCURRENCY", 4),
+        "source_max_edge": _setting("PIPELINE_SOURCE_MAX_EDGE", None),
+        "source_quality": _setting("PIPELINE_SOURCE_QUALITY", 85),
+        "gemini_timeout": _setting("GEMINI_TIMEOUT_SECONDS", 180),
+        "gemini_caller": get_gemini_caller(),
+        "empty_room_cache": get_empty_room_cache(),
+        "upload_cache": get_gemini_upload_cache(),
+        "progress_callback": progress_callback,
+    }
+
+
+def _source_path(job: PipelineJob) -> str:
+    source_path = (job.payload or {}).get("source_path")
+    if not source_path:
+        raise PipelineStepError("작업에 원본 이미지 경로가 없습니다.")
+    return source_path
+
+
+def _save_source_derivatives(source_path: str, source: bytes) -> None:
+    # Retries and re-runs of the project reuse the derivatives the first attempt stored.
+    if not has_derivatives(source_path):
+        try_save_derivatives(source_path, source)
+
+
+def _job_checkpoints(job: PipelineJob, source: bytes, options: Dict[str, Any]) -> Optional[CheckpointStore]:
+    """Checkpoints shared by every attempt and re-run for the job's project."""
+    if not checkpoints_enabled():
+        return None
+    source_sha256 = ((job.payload or {}).get("source") or {}).get("sha256") or hashlib.sha256(source).hexdigest()
+    return StorageCheckpointStore(
+        job.project_id, pipeline_fingerprints(source_sha256, options), job_id=job.job_id
+    )
+
+
+class VariantPersister:
+    """Variant callback that stores each finished variant right away.
+
+    Every store is reported as a ``variant_{n}.persist`` step whose completed
+    event carries the image id and URL, so clients can show the first design
+    while the others are still being generated. Stored variants are recorded
+    as ``variant_{n}.done`` checkpoints so a re-run neither regenerates nor
+    inserts them twice. Once ``heartbeat`` reports the lease lost, nothing is
+    stored: the job belongs to another worker, which will store its own.
+    """
+
+    def __init__(
+        self,
+        job: PipelineJob,
+        progress_callback=None,
+        checkpoints: Optional[CheckpointStore] = None,
+        heartbeat=None,
+    ):
+        self.job = job
+        self.progress_callback = progress_callback
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.heartbeat = heartbeat
+        self.stored: List[Dict[str, Any]] = []
+
+    @property
+    def lost(self) -> bool:
+        return self.heartbeat is not None and self.heartbeat.lost
+
+    def restore(self, variations: int) -> None:
+        """Take over variants an earlier run already stored (their ``done`` checkpoints)."""
+        for index in range(1, max(1, int(variations)) + 1):
+            checkpoint = self.checkpoints.load(variant_stage(index, "done"))
+            if checkpoint is None:
+                continue
+            payload = checkpoint.meta
+            self.stored.append(payload)
+            self._notify(
+                variant_stage(index, "persist"),
+                "completed",
+                {"image_id": payload["image_id"], "image_url": payload["image_url"], "resumed": True},
+            )
+
+    def _notify(self, step: str, state: str, detail: Dict[str, Any]) -> None:
+        if self.progress_callback:
+            self.progress_callback(step, state, detail)
+
+    def __call__(self, variant: Dict[str, Any]) -> None:
+        if self.lost:
+            raise PipelineCancelled(f"작업 임대를 잃어 변형 {variant.get('index')} 이미지를 저장하지 않습니다.")
+        step = f"variant_{variant.get('index')}.persist"
+        self._notify(step, "started", {})
+        try:
+            payloads = save_pipeline_variants(
+                [variant],
+                project_id=self.job.project_id,
+                req_id=self.job.req_id,
+                user_login_id=(self.job.payload or {}).get("user_login_id") or self.job.user_id,
+            )
+        except Exception as exc:
+            logger.exception("변형 이미지 저장 실패(job_id=%s)", self.job.job_id)
+            self._notify(step, "failed", {"error": str(exc)})
+            raise PipelineStepError(f"변형 {variant.get('index')} 이미지를 저장하지 못했습니다.") from exc
+
+        self.stored.extend(payloads)
+        for payload in payloads:
+            self.checkpoints.save(variant_stage(payload["index"], "done"), None, payload)
+            self._notify(step, "completed", {"image_id": payload["image_id"], "image_url": payload["image_url"]})
+
+
+def _pipeline_result(pipeline_images: Dict[str, Any], persister: VariantPersister) -> Dict[str, Any]:
+    pipeline_errors = pipeline_images.get("errors") or []
+    variant_payloads = sorted(persister.stored, key=lambda payload: payload["index"])
+    if not variant_payloads:
+        raise PipelineStepError("AI 파이프라인이 어떤 이미지도 생성하지 못했습니다.")
+
+    result = {
+        "status": "partial" if pipeline_errors else "completed",
+        "count": len(variant_payloads),
+        "images": variant_payloads,
+        "preview_url": variant_payloads[0]["image_url"],
+    }
+    step_stats = {
+        f"variant_{variant.get('index')}": variant["step_stats"]
+        for variant in pipeline_images.get("variants", [])
+        if variant.get("step_stats")
+    }
+    if step_stats:
+        result["step_stats"] = step_stats
+    if pipeline_images.get("input"):
+        result["input"] = pipeline_images["input"]
+    if pipeline_errors:
+        result["warnings"] = pipeline_errors
+    return result
+
+
+def process_job(
+    job: PipelineJob, *, progress_callback=None, source: Optional[bytes] = None, heartbeat=None
+) -> Dict[str, Any]:
+    """Run the design pipeline for ``job``, storing each variant as soon as it is ready.
+
+    ``source`` lets a caller that still holds the upload in memory skip
+    reading it back from storage. With a ``heartbeat``, a lost lease stops
+    the run: no further variants are stored or started.
+    """
+    source = source if source is not None else _read_source(_source_path(job))
+    _save_source_derivatives(_source_path(job), source)
+    options = _pipeline_options(job.payload or {}, progress_callback)
+    checkpoints = _job_checkpoints(job, source, options)
+    persister = VariantPersister(job, progress_callback, checkpoints, heartbeat=heartbeat)
+    persister.restore(options["variations"])
+
+    try:
+        openai_client = get_openai_client()
+        gemini_model = get_generative_model()
+    except ImproperlyConfigured as exc:
+        raise PipelineStepError(str(exc)) from exc
+
+    with track_in_flight(PIPELINE_IN_FLIGHT, kind="pipeline"):
+        pipeline_images = run_design_pipeline(
+            source,
+            openai_client=openai_client,
+            generative_model=gemini_model,
+            variant_callback=persister,
+            checkpoints=checkpoints,
+            should_stop=lambda: persister.lost,
+            **options,
+        )
+
+    return _pipeline_result(pipeline_images, persister)
+
+
+async def aprocess_job(
+    job: PipelineJob, *, progress_callback=None, source: Optional[bytes] = None, heartbeat=None
+) -> Dict[str, Any]:
+    """Async counterpart of :func:`process_job` built on :func:`arun_design_pipeline`."""
+    if source is None:
+        source = await sync_to_async(_read_source)(_source_path(job))
+    await sync_to_async(_save_source_derivatives)(_source_path(job), source)
+    options = _pipeline_options(job.payload or {}, progress_callback)
+    checkpoints = _job_checkpoints(job, source, options)
+    persister = VariantPersister(job, progress_callback, checkpoints, heartbeat=heartbeat)
+    await sync_to_async(persister.restore)(options["variations"])
+
+    try:
+        openai_client = get_async_openai_client()
+        gemini_model = get_generative_model()
+    except ImproperlyConfigured as exc:
+        raise PipelineStepError(str(exc)) from exc
+
+    with track_in_flight(PIPELINE_IN_FLIGHT, kind="pipeline"):
+        pipeline_images = await arun_design_pipeline(
+            source,
+            openai_client=openai_client,
+            generative_model=gemini_model,
+            variant_callback=sync_to_async(persister),
+            checkpoints=checkpoints,
+            should_stop=lambda: persister.lost,
+            **options,
+        )
+
+    return _pipeline_result(pipeline_images, persister)
+
+
+def run_job(job: PipelineJob, worker_id: str, lease_seconds: int) -> str:
+    """Process a claimed job under a heartbeat and record its final state."""
+    logger.info("파이프라인 작업 시작(job_id=%s, attempt=%s)", job.job_id, job.attempts)
+    recorder = JobProgressRecorder(job)
+
+    with JobHeartbeat(job.job_id, worker_id, lease_seconds) as heartbeat:
+        try:
+            result = process_job(job, progress_callback=recorder, heartbeat=heartbeat)
+        except PipelineCancelled:
+            logger.warning("임대를 잃은 작업을 중단했습니다(job_id=%s)", job.job_id)
+            return "lost"
+        except PipelineStepError as exc:
+            logger.error("파이프라인 작업 실패(job_id=%s): %s", job.job_id, exc)
+            return fail_job(job, worker_id, str(exc))
+        except Exception as exc:
+            logger.exception("파이프라인 작업 중 알 수 없는 오류(job_id=%s)", job.job_id)
+            return fail_job(job, worker_id, f"파이프라인 실행 중 오류가 발생했습니다: {exc}")
+
+    if heartbeat.lost:
+        logger.warning("임대를 잃은 작업의 결과를 기록하지 않습니다(job_id=%s)", job.job_id)
+        return "lost"
+
+    complete_job(job.job_id, worker_id, result)
+    logger.info("파이프라인 작업 완료(job_id=%s)", job.job_id)
+    return "completed"
+
+
+class AsyncJobHeartbeat:
+    """Event-loop task that keeps a job lease alive while an async view runs it."""
+
+    def __init__(self, job_id: int, worker_id: str, lease_seconds: int):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await sync_to_async(renew_lease)(self.job_id, self.worker_id, self.lease_seconds)
+            except Exception:
+                logger.exception("작업 하트비트 갱신 실패(job_id=%s)", self.job_id)
+                continue
+            if not renewed:
+                logger.warning("작업 임대를 잃었습니다(job_id=%s)", self.job_id)
+                self.lost = True
+                return
+
+
+async def arun_job(
+    job: PipelineJob, worker_id: str, lease_seconds: int, *, source: Optional[bytes] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """Run a job leased by this process inside the event loop.
+
+    Returns the final state and the pipeline payload. A failed run goes back to
+    the queue like any other job, so a worker can retry it.
+    """
+    logger.info("파이프라인 작업 시작(job_id=%s, 비동기)", job.job_id)
+    recorder = await sync_to_async(JobProgressRecorder)(job)
+
+    async with AsyncJobHeartbeat(job.job_id, worker_id, lease_seconds) as heartbeat:
+        try:
+            result = await aprocess_job(job, progress_callback=recorder, source=source, heartbeat=heartbeat)
+        except PipelineCancelled:
+            logger.warning("임대를 잃은 작업을 중단했습니다(job_id=%s)", job.job_id)
+            return "lost", {"status": "lost", "job_id": job.job_id}
+        except Exception as exc:
+            if isinstance(exc, PipelineStepError):
+                logger.error("파이프라인 작업 실패(job_id=%s): %s", job.job_id, exc)
+                reason = str(exc)
+            else:
+                logger.exception("파이프라인 작업 중 알 수 없는 오류(job_id=%s)", job.job_id)
+                reason = f"파이프라인 실행 중 오류가 발생했습니다: {exc}"
+            state = await sync_to_async(fail_job)(job, worker_id, reason)
+            return state, {"status": state, "reason": reason, "job_id": job.job_id}
+
+    if heartbeat.lost:
+        return "lost", {"status": "lost", "job_id": job.job_id}
+
+    await sync_to_async(complete_job)(job.job_id, worker_id, result)
+    logger.info("파이프라인 작업 완료(job_id=%s)", job.job_id)
+    return "completed", result
+
+
+def run_worker(
+    *,
+    worker_id: Optional[str] = None,
+    poll_interval: Optional[float] = None,
+    lease_seconds: Optional[int] = None,
+    once: bool = False,
+    stop_event: Optional[threading.Event] = None,
+) -> int:
+    """Claim and run jobs until ``stop_event`` is set; returns the number processed."""
+    worker_id = worker_id or make_worker_id()
+    poll_interval = poll_interval or _setting("PIPELINE_JOB_POLL_INTERVAL", 2.0)
+    lease_seconds = lease_seconds or _setting("PIPELINE_JOB_LEASE_SECONDS", 120)
+    stop_event = stop_event or threading.Event()
+    processed = 0
+
+    logger.info("파이프라인 워커 시작: %s", worker_id)
+    while not stop_event.is_set():
+        try:
+            job = claim_next_job(worker_id, lease_seconds)
+        except Exception:
+            logger.exception("작업 임대 조회 실패")
+            connection.close()
+            job = None
+
+        if job is None:
+            if once:
+                break
+            stop_event.wait(poll_interval)
+            continue
+
+        run_job(job, worker_id, lease_seconds)
+        processed += 1
+        if once:
+            break
+
+    logger.info("파이프라인 워커 종료: %s (처리 %d건)", worker_id, processed)
+    return processed
+
+
+__all__ = [
+    "enqueue_pipeline_job",
+    "claim_next_job",
+    "renew_lease",
+    "complete_job",
+    "fail_job",
+    "process_job",
+    "aprocess_job",
+    "run_job",
+    "arun_job",
+    "run_worker",
+    "save_pipeline_variants",
+]
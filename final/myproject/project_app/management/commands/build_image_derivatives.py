@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from project_app.derivatives import has_derivatives, save_derivatives, storage_name_from_url
+from project_app.models import AiMakeImage, Project
+
+
+class Command(BaseCommand):
+    help = "기존 프로젝트 이미지와 AI 생성 이미지의 썸네일/중간 크기 파생 이미지를 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="이미 있는 파생 이미지도 다시 생성")
+        parser.add_argument("--limit", type=int, default=None, help="처리할 최대 이미지 수")
+
+    def _urls(self):
+        yield from Project.objects.exclude(project_image__isnull=True).values_list("project_image", flat=True).iterator()
+        yield from AiMakeImage.objects.exclude(ai_image_path__isnull=True).values_list("ai_image_path", flat=True).iterator()
+
+    def handle(self, *args, **options):
+        created = skipped = failed = 0
+
+        for url in self._urls():
+            if options["limit"] is not None and created >= options["limit"]:
+                break
+            name = storage_name_from_url(url or "")
+            if not name:
+                skipped += 1
+                continue
+            if not options["force"] and has_derivatives(name):
+                skipped += 1
+                continue
+            try:
+                with default_storage.open(name, "rb") as source:
+                    save_derivatives(name, source.read())
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"파생 이미지 생성 실패: {name} ({exc})")
+                continue
+            created += 1
+
+        self.stdout.write(self.style.SUCCESS(f"완료: 생성 {created}건, 건너뜀 {skipped}건, 실패 {failed}건"))
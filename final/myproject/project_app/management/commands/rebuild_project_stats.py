@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from project_app.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "project 테이블에서 사용자별 프로젝트 통계 요약(project_stats, project_stats_daily)을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", default=None, help="이 사용자의 통계만 다시 계산")
+
+    def handle(self, *args, **options):
+        written = rebuild_stats(options["user_id"])
+        self.stdout.write(self.style.SUCCESS(f"프로젝트 통계 재계산 완료 (사용자 {written}명)"))
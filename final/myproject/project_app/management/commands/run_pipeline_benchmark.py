@@ -0,0 +1,170 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from interior.services.fakes import FakeProviderConfig, FakeProviders, LatencyModel, parse_size
+from project_app.benchmark import Benchmark, write_report
+from project_app.models import AiMakeImage
+
+SCENARIOS = ("pipeline", "create_project", "refine")
+
+
+def _latency(value):
+    try:
+        return LatencyModel.parse(value)
+    except ValueError as exc:
+        raise CommandError(str(exc)) from exc
+
+
+def _dimensions(value):
+    if not value:
+        return None
+    dimensions = parse_size(value, default=None)
+    if dimensions is None:
+        raise CommandError(f"크기 형식이 올바르지 않습니다(예: 1024x1024): {value}")
+    return dimensions
+
+
+def _variant_counts(value):
+    """``"1-8"`` or ``"1,2,4,8"``."""
+    try:
+        if "-" in value:
+            low, high = (int(part) for part in value.split("-", 1))
+            counts = list(range(low, high + 1))
+        else:
+            counts = [int(part) for part in value.split(",")]
+    except ValueError as exc:
+        raise CommandError(f"변형 개수 형식이 올바르지 않습니다: {value}") from exc
+    if not counts or min(counts) < 1:
+        raise CommandError(f"변형 개수 형식이 올바르지 않습니다: {value}")
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "가짜 OpenAI/Gemini 클라이언트로 파이프라인과 엔드포인트의 지연·처리량·CPU·메모리를 측정해 JSON으로 저장합니다. "
+        "기본 지연은 실제 제공자의 약 1/10입니다. create_project/refine 시나리오는 설정된 DB와 저장소에 실제로 기록하므로 "
+        "벤치마크 전용 사용자로 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario", action="append", choices=SCENARIOS, help="실행할 시나리오 (여러 번 지정 가능, 기본: pipeline)"
+        )
+        parser.add_argument("--output", default="benchmark.json", help="결과 JSON 파일 경로")
+        parser.add_argument("--seed", type=int, default=0, help="지연/오류 샘플링 시드")
+
+        parser.add_argument("--openai-latency", default="lognormal:1.2,3", help="OpenAI 지연 분포 (fixed:s, uniform:a,b, lognormal:중앙값,p95)")
+        parser.add_argument("--openai-error-rate", type=float, default=0.0, help="OpenAI 호출 실패 비율 (0~1)")
+        parser.add_argument("--gemini-latency", default="lognormal:0.8,2", help="Gemini 지연 분포")
+        parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Gemini 호출 실패 비율 (0~1)")
+        parser.add_argument("--upload-latency", default="fixed:0.05", help="Gemini 파일 업로드 지연 분포")
+        parser.add_argument("--response-size", default=None, help="응답 이미지 크기 (예: 1536x1024, 기본: 요청 크기)")
+        parser.add_argument("--response-format", default="PNG", help="응답 이미지 형식 (PNG, WEBP, JPEG)")
+        parser.add_argument("--guards", action="store_true", help="호출 한도/회로 차단기를 거쳐 호출 (같은 호스트 워커와 상태 공유)")
+
+        parser.add_argument("--variants", default="1-8", help="pipeline: 변형 개수 범위 (예: 1-8, 1,2,4,8)")
+        parser.add_argument("--iterations", type=int, default=3, help="pipeline: 변형 개수별 클라이언트당 실행 횟수")
+        parser.add_argument("--size", default="1024x1024", help="pipeline: 출력 크기")
+        parser.add_argument("--refinement-prompt", default=None, help="pipeline: 지정하면 4단계(부분 수정)까지 실행")
+        parser.add_argument("--source-size", default="1600x1200", help="합성 원본 사진 크기")
+
+        parser.add_argument("--clients", type=int, default=4, help="동시 클라이언트 수")
+        parser.add_argument("--requests", type=int, default=20, help="create_project/refine: 총 요청 수")
+        parser.add_argument("--async-views", action="store_true", help="create_project/refine: 비동기(ASGI) 엔드포인트 사용")
+        parser.add_argument("--user-id", default=None, help="create_project: 프로젝트를 만들 사용자 ID")
+        parser.add_argument("--variations", type=int, default=1, help="create_project: 프로젝트당 변형 개수")
+        parser.add_argument("--workers", type=int, default=2, help="create_project: 프로세스 내 워커 스레드 수 (동기 뷰)")
+        parser.add_argument("--project-id", default=None, help="refine: 대상 프로젝트 ID")
+        parser.add_argument("--image-id", type=int, default=None, help="refine: 대상 AI 이미지 ID (기본: 프로젝트의 최신 이미지)")
+        parser.add_argument("--use-memo", action="store_true", help="refine: 부분 수정 메모를 사용 (기본: force로 우회)")
+
+    def _refine_target(self, options):
+        project_id = options["project_id"]
+        if not project_id:
+            raise CommandError("refine 시나리오에는 --project-id가 필요합니다.")
+        if options["image_id"] is not None:
+            return project_id, options["image_id"]
+        image_id = (
+            AiMakeImage.objects.filter(project_id=project_id)
+            .order_by("-image_id")
+            .values_list("image_id", flat=True)
+            .first()
+        )
+        if image_id is None:
+            raise CommandError(f"프로젝트 {project_id}에 AI 이미지가 없습니다. 먼저 create_project 시나리오를 실행하세요.")
+        return project_id, image_id
+
+    def handle(self, *args, **options):
+        scenarios = options["scenario"] or ["pipeline"]
+        if "create_project" in scenarios and not options["user_id"]:
+            raise CommandError("create_project 시나리오에는 --user-id가 필요합니다.")
+        refine_target = self._refine_target(options) if "refine" in scenarios else None
+
+        response_size = _dimensions(options["response_size"])
+        source_size = _dimensions(options["source_size"])
+        openai = FakeProviderConfig(
+            latency=_latency(options["openai_latency"]),
+            error_rate=options["openai_error_rate"],
+            image_size=response_size,
+            image_format=options["response_format"].upper(),
+        )
+        gemini = FakeProviderConfig(
+            latency=_latency(options["gemini_latency"]),
+            error_rate=options["gemini_error_rate"],
+            image_size=response_size,
+            image_format=options["response_format"].upper(),
+        )
+        providers = FakeProviders(
+            openai=openai, gemini=gemini, upload_latency=_latency(options["upload_latency"]), seed=options["seed"]
+        )
+        benchmark = Benchmark(providers, guards=options["guards"], seed=options["seed"])
+
+        with benchmark.installed():
+            if "pipeline" in scenarios:
+                self.stdout.write("pipeline 시나리오 실행 중...")
+                benchmark.pipeline(
+                    _variant_counts(options["variants"]),
+                    iterations=options["iterations"],
+                    concurrency=options["clients"],
+                    source_size=source_size,
+                    size=options["size"],
+                    refinement_prompt=options["refinement_prompt"],
+                )
+            if "create_project" in scenarios:
+                self.stdout.write("create_project 시나리오 실행 중...")
+                benchmark.create_project(
+                    user_id=options["user_id"],
+                    clients=options["clients"],
+                    requests=options["requests"],
+                    variations=options["variations"],
+                    use_async=options["async_views"],
+                    workers=options["workers"],
+                    source_size=source_size,
+                )
+            if "refine" in scenarios:
+                self.stdout.write("refine 시나리오 실행 중...")
+                project_id, image_id = refine_target
+                benchmark.refine(
+                    project_id=project_id,
+                    image_id=image_id,
+                    clients=options["clients"],
+                    requests=options["requests"],
+                    use_async=options["async_views"],
+                    use_memo=options["use_memo"],
+                )
+
+        config = {
+            "openai": openai.describe(),
+            "gemini": gemini.describe(),
+            "upload_latency": options["upload_latency"],
+            "guards": options["guards"],
+            "seed": options["seed"],
+        }
+        write_report(benchmark.report(config), options["output"])
+
+        for scenario in benchmark.scenarios:
+            latency = scenario["latency_seconds"]
+            self.stdout.write(
+                f"{scenario['name']} {scenario['params']}: p50={latency['p50']} p95={latency['p95']} "
+                f"p99={latency['p99']} 처리량={scenario['throughput_per_second']}/s 오류={scenario['errors']}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"벤치마크 결과 저장: {options['output']}"))
@@ -0,0 +1,37 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from project_app.jobs import make_worker_id, run_worker
+
+
+class Command(BaseCommand):
+    help = "pipeline_job 큐에서 AI 디자인 파이프라인 작업을 가져와 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--worker-id", default=None, help="작업 임대에 기록할 워커 식별자")
+        parser.add_argument("--poll-interval", type=float, default=None, help="대기 작업이 없을 때 폴링 간격(초)")
+        parser.add_argument("--lease-seconds", type=int, default=None, help="작업 임대 유지 시간(초)")
+        parser.add_argument("--once", action="store_true", help="작업 하나만 처리하고 종료")
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _request_stop(signum, frame):
+            self.stdout.write("종료 신호를 받았습니다. 현재 작업을 마치고 종료합니다.")
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+
+        worker_id = options["worker_id"] or make_worker_id()
+        self.stdout.write(f"파이프라인 워커 시작: {worker_id}")
+        processed = run_worker(
+            worker_id=worker_id,
+            poll_interval=options["poll_interval"],
+            lease_seconds=options["lease_seconds"],
+            once=options["once"],
+            stop_event=stop_event,
+        )
+        self.stdout.write(self.style.SUCCESS(f"파이프라인 워커 종료 (처리 {processed}건)"))
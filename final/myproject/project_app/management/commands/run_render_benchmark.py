@@ -0,0 +1,143 @@
+import gzip
+import platform
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from project_app import renderers
+from project_app.benchmark import git_revision, percentile, write_report
+from project_app.middleware import brotli
+from project_app.renderers import FastJSONRenderer
+
+TITLES = ("거실 리모델링", "아이 방 꾸미기", "신혼집 주방", "원룸 수납 정리", "서재 겸 작업실")
+STYLES = ("모던", "미니멀", "내추럴", "북유럽", "빈티지", None)
+STATUSES = ("progress", "completed")
+
+
+def _image_url(rng: random.Random) -> str:
+    return f"https://media.example.com/results/u_{rng.getrandbits(32):08x}_result_{rng.randint(1, 8)}.webp"
+
+
+def _sizes(url: str) -> dict:
+    stem = url.rsplit(".", 1)[0]
+    return {
+        "thumbnail_url": f"{stem}__w320.webp",
+        "medium_url": f"{stem}__w768.webp",
+        "full_url": url,
+        "srcset": f"{stem}__w320.webp 320w, {stem}__w768.webp 768w, {url} 1024w",
+    }
+
+
+def project_rows(count: int, seed: int = 0) -> list:
+    """Rows shaped like the project list items, with datetimes and Decimals left to the renderer."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    rows = []
+    for index in range(count):
+        created = start + timedelta(seconds=rng.randint(0, 300 * 24 * 3600), microseconds=rng.randint(0, 999999))
+        image = _image_url(rng)
+        cover = _image_url(rng) if rng.random() < 0.8 else None
+        rows.append(
+            {
+                "id": f"p_{index:08d}",
+                "title": f"{rng.choice(TITLES)} {index}",
+                "description": "채광이 좋은 남향 거실, 밝은 톤의 원목 가구와 간접 조명을 원합니다." if rng.random() < 0.6 else None,
+                "status": rng.choice(STATUSES),
+                "created_at": created,
+                "updated_at": created + timedelta(minutes=rng.randint(0, 600)),
+                "project_image": image,
+                "project_image_sizes": _sizes(image),
+                "cover_image": cover or image,
+                "cover_image_sizes": _sizes(cover or image),
+                "variant_count": rng.randint(0, 8),
+                "budget": Decimal(rng.randint(100, 5000)) * 10000,
+                "area_ratio": round(rng.random(), 4),
+                "design_style": rng.choice(STYLES),
+            }
+        )
+    return rows
+
+
+def _timed(render, repeat: int):
+    times, output = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = render()
+        times.append(time.perf_counter() - started)
+    return output, {
+        "p50": round(percentile(times, 0.5), 6),
+        "min": round(min(times), 6),
+        "max": round(max(times), 6),
+    }
+
+
+def _compression(body: bytes, repeat: int, brotli_quality: int) -> dict:
+    results = {}
+    codecs = {"gzip": lambda: gzip.compress(body, compresslevel=6, mtime=0)}
+    if brotli is not None:
+        codecs["br"] = lambda: brotli.compress(body, quality=brotli_quality)
+    for name, compress in codecs.items():
+        compressed, seconds = _timed(compress, repeat)
+        results[name] = {"bytes": len(compressed), "ratio": round(len(compressed) / len(body), 4), "seconds": seconds}
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "프로젝트 목록 형태의 합성 데이터로 기존 JSONRenderer와 FastJSONRenderer(orjson)의 렌더링 시간을 비교하고, "
+        "두 출력이 바이트 단위로 같은지와 gzip/brotli 압축 크기·시간을 JSON으로 저장합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="페이로드 행 수")
+        parser.add_argument("--repeat", type=int, default=20, help="렌더러별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+        parser.add_argument("--brotli-quality", type=int, default=5, help="brotli 압축 품질 (0~11)")
+        parser.add_argument("--output", default="render_benchmark.json", help="결과 JSON 파일 경로")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows와 --repeat는 1 이상이어야 합니다.")
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING("orjson이 설치되지 않아 FastJSONRenderer가 기존 렌더러로 동작합니다."))
+
+        payload = {"results": project_rows(options["rows"], options["seed"]), "next_cursor": None}
+        baseline, baseline_seconds = _timed(lambda: JSONRenderer().render(payload), options["repeat"])
+        fast, fast_seconds = _timed(lambda: FastJSONRenderer().render(payload), options["repeat"])
+        identical = baseline == fast
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "config": {
+                "rows": options["rows"],
+                "repeat": options["repeat"],
+                "seed": options["seed"],
+                "brotli_quality": options["brotli_quality"],
+            },
+            "bytes": len(baseline),
+            "identical": identical,
+            "renderers": {
+                "JSONRenderer": {"seconds": baseline_seconds},
+                "FastJSONRenderer": {"seconds": fast_seconds},
+            },
+            "speedup_p50": round(baseline_seconds["p50"] / fast_seconds["p50"], 2) if fast_seconds["p50"] else None,
+            "compression": _compression(fast, options["repeat"], options["brotli_quality"]),
+        }
+        write_report(report, options["output"])
+
+        self.stdout.write(
+            f"{options['rows']}행 {len(baseline)} bytes: JSONRenderer p50={baseline_seconds['p50']}s "
+            f"FastJSONRenderer p50={fast_seconds['p50']}s ({report['speedup_p50']}배)"
+        )
+        for name, result in report["compression"].items():
+            self.stdout.write(f"{name}: {result['bytes']} bytes (비율 {result['ratio']}) p50={result['seconds']['p50']}s")
+        if not identical:
+            raise CommandError("두 렌더러의 출력이 다릅니다.")
+        self.stdout.write(self.style.SUCCESS(f"벤치마크 결과 저장: {options['output']}"))
@@ -0,0 +1,124 @@
+# project_app/memo.py
+"""Memoised step4 refinements.
+
+``refinement_memo`` maps (source image hash, normalised prompt, size, model)
+to the ``ai_make_image`` row a previous refinement produced, so repeating the
+same request returns that image instead of paying for another edit. Entries
+expire after ``REFINE_MEMO_TTL_SECONDS`` and the table is trimmed to the
+``REFINE_MEMO_MAX_ENTRIES`` most recently used rows.
+"""
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from interior.services.cache import content_key
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, Unicode form and whitespace differences do not change the edit."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", prompt or "")).strip().casefold()
+
+
+def refinement_key(source: bytes, prompt: str, size: str, model: str) -> Dict[str, str]:
+    source_sha256 = hashlib.sha256(source).hexdigest()
+    prompt = normalize_prompt(prompt)
+    return {
+        "memo_key": content_key(source_sha256, prompt, size, model),
+        "source_sha256": source_sha256,
+        "prompt": prompt,
+        "size": size,
+        "model": model,
+    }
+
+
+def lookup_refinement(key: Dict[str, str], project_id) -> Optional[Dict[str, Any]]:
+    """Return the memoised image of this project, refreshing its recency; None on a miss.
+
+    Entries whose image row was deleted, or that belong to another project,
+    count as misses.
+    """
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE refinement_memo AS m
+                SET last_used_at = NOW(), hits = m.hits + 1
+                FROM ai_make_image AS i
+                WHERE m.memo_key = %s
+                  AND m.expires_at > NOW()
+                  AND m.project_id = %s
+                  AND i.image_id = m.image_id
+                RETURNING m.image_id, i.ai_image_path, i.req_id;
+                """,
+                [key["memo_key"], str(project_id)],
+            )
+            row = cursor.fetchone()
+    except DatabaseError as exc:
+        logger.warning("부분 수정 메모 조회 실패: %s", exc)
+        return None
+    if row is None:
+        return None
+    logger.info("부분 수정 메모 적중(image_id=%s)", row[0])
+    return {"image_id": row[0], "image_url": row[1], "req_id": row[2]}
+
+
+def remember_refinement(key: Dict[str, str], *, project_id, image_id: int, result_path: str) -> None:
+    """Record a fresh result, then drop expired and least recently used entries."""
+    ttl = getattr(settings, "REFINE_MEMO_TTL_SECONDS", 7 * 24 * 60 * 60)
+    max_entries = getattr(settings, "REFINE_MEMO_MAX_ENTRIES", 10000)
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO refinement_memo (
+                    memo_key, source_sha256, prompt, size, model, project_id, image_id, result_path, expires_at
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (memo_key) DO UPDATE SET
+                    project_id = EXCLUDED.project_id,
+                    image_id = EXCLUDED.image_id,
+                    result_path = EXCLUDED.result_path,
+                    hits = 0,
+                    created_at = NOW(),
+                    last_used_at = NOW(),
+                    expires_at = EXCLUDED.expires_at;
+                """,
+                [
+                    key["memo_key"],
+                    key["source_sha256"],
+                    key["prompt"],
+                    key["size"],
+                    key["model"],
+                    str(project_id),
+                    image_id,
+                    result_path,
+                    timezone.now() + timedelta(seconds=ttl),
+                ],
+            )
+            cursor.execute("DELETE FROM refinement_memo WHERE expires_at <= NOW();")
+            cursor.execute(
+                """
+                DELETE FROM refinement_memo
+                WHERE last_used_at < (
+                    SELECT last_used_at FROM refinement_memo ORDER BY last_used_at DESC OFFSET %s LIMIT 1
+                );
+                """,
+                [max_entries - 1],
+            )
+    except DatabaseError as exc:
+        # The refined image is already stored; a missing memo only costs a future edit.
+        logger.warning("부분 수정 메모 저장 실패(image_id=%s): %s", image_id, exc)
+
+
+__all__ = ["lookup_refinement", "normalize_prompt", "refinement_key", "remember_refinement"]
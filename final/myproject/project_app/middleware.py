@@ -0,0 +1,109 @@
+# project_app/middleware.py
+"""Response compression negotiated from ``Accept-Encoding``.
+
+Brotli is preferred when the ``brotli`` package is installed and the client
+accepts it, gzip otherwise. Only complete 200 responses of a text-like type
+and at least ``COMPRESSION_MIN_BYTES`` long are compressed: small bodies
+gain nothing over the headers, streams (SSE progress) must not be buffered,
+and images are already compressed. gzip output gets Django's random
+filename padding against BREACH-style length probing, as in
+``GZipMiddleware``.
+"""
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only without brotli
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """``"br;q=1.0, gzip;q=0.8, *;q=0"`` -> ``{"br": 1.0, "gzip": 0.8, "*": 0.0}``."""
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """The accepted encoding with the highest q-value, brotli winning ties."""
+    accepted = accepted_encodings(header)
+    default = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        quality = accepted.get(encoding, default)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compress(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5))
+    return compress_string(content, max_random_bytes=100)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if response.streaming or response.status_code != 200 or response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or content_type.startswith("text/event-stream"):
+            return response
+        if "no-transform" in response.get("Cache-Control", "").lower():
+            return response
+        if len(response.content) < getattr(settings, "COMPRESSION_MIN_BYTES", 1024):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        try:
+            compressed = _compress(response.content, encoding)
+        except Exception as exc:  # an uncompressed body is always a valid answer
+            logger.warning("응답 압축 실패(%s): %s", encoding, exc)
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        # The bytes differ from the uncompressed representation, so a strong ETag must become weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+
+__all__ = ["CompressionMiddleware", "accepted_encodings", "choose_encoding"]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS pipeline_job (
+    job_id SERIAL PRIMARY KEY,
+    project_id VARCHAR(20) NOT NULL,
+    req_id INTEGER,
+    user_id VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    locked_by VARCHAR(100),
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS pipeline_job_claim_idx ON pipeline_job (status, run_after, job_id);
+CREATE INDEX IF NOT EXISTS pipeline_job_project_idx ON pipeline_job (project_id);
+"""
+
+DROP_TABLE_SQL = """
+DROP TABLE IF EXISTS pipeline_job;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0002_pending_users_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE_SQL, DROP_TABLE_SQL),
+    ]
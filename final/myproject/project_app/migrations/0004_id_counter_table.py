@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS id_counter (
+    name VARCHAR(100) PRIMARY KEY,
+    next_value BIGINT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Ids used to be MAX()+1; move any column sequence past the existing rows.
+DO $$
+DECLARE
+    target RECORD;
+    seq TEXT;
+    max_id BIGINT;
+BEGIN
+    FOR target IN
+        SELECT * FROM (VALUES ('project', 'project_id'), ('customize_req', 'req_id'), ('ai_make_image', 'image_id'))
+            AS t(table_name, column_name)
+    LOOP
+        seq := pg_get_serial_sequence(target.table_name, target.column_name);
+        IF seq IS NOT NULL THEN
+            EXECUTE format('SELECT MAX(%I) FROM %I', target.column_name, target.table_name) INTO max_id;
+            IF max_id IS NOT NULL THEN
+                PERFORM setval(seq, max_id, true);
+            END IF;
+        END IF;
+    END LOOP;
+END $$;
+"""
+
+DROP_TABLE_SQL = """
+DROP TABLE IF EXISTS id_counter;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0003_pipeline_job_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE_SQL, DROP_TABLE_SQL),
+    ]
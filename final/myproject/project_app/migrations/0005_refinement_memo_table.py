@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS refinement_memo (
+    memo_key CHAR(64) PRIMARY KEY,
+    source_sha256 CHAR(64) NOT NULL,
+    prompt TEXT NOT NULL,
+    size VARCHAR(20) NOT NULL,
+    model VARCHAR(50) NOT NULL,
+    project_id VARCHAR(20) NOT NULL,
+    image_id INTEGER NOT NULL,
+    result_path TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refinement_memo_last_used_idx ON refinement_memo (last_used_at);
+CREATE INDEX IF NOT EXISTS refinement_memo_expires_idx ON refinement_memo (expires_at);
+"""
+
+DROP_TABLE_SQL = """
+DROP TABLE IF EXISTS refinement_memo;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0004_id_counter_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE_SQL, DROP_TABLE_SQL),
+    ]
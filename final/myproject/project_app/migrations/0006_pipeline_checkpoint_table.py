@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS pipeline_checkpoint (
+    project_id VARCHAR(20) NOT NULL,
+    stage VARCHAR(50) NOT NULL,
+    fingerprint CHAR(64) NOT NULL,
+    job_id INTEGER,
+    storage_path TEXT,
+    meta JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (project_id, stage)
+);
+"""
+
+DROP_TABLE_SQL = """
+DROP TABLE IF EXISTS pipeline_checkpoint;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0005_refinement_memo_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE_SQL, DROP_TABLE_SQL),
+    ]
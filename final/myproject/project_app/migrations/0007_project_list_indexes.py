@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+# Keyset pagination of a user's projects and the first customize_req per project.
+CREATE_INDEXES_SQL = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS project_user_created_idx
+    ON project (user_id, create_date DESC, project_id DESC);
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS customize_req_project_req_idx
+    ON customize_req (project_id, req_id);
+    """,
+]
+
+DROP_INDEXES_SQL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS project_user_created_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS customize_req_project_req_idx;",
+]
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("project_app", "0006_pipeline_checkpoint_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEXES_SQL, DROP_INDEXES_SQL),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+
+CREATE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS project_stats (
+    user_id VARCHAR(50) PRIMARY KEY,
+    total_projects INTEGER NOT NULL DEFAULT 0,
+    in_progress INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS project_stats_daily (
+    user_id VARCHAR(50) NOT NULL,
+    day DATE NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
+"""
+
+# Seed the counters from the existing projects.
+BACKFILL_SQL = """
+INSERT INTO project_stats (user_id, total_projects, in_progress, completed, updated_at)
+SELECT user_id,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE status = 'progress'),
+       COUNT(*) FILTER (WHERE status = 'completed'),
+       NOW()
+FROM project
+GROUP BY user_id
+ON CONFLICT (user_id) DO NOTHING;
+
+INSERT INTO project_stats_daily (user_id, day, created)
+SELECT user_id, create_date::date, COUNT(*)
+FROM project
+WHERE create_date::date > CURRENT_DATE - 30
+GROUP BY user_id, create_date::date
+ON CONFLICT (user_id, day) DO NOTHING;
+"""
+
+DROP_TABLES_SQL = """
+DROP TABLE IF EXISTS project_stats_daily;
+DROP TABLE IF EXISTS project_stats;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0007_project_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLES_SQL, DROP_TABLES_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+# Cover image and variant count per project on the dashboard.
+CREATE_INDEX_SQL = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ai_make_image_project_image_idx
+ON ai_make_image (project_id, image_id);
+"""
+
+DROP_INDEX_SQL = "DROP INDEX CONCURRENTLY IF EXISTS ai_make_image_project_image_idx;"
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("project_app", "0008_project_stats_tables"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX_SQL, DROP_INDEX_SQL),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+
+# Give every explicit-id column a sequence so ids follow insert order across
+# processes. Columns that already own one (serial/identity) keep it. The new
+# sequence starts past the existing rows and past any block id_counter handed out.
+CREATE_SEQUENCES_SQL = """
+DO $$
+DECLARE
+    target RECORD;
+    seq TEXT;
+    max_id BIGINT;
+    reserved BIGINT;
+    current_id BIGINT;
+BEGIN
+    FOR target IN
+        SELECT * FROM (VALUES ('project', 'project_id'), ('customize_req', 'req_id'), ('ai_make_image', 'image_id'))
+            AS t(table_name, column_name)
+    LOOP
+        IF to_regclass(target.table_name) IS NULL
+            OR pg_get_serial_sequence(target.table_name, target.column_name) IS NOT NULL THEN
+            CONTINUE;
+        END IF;
+
+        seq := target.table_name || '_' || target.column_name || '_seq';
+        EXECUTE format('CREATE SEQUENCE IF NOT EXISTS %I', seq);
+
+        -- project_id is VARCHAR; only numeric values can collide with the sequence.
+        EXECUTE format(
+            'SELECT COALESCE(MAX(CASE WHEN %1$I::text ~ ''^[0-9]+$'' THEN %1$I::text::bigint END), 0) FROM %2$I',
+            target.column_name, target.table_name
+        ) INTO max_id;
+        SELECT COALESCE(MAX(next_value) - 1, 0) INTO reserved
+        FROM id_counter WHERE name = target.table_name || '.' || target.column_name;
+        EXECUTE format('SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM %I', seq) INTO current_id;
+
+        max_id := GREATEST(max_id, reserved, current_id);
+        PERFORM setval(seq, GREATEST(max_id, 1), max_id > 0);
+    END LOOP;
+END $$;
+"""
+
+# Only the sequences this migration created; serial sequences belong to their column.
+DROP_SEQUENCES_SQL = """
+DO $$
+DECLARE
+    target RECORD;
+BEGIN
+    FOR target IN
+        SELECT * FROM (VALUES ('project', 'project_id'), ('customize_req', 'req_id'), ('ai_make_image', 'image_id'))
+            AS t(table_name, column_name)
+    LOOP
+        IF to_regclass(target.table_name) IS NULL
+            OR pg_get_serial_sequence(target.table_name, target.column_name) IS NULL THEN
+            EXECUTE format('DROP SEQUENCE IF EXISTS %I', target.table_name || '_' || target.column_name || '_seq');
+        END IF;
+    END LOOP;
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0009_ai_make_image_project_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEQUENCES_SQL, DROP_SEQUENCES_SQL),
+    ]
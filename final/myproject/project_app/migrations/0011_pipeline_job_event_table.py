@@ -0,0 +1,47 @@
+from django.db import migrations
+
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS pipeline_job_event (
+    job_id INTEGER NOT NULL REFERENCES pipeline_job (job_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    attempt INTEGER,
+    step VARCHAR(100) NOT NULL,
+    state VARCHAR(20) NOT NULL,
+    detail JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+# Events used to be appended to pipeline_job.progress; move them out of the row.
+MOVE_EVENTS_SQL = """
+INSERT INTO pipeline_job_event (job_id, seq, attempt, step, state, detail)
+SELECT job.job_id,
+       (event ->> 'seq')::integer,
+       (event ->> 'attempt')::integer,
+       event ->> 'step',
+       COALESCE(event ->> 'state', ''),
+       event - 'seq' - 'attempt' - 'step'
+FROM pipeline_job AS job, jsonb_array_elements(job.progress -> 'events') AS event
+WHERE jsonb_typeof(job.progress -> 'events') = 'array'
+ON CONFLICT (job_id, seq) DO NOTHING;
+
+UPDATE pipeline_job SET progress = progress - 'events' WHERE progress ? 'events';
+"""
+
+DROP_TABLE_SQL = """
+DROP TABLE IF EXISTS pipeline_job_event;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_app", "0010_id_sequences"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE_SQL, DROP_TABLE_SQL),
+        migrations.RunSQL(MOVE_EVENTS_SQL, migrations.RunSQL.noop),
+    ]
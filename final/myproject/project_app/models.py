@@ -116,3 +116,51 @@ class AiMakeImage(models.Model):
     def __str__(self):
         return f"AI 이미지 {self.image_id}"
 
+
+
+class PipelineJob(models.Model):
+    STATUS_CHOICES = (
+        ("queued", "대기"),
+        ("running", "실행 중"),
+        ("completed", "완료"),
+        ("failed", "실패"),
+    )
+
+    job_id = models.AutoField(primary_key=True)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        db_column="project_id",
+        related_name="pipeline_jobs",
+    )
+    req = models.ForeignKey(
+        CustomizeReq,
+        on_delete=models.CASCADE,
+        db_column="req_id",
+        related_name="pipeline_jobs",
+        blank=True,
+        null=True,
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_column="user_id", related_name="pipeline_jobs")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    payload = models.JSONField(default=dict)
+    progress = models.JSONField(default=dict)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    run_after = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "pipeline_job"
+        managed = False
+
+    def __str__(self):
+        return f"파이프라인 작업 {self.job_id} ({self.status})"
@@ -0,0 +1,77 @@
+# project_app/pagination.py
+"""Keyset (cursor) pagination.
+
+A cursor holds the sort key of the last row of the previous page, so the next
+page is a range condition on an index instead of an OFFSET that rescans every
+earlier row, and rows inserted meanwhile neither repeat nor go missing.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def page_size(value, default: Optional[int] = None) -> int:
+    """Clamp a ``limit`` query parameter to [1, PROJECT_PAGE_MAX_SIZE]."""
+    default = default or getattr(settings, "PROJECT_PAGE_SIZE", 20)
+    try:
+        size = int(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, getattr(settings, "PROJECT_PAGE_MAX_SIZE", 100)))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, queryset: QuerySet, fields: Sequence[str]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError
+        # to_python parses ISO datetimes back for DateTimeFields.
+        return [queryset.model._meta.get_field(name).to_python(value) for name, value in zip(fields, values)]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, ValidationError) as exc:
+        raise InvalidCursor("유효하지 않은 커서입니다.") from exc
+
+
+def _after(fields: Sequence[str], values: Sequence[Any]) -> Q:
+    # (a, b) < (x, y)  <=>  a < x OR (a = x AND b < y), for a descending order.
+    condition = Q()
+    for position, name in enumerate(fields):
+        equal = {field: value for field, value in zip(fields[:position], values[:position])}
+        condition |= Q(**equal, **{f"{name}__lt": values[position]})
+    return condition
+
+
+def keyset_page(
+    queryset: QuerySet, *, fields: Sequence[str], cursor: Optional[str] = None, limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``queryset`` in descending ``fields`` order, and the cursor of the next one.
+
+    ``fields`` must end with a unique column so the order is total.
+    """
+    queryset = queryset.order_by(*[f"-{name}" for name in fields])
+    if cursor:
+        queryset = queryset.filter(_after(fields, decode_cursor(cursor, queryset, fields)))
+
+    rows = list(queryset[: limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], name) for name in fields])
+    return rows, next_cursor
+
+
+__all__ = ["InvalidCursor", "decode_cursor", "encode_cursor", "keyset_page", "page_size"]
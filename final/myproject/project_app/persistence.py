@@ -0,0 +1,185 @@
+# project_app/persistence.py
+"""Result persistence: concurrent storage uploads followed by one bulk insert.
+
+Encoding and uploads run on a shared, long-lived thread pool so storage
+clients (one per thread with django-storages' S3 backend) and their HTTP
+connection pools are reused between jobs. Rows are written only after every
+original upload succeeded; if an upload or the insert fails, the objects
+already stored are deleted again.
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from interior.services.artifacts import ImageLike, as_artifact
+from interior.services.metrics import DB_INSERT, STORAGE_SAVE, WEBP_ENCODE, observe_step
+
+from .derivatives import build_derivatives, derivative_name
+from .ids import AI_MAKE_IMAGE, allocate_ids
+from .image_cache import get_image_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_upload_executor() -> ThreadPoolExecutor:
+    """프로세스 전체에서 공유하는 업로드 스레드 풀"""
+    max_workers = getattr(settings, "RESULT_UPLOAD_CONCURRENCY", 8)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="result-upload")
+
+
+@dataclass
+class PendingImage:
+    """One image to store: the WEBP original plus its derivatives."""
+
+    name: str
+    data: bytes
+    derivatives: Dict[str, bytes] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    stored_name: Optional[str] = None
+    url: Optional[str] = None
+
+
+def _encode(image: ImageLike, name: str, meta: Dict[str, Any]) -> PendingImage:
+    # Provider WEBP bytes go to storage untouched; anything else is encoded once.
+    artifact = as_artifact(image)
+    if artifact.has_encoding("WEBP"):
+        data = artifact.encoded("WEBP")
+    else:
+        with observe_step(WEBP_ENCODE):
+            data = artifact.encoded("WEBP")
+
+    derivatives = {}
+    try:
+        derivatives = {
+            derivative_name(name, width): encoded for width, encoded in build_derivatives(artifact).items()
+        }
+    except Exception as exc:
+        logger.warning("파생 이미지 생성 실패(%s): %s", name, exc)
+    artifact.release_pixels()
+    return PendingImage(name=name, data=data, derivatives=derivatives, meta=meta)
+
+
+def _upload(name: str, data: bytes) -> str:
+    with observe_step(STORAGE_SAVE):
+        return default_storage.save(name, ContentFile(data))
+
+
+def _delete_quietly(names: List[str]) -> None:
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except Exception as exc:
+            logger.warning("업로드 정리 실패(%s): %s", name, exc)
+
+
+class ResultPersister:
+    """Stores a batch of images concurrently and inserts their rows together.
+
+    Usage::
+
+        persister = ResultPersister()
+        persister.add(image, name="u_ab12cd34_result_1.webp", meta={"index": 1})
+        images = persister.upload()
+        persister.insert_rows(project_id=..., req_id=...)
+
+    :meth:`upload` and :meth:`insert_rows` delete every stored object again if
+    they fail. :meth:`persist` runs both.
+    """
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self.executor = executor or get_upload_executor()
+        self._sources: List[tuple] = []
+        self.images: List[PendingImage] = []
+        self.uploaded: List[str] = []
+
+    def add(self, image: ImageLike, *, name: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        self._sources.append((image, name, meta or {}))
+
+    def upload(self) -> List[PendingImage]:
+        encode_futures = [self.executor.submit(_encode, *source) for source in self._sources]
+        self.images = [future.result() for future in encode_futures]
+
+        originals = {self.executor.submit(_upload, image.name, image.data): image for image in self.images}
+        derivatives = {
+            self.executor.submit(_upload, name, data): name
+            for image in self.images
+            for name, data in image.derivatives.items()
+        }
+        wait(list(originals) + list(derivatives))
+
+        first_error = None
+        for future, image in originals.items():
+            if future.exception() is not None:
+                first_error = first_error or future.exception()
+                continue
+            image.stored_name = future.result()
+            self.uploaded.append(image.stored_name)
+        for future, name in derivatives.items():
+            if future.exception() is not None:
+                # The original is enough to show the image; clients fall back to it.
+                logger.warning("파생 이미지 업로드 실패(%s): %s", name, future.exception())
+            else:
+                self.uploaded.append(future.result())
+
+        if first_error is not None:
+            logger.error("결과 이미지 업로드 실패, 업로드된 %s개 파일을 정리합니다.", len(self.uploaded))
+            self.cleanup()
+            raise first_error
+
+        image_cache = get_image_cache()
+        for image in self.images:
+            image.url = default_storage.url(image.stored_name)
+            # Refinements read the result back right away; keep it local.
+            image_cache.put(image.stored_name, image.data)
+        return self.images
+
+    def insert_rows(self, *, project_id, req_id) -> List[Dict[str, Any]]:
+        """Insert one ``ai_make_image`` row per image in a single statement."""
+        if not self.images:
+            return []
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                image_ids = allocate_ids(AI_MAKE_IMAGE, len(self.images))
+                rows = []
+                for image, image_id in zip(self.images, image_ids):
+                    image.meta["image_id"] = image_id
+                    rows.append([image.meta["image_id"], project_id, req_id, image.url, "N"])
+                with observe_step(DB_INSERT):
+                    cursor.execute(
+                        "INSERT INTO ai_make_image (image_id, project_id, req_id, ai_image_path, is_selected) VALUES "
+                        + ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+                        + ";",
+                        [value for row in rows for value in row],
+                    )
+                # New results change the project's listings; see project_app.conditional.
+                cursor.execute("UPDATE project SET update_date = NOW() WHERE project_id = %s;", [project_id])
+        except Exception:
+            logger.error("결과 이미지 행 저장 실패, 업로드된 %s개 파일을 정리합니다.", len(self.uploaded))
+            self.cleanup()
+            raise
+        return [dict(image.meta, image_url=image.url) for image in self.images]
+
+    def persist(self, *, project_id, req_id) -> List[Dict[str, Any]]:
+        self.upload()
+        return self.insert_rows(project_id=project_id, req_id=req_id)
+
+    def cleanup(self) -> None:
+        uploaded, self.uploaded = self.uploaded, []
+        if uploaded:
+            _delete_quietly(uploaded)
+
+
+def result_filename(prefix, suffix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}_{suffix}.webp"
+
+
+__all__ = ["PendingImage", "ResultPersister", "get_upload_executor", "result_filename"]
@@ -0,0 +1,86 @@
+# project_app/renderers.py
+"""JSON rendering through orjson with DRF's exact output.
+
+:class:`FastJSONRenderer` produces the same bytes as DRF's ``JSONRenderer``
+with the default settings (``UNICODE_JSON``, ``COMPACT_JSON``,
+``STRICT_JSON``): datetimes in ISO 8601 with ``Z`` for UTC, objects orjson
+does not know go through DRF's ``JSONEncoder.default`` (Decimal -> float,
+timedelta, lazy strings, querysets, ...), and U+2028/U+2029 are escaped.
+
+orjson formats floats of magnitude >= 1e16 or below 1e-4 differently from
+``json`` (``1e16`` / ``0.00001`` / ``1e-9`` instead of ``1e+16`` / ``1e-05`` /
+``1e-09``). Output with a number in exponent form or starting ``0.0000``, any
+value orjson refuses (e.g. ints beyond 64 bits) and indented or non-default
+renderings fall back to DRF's renderer.
+The remaining differences are for inputs DRF cannot render either:
+non-finite floats come out as ``null`` instead of raising.
+"""
+import re
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from .events import format_sse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - DRF's renderer is used without orjson
+    orjson = None
+
+# Number tokens orjson may format differently from json.dumps: any exponent
+# (``1e16``, ``1e-9``) and ``0.0000x``. Compact output puts every number right
+# after ':', ',' or '['.
+_FLOAT_MISMATCH = re.compile(rb"[:,\[]-?(?:[0-9]+(?:\.[0-9]+)?[eE]|0\.0000)")
+
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def __init__(self):
+        super().__init__()
+        self._default = self.encoder_class().default
+
+    def _fast_path(self, accepted_media_type, renderer_context) -> bool:
+        return (
+            orjson is not None
+            and self.compact
+            and self.strict
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not self._fast_path(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same as JSONRenderer: keep the output a strict JavaScript subset.
+        return ret.replace(_LINE_SEPARATOR, b"\\u2028").replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``Accept: text/event-stream`` through DRF's content negotiation.
+
+    Streaming views return their own ``StreamingHttpResponse``; this renderer
+    only formats the responses they return before streaming starts (bad
+    input, missing rows) as a single ``error`` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return format_sse("error", data).encode(self.charset)
+
+
+__all__ = ["EventStreamRenderer", "FastJSONRenderer"]
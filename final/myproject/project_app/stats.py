@@ -0,0 +1,190 @@
+# project_app/stats.py
+"""Per-user project statistics.
+
+``project_stats`` keeps one row of counters per user and
+``project_stats_daily`` the number of projects created per day, so the stats
+endpoint reads a primary key and at most 30 bucket rows instead of counting
+the user's projects. Writers adjust the counters in the transaction that
+changes the projects; ``manage.py rebuild_project_stats`` recomputes them if
+they ever drift.
+"""
+import logging
+from typing import Dict, Optional
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import BooleanField, Count, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+RECENT_DAYS = 30
+# Statuses with their own counter; any other status only counts towards the total.
+STATUS_COLUMNS = {"progress": "in_progress", "completed": "completed"}
+# A project is recent on the database's calendar, the same days the daily buckets cover.
+RECENT_CREATED_SQL = "create_date::date > CURRENT_DATE - %s"
+
+
+def _adjust(user_id, deltas: Dict[str, int], created: bool = False) -> None:
+    """Add ``deltas`` to the user's counters; a failure is logged and left for a rebuild.
+
+    Runs in a savepoint so a failed update doesn't abort the caller's transaction.
+    """
+    columns = ["total_projects", "in_progress", "completed"]
+    values = [deltas.get(column, 0) for column in columns]
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO project_stats (user_id, total_projects, in_progress, completed, updated_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (user_id) DO UPDATE SET
+                    total_projects = project_stats.total_projects + EXCLUDED.total_projects,
+                    in_progress = project_stats.in_progress + EXCLUDED.in_progress,
+                    completed = project_stats.completed + EXCLUDED.completed,
+                    updated_at = NOW();
+                """,
+                [user_id, *values],
+            )
+            if created:
+                cursor.execute(
+                    """
+                    INSERT INTO project_stats_daily (user_id, day, created)
+                    VALUES (%s, CURRENT_DATE, 1)
+                    ON CONFLICT (user_id, day) DO UPDATE SET created = project_stats_daily.created + 1;
+                    """,
+                    [user_id],
+                )
+                cursor.execute(
+                    "DELETE FROM project_stats_daily WHERE user_id = %s AND day <= CURRENT_DATE - %s;",
+                    [user_id, RECENT_DAYS],
+                )
+    except DatabaseError as exc:
+        logger.warning("프로젝트 통계 갱신 실패(user_id=%s): %s", user_id, exc)
+
+
+def _status_delta(status: Optional[str], sign: int) -> Dict[str, int]:
+    column = STATUS_COLUMNS.get(status or "")
+    return {column: sign} if column else {}
+
+
+def record_project_created(user_id, status: str = "progress") -> None:
+    _adjust(user_id, {"total_projects": 1, **_status_delta(status, 1)}, created=True)
+
+
+def record_status_change(user_id, old_status: Optional[str], new_status: Optional[str]) -> None:
+    if old_status == new_status:
+        return
+    deltas = _status_delta(old_status, -1)
+    for column, delta in _status_delta(new_status, 1).items():
+        deltas[column] = deltas.get(column, 0) + delta
+    if deltas:
+        _adjust(user_id, deltas)
+
+
+def forget_user(user_id) -> None:
+    """Drop a deleted user's rows (their projects go with the user)."""
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("DELETE FROM project_stats_daily WHERE user_id = %s;", [user_id])
+            cursor.execute("DELETE FROM project_stats WHERE user_id = %s;", [user_id])
+    except DatabaseError as exc:
+        logger.warning("프로젝트 통계 삭제 실패(user_id=%s): %s", user_id, exc)
+
+
+def read_user_stats(user_id) -> Optional[Dict[str, int]]:
+    """The maintained counters, or None when the user has no summary row yet."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT s.total_projects, s.in_progress, s.completed,
+                       COALESCE((
+                           SELECT SUM(d.created) FROM project_stats_daily AS d
+                           WHERE d.user_id = s.user_id AND d.day > CURRENT_DATE - %s
+                       ), 0)
+                FROM project_stats AS s
+                WHERE s.user_id = %s;
+                """,
+                [RECENT_DAYS, user_id],
+            )
+            row = cursor.fetchone()
+    except DatabaseError as exc:
+        logger.warning("프로젝트 통계 조회 실패(user_id=%s): %s", user_id, exc)
+        return None
+    if row is None:
+        return None
+    total, in_progress, completed, recent = row
+    return {
+        "total_projects": total,
+        "in_progress": in_progress,
+        "completed": completed,
+        "recent_increase": int(recent),
+    }
+
+
+def aggregate_user_stats(user_id) -> Dict[str, int]:
+    """Count the user's projects directly, in one conditional-aggregate query."""
+    recent = RawSQL(RECENT_CREATED_SQL, [RECENT_DAYS], output_field=BooleanField())
+    return Project.objects.filter(user_id=user_id).aggregate(
+        total_projects=Count("pk"),
+        in_progress=Count("pk", filter=Q(status="progress")),
+        completed=Count("pk", filter=Q(status="completed")),
+        recent_increase=Count("pk", filter=Q(recent)),
+    )
+
+
+def get_user_stats(user_id) -> Dict[str, int]:
+    return read_user_stats(user_id) or aggregate_user_stats(user_id)
+
+
+def rebuild_stats(user_id=None) -> int:
+    """Recompute the summary rows from ``project``; returns the number of users written.
+
+    The tables are locked for the rebuild, so concurrent writers wait and
+    apply their change on top of the rebuilt counters.
+    """
+    user_filter = "WHERE user_id = %s" if user_id is not None else ""
+    params = [user_id] if user_id is not None else []
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE project_stats, project_stats_daily IN EXCLUSIVE MODE;")
+        cursor.execute(f"DELETE FROM project_stats_daily {user_filter};", params)
+        cursor.execute(f"DELETE FROM project_stats {user_filter};", params)
+        cursor.execute(
+            f"""
+            INSERT INTO project_stats (user_id, total_projects, in_progress, completed, updated_at)
+            SELECT user_id,
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE status = 'progress'),
+                   COUNT(*) FILTER (WHERE status = 'completed'),
+                   NOW()
+            FROM project
+            {user_filter}
+            GROUP BY user_id;
+            """,
+            params,
+        )
+        written = cursor.rowcount
+        cursor.execute(
+            f"""
+            INSERT INTO project_stats_daily (user_id, day, created)
+            SELECT user_id, create_date::date, COUNT(*)
+            FROM project
+            WHERE {RECENT_CREATED_SQL} {"AND user_id = %s" if user_id is not None else ""}
+            GROUP BY user_id, create_date::date;
+            """,
+            [RECENT_DAYS, *params],
+        )
+    return written
+
+
+__all__ = [
+    "aggregate_user_stats",
+    "forget_user",
+    "get_user_stats",
+    "read_user_stats",
+    "rebuild_stats",
+    "record_project_created",
+    "record_status_change",
+]
@@ -0,0 +1,150 @@
+# project_app/tests/base.py
+"""Test database schema and row helpers.
+
+Every model is unmanaged and ``MIGRATION_MODULES`` turns migrations off, so
+the test database starts without the tables the code queries.
+:func:`ensure_schema` creates the team tables (users, project, customize_req,
+ai_make_image) from their models and then runs this app's RunSQL migrations
+in order, once per test run.
+"""
+import importlib
+import os
+import pkgutil
+import tempfile
+from datetime import datetime
+from typing import Iterator, Optional
+
+from django.db import connection, migrations
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from project_app import migrations as app_migrations
+from project_app.image_cache import get_image_cache
+from project_app.models import AiMakeImage, CustomizeReq, Project, User
+
+TEAM_MODELS = (User, Project, CustomizeReq, AiMakeImage)
+
+_schema_ready = False
+
+
+def _migration_sql() -> Iterator[str]:
+    names = sorted(info.name for info in pkgutil.iter_modules(app_migrations.__path__))
+    for name in names:
+        module = importlib.import_module(f"{app_migrations.__name__}.{name}")
+        for operation in module.Migration.operations:
+            if not isinstance(operation, migrations.RunSQL):
+                continue
+            statements = [operation.sql] if isinstance(operation.sql, str) else operation.sql
+            yield from (statement for statement in statements if statement)
+
+
+def ensure_schema() -> None:
+    """Create the tables once; must run outside a transaction (CREATE INDEX CONCURRENTLY)."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    existing = set(connection.introspection.table_names())
+    with connection.schema_editor(atomic=False) as editor:
+        for model in TEAM_MODELS:
+            if model._meta.db_table not in existing:
+                editor.create_model(model)
+    with connection.cursor() as cursor:
+        for statement in _migration_sql():
+            cursor.execute(statement)
+    _schema_ready = True
+
+
+def truncate_tables() -> None:
+    """Empty every table ``ensure_schema`` created (TransactionTestCase does not flush unmanaged ones)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT tablename FROM pg_tables
+            WHERE schemaname = current_schema() AND tablename !~ '^(django|auth)_';
+            """
+        )
+        tables = [row[0] for row in cursor.fetchall()]
+        if tables:
+            cursor.execute("TRUNCATE {} CASCADE;".format(", ".join(connection.ops.quote_name(table) for table in tables)))
+
+
+class SchemaTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ensure_schema()
+        super().setUpClass()
+
+
+class SchemaTransactionTestCase(TransactionTestCase):
+    """For code that needs committed rows: other connections, threads, or ``NOW()`` per statement."""
+
+    @classmethod
+    def setUpClass(cls):
+        ensure_schema()
+        super().setUpClass()
+
+    def tearDown(self):
+        truncate_tables()
+        super().tearDown()
+
+
+def use_temp_media(test_case) -> str:
+    """Point ``MEDIA_ROOT`` and ``PIPELINE_CACHE_DIR`` at a fresh directory for one test."""
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    override = override_settings(
+        MEDIA_ROOT=os.path.join(directory.name, "media"),
+        PIPELINE_CACHE_DIR=os.path.join(directory.name, "cache"),
+    )
+    override.enable()
+    test_case.addCleanup(override.disable)
+    # The shared image cache captured the old cache directory.
+    get_image_cache.cache_clear()
+    test_case.addCleanup(get_image_cache.cache_clear)
+    return directory.name
+
+
+def make_user(user_id: str = "designer", *, name: str = "디자이너", permission: str = "DESIGNER") -> User:
+    return User.objects.create(user_id=user_id, password="x", name=name, user_permission_code=permission)
+
+
+def make_project(
+    user: User,
+    project_id: str,
+    *,
+    status: str = "progress",
+    create_date: Optional[datetime] = None,
+    project_image: Optional[str] = None,
+) -> Project:
+    """Insert a project row; ``create_date``/``update_date`` default to now."""
+    created = create_date or timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO project (project_id, user_id, project_name, description, status, project_image, create_date, update_date)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+            """,
+            [project_id, user.user_id, f"프로젝트 {project_id}", None, status, project_image, created, created],
+        )
+    return Project.objects.get(pk=project_id)
+
+
+def make_image(project: Project, image_id: int, *, url: Optional[str] = None, selected: str = "N") -> AiMakeImage:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO ai_make_image (image_id, project_id, req_id, ai_image_path, is_selected) VALUES (%s, %s, NULL, %s, %s);",
+            [image_id, project.project_id, url or f"/media/result_{image_id}.webp", selected],
+        )
+    return AiMakeImage.objects.get(pk=image_id)
+
+
+__all__ = [
+    "SchemaTestCase",
+    "SchemaTransactionTestCase",
+    "ensure_schema",
+    "make_image",
+    "make_project",
+    "make_user",
+    "truncate_tables",
+    "use_temp_media",
+]
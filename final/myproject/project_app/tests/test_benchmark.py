@@ -0,0 +1,78 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from interior.services.fakes import fake_photo_bytes
+from project_app.benchmark import percentile
+
+from .base import SchemaTransactionTestCase, make_image, make_project, make_user, use_temp_media
+
+FAST = ["--openai-latency", "fixed:0", "--gemini-latency", "fixed:0", "--upload-latency", "fixed:0"]
+
+
+def run_benchmark(*args):
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "report.json")
+        call_command("run_pipeline_benchmark", "--output", output, *FAST, *args, stdout=io.StringIO())
+        with open(output, encoding="utf-8") as report:
+            return json.load(report)
+
+
+class PercentileTests(SimpleTestCase):
+    def test_interpolates_between_ranks(self):
+        self.assertEqual(percentile([4, 1, 3, 2], 0.5), 2.5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.95), 4.8)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class PipelineBenchmarkCommandTests(SimpleTestCase):
+    def setUp(self):
+        use_temp_media(self)
+
+    def test_pipeline_scenario_reports_every_variant_count(self):
+        report = run_benchmark(
+            "--variants", "1-2", "--iterations", "1", "--clients", "2", "--size", "64x64", "--source-size", "160x120"
+        )
+
+        scenarios = report["scenarios"]
+        self.assertEqual([scenario["params"]["variations"] for scenario in scenarios], [1, 2])
+        self.assertEqual([scenario["succeeded"] for scenario in scenarios], [2, 2])
+        # One empty room per run, then step3 once per variant.
+        self.assertEqual(scenarios[1]["provider_calls"]["openai"]["calls"], 2)
+        self.assertEqual(scenarios[1]["provider_calls"]["gemini"]["calls"], 4)
+        self.assertEqual(report["config"]["openai"]["latency"], "fixed:0")
+
+    def test_bad_arguments_are_rejected(self):
+        for args in (["--variants", "0-2"], ["--openai-latency", "slow"], ["--source-size", "big"]):
+            with self.subTest(args=args), self.assertRaises(CommandError):
+                run_benchmark(*args)
+
+    def test_endpoint_scenarios_need_their_target(self):
+        with self.assertRaises(CommandError):
+            run_benchmark("--scenario", "create_project")
+
+
+@override_settings(MEDIA_URL="/media/")
+class RefineBenchmarkCommandTests(SchemaTransactionTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        project = make_project(make_user(), "1")
+        default_storage.save("source.jpg", ContentFile(fake_photo_bytes(64, 48)))
+        make_image(project, 900, url="/media/source.jpg")
+
+    def test_refine_scenario_stores_one_image_per_request(self):
+        report = run_benchmark(
+            "--scenario", "refine", "--project-id", "1", "--requests", "3", "--clients", "2", "--response-size", "32x32"
+        )
+
+        (scenario,) = report["scenarios"]
+        self.assertEqual((scenario["requests"], scenario["succeeded"]), (3, 3))
+        self.assertEqual(scenario["params"], {"async": False, "clients": 2, "memo": False, "requests": 3})
+        self.assertEqual(scenario["provider_calls"]["openai"]["calls"], 3)
@@ -0,0 +1,145 @@
+import threading
+from collections import Counter
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, connections
+from django.test import override_settings
+
+from interior.services.artifacts import ImageArtifact
+from interior.services.checkpoints import STAGE_EMPTY_ROOM, STAGE_NORMALIZE, variant_stage
+from interior.services.clients import override_providers
+from interior.services.fakes import FakeProviderConfig, FakeProviders, fake_image_bytes, fake_photo_bytes
+from project_app import jobs
+from project_app.checkpoints import StorageCheckpointStore, pipeline_fingerprints
+from project_app.jobs import JobProgressRecorder, enqueue_pipeline_job, process_job
+from project_app.models import AiMakeImage
+
+from .base import SchemaTestCase, SchemaTransactionTestCase, make_project, make_user, use_temp_media
+
+OPTIONS = {"size": "64x64", "style_prompt": "모던"}
+
+
+def checkpoint_rows():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT stage, storage_path, created_at FROM pipeline_checkpoint ORDER BY stage;")
+        return cursor.fetchall()
+
+
+class StorageCheckpointStoreTests(SchemaTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        self.fingerprints = pipeline_fingerprints("a" * 64, OPTIONS)
+
+    def store(self, **options):
+        fingerprints = pipeline_fingerprints("a" * 64, dict(OPTIONS, **options)) if options else self.fingerprints
+        return StorageCheckpointStore("1", fingerprints)
+
+    def test_saved_stage_loads_in_a_new_store(self):
+        self.store().save(STAGE_NORMALIZE, ImageArtifact.from_bytes(fake_image_bytes(8, 8)), {"width": 8})
+
+        checkpoint = self.store().load(STAGE_NORMALIZE)
+
+        self.assertEqual(checkpoint.image.data, fake_image_bytes(8, 8))
+        self.assertEqual(checkpoint.meta, {"width": 8})
+
+    def test_style_change_only_invalidates_variant_stages(self):
+        store = self.store()
+        store.save(STAGE_EMPTY_ROOM, ImageArtifact.from_bytes(fake_image_bytes(8, 8)))
+        store.save(variant_stage(1, "step3"), ImageArtifact.from_bytes(fake_image_bytes(8, 8)))
+
+        restyled = self.store(style_prompt="북유럽")
+        resized = self.store(size="128x128")
+
+        self.assertTrue(restyled.has(STAGE_EMPTY_ROOM))
+        self.assertFalse(restyled.has(variant_stage(1, "step3")))
+        self.assertFalse(resized.has(STAGE_EMPTY_ROOM))
+
+    def test_replacing_a_stage_deletes_its_old_image(self):
+        self.store().save(STAGE_EMPTY_ROOM, ImageArtifact.from_bytes(fake_image_bytes(8, 8)))
+        (_, old_path, _), = checkpoint_rows()
+
+        self.store(size="128x128").save(STAGE_EMPTY_ROOM, ImageArtifact.from_bytes(fake_image_bytes(16, 16)))
+
+        (_, new_path, _), = checkpoint_rows()
+        self.assertNotEqual(new_path, old_path)
+        self.assertFalse(default_storage.exists(old_path))
+
+
+@override_settings(PIPELINE_VARIANT_CONCURRENCY=2, EMPTY_ROOM_CACHE_MAX_BYTES=0)
+class ProcessJobRerunTests(SchemaTransactionTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        user = make_user()
+        make_project(user, "1")
+        source_path = default_storage.save("source.jpg", ContentFile(fake_photo_bytes(160, 120)))
+        self.job = enqueue_pipeline_job(
+            project_id="1",
+            req_id=None,
+            user_id=user.user_id,
+            payload={"source_path": source_path, "variations": 2},
+        )
+        small = FakeProviderConfig(image_size=(64, 64))
+        self.providers = FakeProviders(openai=small, gemini=small, seed=0)
+        overrides = override_providers(
+            openai_client=self.providers.openai_client,
+            generative_model=self.providers.generative_model,
+            upload_cache=self.providers.upload_cache(),
+        )
+        overrides.__enter__()
+        self.addCleanup(overrides.__exit__, None, None, None)
+
+    def run_job(self, **kwargs):
+        with mock.patch.object(jobs, "try_save_derivatives", wraps=jobs.try_save_derivatives) as save_derivatives:
+            result = process_job(self.job, **kwargs)
+        return result, save_derivatives.call_count
+
+    def test_rerun_reuses_checkpoints_and_source_derivatives(self):
+        first, first_derivative_saves = self.run_job()
+        rows = checkpoint_rows()
+        calls = self.providers.stats()
+
+        again, again_derivative_saves = self.run_job()
+
+        self.assertEqual((first_derivative_saves, again_derivative_saves), (1, 0))
+        self.assertEqual(checkpoint_rows(), rows)
+        self.assertEqual(self.providers.stats(), calls)
+        self.assertEqual(again["images"], first["images"])
+        self.assertEqual(AiMakeImage.objects.count(), 2)
+
+    def test_unreadable_input_checkpoint_is_recomputed_but_not_rewritten(self):
+        self.run_job()
+        rows = {stage: (path, created) for stage, path, created in checkpoint_rows()}
+        default_storage.delete(rows[STAGE_EMPTY_ROOM][0])
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM pipeline_checkpoint WHERE stage LIKE 'variant_%%';")
+        openai_calls = self.providers.stats()["openai"]["calls"]
+
+        self.run_job()
+
+        self.assertEqual(self.providers.stats()["openai"]["calls"], openai_calls + 1)
+        after = {stage: (path, created) for stage, path, created in checkpoint_rows()}
+        self.assertEqual(after[STAGE_EMPTY_ROOM], rows[STAGE_EMPTY_ROOM])
+        self.assertEqual(after[STAGE_NORMALIZE], rows[STAGE_NORMALIZE])
+
+    def test_each_variant_opens_one_connection_and_closes_it(self):
+        real_connect = type(connections["default"]).get_new_connection
+        opened = Counter()
+
+        def counting_connect(wrapper, params):
+            opened[threading.current_thread().name] += 1
+            return real_connect(wrapper, params)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database();")
+            (sessions_before,) = cursor.fetchone()
+
+        with mock.patch.object(type(connections["default"]), "get_new_connection", counting_connect):
+            self.run_job(progress_callback=JobProgressRecorder(self.job))
+
+        variant_threads = {name: count for name, count in opened.items() if name.startswith("design-variant")}
+        self.assertEqual(sorted(variant_threads.values()), [1, 1])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database();")
+            self.assertEqual(cursor.fetchone()[0], sessions_before)
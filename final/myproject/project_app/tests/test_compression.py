@@ -0,0 +1,129 @@
+import gzip
+import json
+import os
+from unittest import mock
+
+import brotli
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from project_app import middleware
+from project_app.middleware import CompressionMiddleware, accepted_encodings, choose_encoding
+
+from .base import SchemaTestCase, make_project, make_user
+
+BODY = json.dumps([{"project_name": "거실 리모델링", "status": "progress"}] * 100).encode()
+
+
+class EncodingNegotiationTests(SimpleTestCase):
+    def test_header_is_parsed_into_q_values(self):
+        self.assertEqual(
+            accepted_encodings("br;q=1.0, GZIP ;q=0.8, identity, *;q=0, bad;q=x"),
+            {"br": 1.0, "gzip": 0.8, "identity": 1.0, "*": 0.0, "bad": 0.0},
+        )
+
+    def test_highest_q_value_wins_and_brotli_wins_ties(self):
+        cases = {
+            "gzip, deflate, br": "br",
+            "gzip;q=1.0, br;q=0.5": "gzip",
+            "br;q=0, gzip": "gzip",
+            "*": "br",
+            "*;q=0.5, br;q=0": "gzip",
+            "gzip;q=0, *;q=0": None,
+            "identity": None,
+            "": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(choose_encoding(header), expected)
+
+    def test_gzip_only_without_brotli(self):
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(choose_encoding("br, gzip"), "gzip")
+            self.assertIsNone(choose_encoding("br"))
+
+
+@override_settings(COMPRESSION_MIN_BYTES=200)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept="br, gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=BODY, **headers):
+        response = HttpResponse(body, content_type="application/json")
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def test_compressed_bodies_decode_to_the_original(self):
+        for accept, encoding, decompress in (("br", "br", brotli.decompress), ("gzip", "gzip", gzip.decompress)):
+            with self.subTest(encoding=encoding):
+                response = self.process(self.json_response(), accept)
+
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+                self.assertEqual(int(response["Content-Length"]), len(response.content))
+                self.assertLess(len(response.content), len(BODY))
+                self.assertEqual(decompress(response.content), BODY)
+
+    def test_strong_etag_becomes_weak(self):
+        self.assertEqual(self.process(self.json_response(ETag='"abc"'))["ETag"], 'W/"abc"')
+        self.assertEqual(self.process(self.json_response(ETag='W/"abc"'))["ETag"], 'W/"abc"')
+
+    def test_identity_request_is_untouched_but_varies(self):
+        response = self.process(self.json_response(), "identity")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response.content, BODY)
+
+    def test_responses_that_must_not_be_compressed_are_untouched(self):
+        streamed = StreamingHttpResponse(iter([BODY]), content_type="text/event-stream")
+        sse = HttpResponse(BODY, content_type="text/event-stream")
+        image = HttpResponse(BODY, content_type="image/webp")
+        not_found = HttpResponse(BODY, content_type="application/json", status=404)
+        cases = {
+            "small": self.json_response(b'{"ok": true}'),
+            "streaming": streamed,
+            "event-stream": sse,
+            "image": image,
+            "non-200": not_found,
+            "no-transform": self.json_response(**{"Cache-Control": "private, no-transform"}),
+            "already encoded": self.json_response(**{"Content-Encoding": "identity"}),
+        }
+        for name, response in cases.items():
+            with self.subTest(name):
+                processed = self.process(response)
+                self.assertNotIn(processed.get("Content-Encoding"), ("br", "gzip"))
+                if not processed.streaming:
+                    self.assertIn(processed.content, (BODY, b'{"ok": true}'))
+
+    def test_incompressible_body_is_sent_as_is(self):
+        noise = os.urandom(512)
+
+        response = self.process(HttpResponse(noise, content_type="text/plain"), "br")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, noise)
+
+
+@override_settings(COMPRESSION_MIN_BYTES=0)
+class CompressedEndpointTests(SchemaTestCase):
+    def setUp(self):
+        user = make_user()
+        for index in range(1, 6):
+            make_project(user, str(index))
+
+    def test_listing_is_compressed_and_revalidates_with_the_weak_etag(self):
+        plain = self.client.get("/api/projects/designer/")
+        compressed = self.client.get("/api/projects/designer/", HTTP_ACCEPT_ENCODING="br")
+
+        self.assertEqual(compressed["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed["ETag"], "W/" + plain["ETag"])
+
+        revalidated = self.client.get(
+            "/api/projects/designer/", HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=compressed["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertFalse(revalidated.has_header("Content-Encoding"))
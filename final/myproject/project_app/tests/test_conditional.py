@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+
+from interior.services.fakes import fake_photo_bytes
+from project_app.models import AiMakeImage
+from project_app.persistence import ResultPersister
+from project_app.stats import rebuild_stats, record_status_change
+
+from .base import SchemaTestCase, make_image, make_project, make_user, use_temp_media
+
+LIST_URL = "/api/projects/designer/"
+IMAGES_URL = "/api/projects/1/ai-images/"
+STATS_URL = "/api/projects/designer/stats/"
+DASHBOARD_URL = "/api/dashboard/designer/"
+
+
+class ConditionalGetTests(SchemaTestCase):
+    def setUp(self):
+        self.project = make_project(make_user(), "1", create_date=timezone.now() - timedelta(days=1))
+        make_image(self.project, 901)
+        rebuild_stats("designer")
+
+    def etag(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def assertNotModified(self, url, etag, **params):
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        return response
+
+    def test_validators_and_cache_control_are_sent(self):
+        response = self.client.get(LIST_URL)
+
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertEqual(response["Last-Modified"], http_date(self.project.update_date.timestamp()))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_repeat_request_is_answered_by_the_validator_query_alone(self):
+        for url in (LIST_URL, IMAGES_URL, STATS_URL, DASHBOARD_URL):
+            with self.subTest(url=url):
+                etag = self.etag(url)
+                queries = 2 if url == DASHBOARD_URL else 1
+                with self.assertNumQueries(queries):
+                    response = self.assertNotModified(url, etag)
+                self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_alone_is_enough(self):
+        last_modified = self.client.get(IMAGES_URL)["Last-Modified"]
+
+        response = self.client.get(IMAGES_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_each_cursor_and_page_size_has_its_own_etag(self):
+        self.assertNotEqual(self.etag(LIST_URL), self.etag(LIST_URL, limit=5))
+
+    @override_settings(MEDIA_URL="/media/")
+    def test_new_results_change_both_listings(self):
+        use_temp_media(self)
+        listing, images = self.etag(LIST_URL), self.etag(IMAGES_URL)
+        persister = ResultPersister()
+        persister.add(fake_photo_bytes(32, 24), name="result_new.webp")
+
+        persister.persist(project_id="1", req_id=None)
+
+        self.assertNotEqual(self.etag(LIST_URL), listing)
+        self.assertNotEqual(self.etag(IMAGES_URL), images)
+
+    def test_selecting_an_image_changes_both_listings(self):
+        listing, images = self.etag(LIST_URL), self.etag(IMAGES_URL)
+
+        AiMakeImage.objects.filter(pk=901).update(is_selected="Y")
+
+        self.assertNotEqual(self.etag(LIST_URL), listing)
+        self.assertNotEqual(self.etag(IMAGES_URL), images)
+
+    def test_status_change_invalidates_projects_stats_and_dashboard(self):
+        before = {url: self.etag(url) for url in (LIST_URL, STATS_URL, DASHBOARD_URL)}
+
+        response = self.client.patch("/api/projects/1/update/", {"status": "completed"}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        for url, etag in before.items():
+            with self.subTest(url=url):
+                self.assertNotEqual(self.etag(url), etag)
+
+    def test_stats_without_a_summary_row_have_no_validators(self):
+        make_project(make_user("other"), "2")
+
+        response = self.client.get("/api/projects/other/stats/", HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertEqual(response.json()["total_projects"], 1)
+
+    def test_counter_change_without_a_project_write_invalidates_stats(self):
+        etag = self.etag(STATS_URL)
+
+        record_status_change("designer", "progress", "completed")
+
+        self.assertNotEqual(self.etag(STATS_URL), etag)
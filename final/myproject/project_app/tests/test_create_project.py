@@ -0,0 +1,50 @@
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient
+
+from interior.services.fakes import fake_photo_bytes
+from project_app.models import PipelineJob, Project
+
+from .base import SchemaTestCase, make_user, use_temp_media
+
+
+class CreateProjectTests(SchemaTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        make_user()
+
+    def _form(self, **extra):
+        form = {
+            "user_id": "designer",
+            "title": "거실",
+            "image": SimpleUploadedFile("room.jpg", fake_photo_bytes(64, 48), content_type="image/jpeg"),
+        }
+        form.update(extra)
+        return form
+
+    def assertQueued(self, response):
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        job = PipelineJob.objects.get(pk=body["job_id"])
+        self.assertEqual(job.status, "queued")
+        self.assertIsNone(job.locked_by)
+        self.assertEqual(job.project_id, str(body["project_id"]))
+        self.assertEqual(body["pipeline"], {"status": "queued", "job_id": job.job_id, "images": []})
+        self.assertTrue(Project.objects.filter(pk=body["project_id"]).exists())
+
+    def test_sync_view_enqueues_the_pipeline(self):
+        self.assertQueued(self.client.post("/api/projects/create/", self._form()))
+
+    async def test_async_view_enqueues_the_pipeline(self):
+        response = await AsyncClient().post("/api/projects/create/async/", self._form())
+
+        await sync_to_async(self.assertQueued)(response)
+
+    async def test_async_view_without_image_creates_the_project_only(self):
+        form = self._form()
+        del form["image"]
+
+        response = await AsyncClient().post("/api/projects/create/async/", form)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["pipeline"]["status"], "skipped")
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from project_app.models import CustomizeReq, Project
+from project_app.stats import rebuild_stats
+
+from .base import SchemaTestCase, make_image, make_project, make_user
+
+
+@override_settings(MEDIA_URL="/media/", PROJECT_PAGE_SIZE=2)
+class DashboardTests(SchemaTestCase):
+    def setUp(self):
+        user = make_user()
+        now = timezone.now()
+        for index in range(1, 4):
+            make_project(user, str(index), create_date=now - timedelta(minutes=10 - index), project_image=f"/media/p{index}.jpg")
+        newest = Project.objects.get(pk="3")
+        make_image(newest, 901)
+        make_image(newest, 902)
+        make_image(Project.objects.get(pk="2"), 903)
+        make_image(Project.objects.get(pk="2"), 904, selected="Y")
+        CustomizeReq.objects.create(project=newest, residence_type="아파트", design_style="모던")
+        CustomizeReq.objects.create(project=newest, residence_type="빌라", design_style="내추럴")
+
+    def test_first_page_and_stats_in_one_response(self):
+        rebuild_stats("designer")
+
+        # Two validator lookups (projects, stats), then the page, the first requests and the stats row.
+        with self.assertNumQueries(5):
+            body = self.client.get("/api/dashboard/designer/").json()
+
+        newest, second = body["projects"]["results"]
+        self.assertEqual((newest["id"], second["id"]), ("3", "2"))
+        self.assertEqual((newest["variant_count"], second["variant_count"]), (2, 2))
+        self.assertEqual(newest["cover_image"], "/media/result_901.webp")
+        self.assertEqual(second["cover_image"], "/media/result_904.webp")
+        self.assertEqual(newest["cover_image_sizes"]["thumbnail_url"], "/media/result_901__w320.webp")
+        self.assertEqual((newest["residence_type"], newest["design_style"]), ("아파트", "모던"))
+        self.assertEqual(body["stats"], {"total_projects": 3, "in_progress": 3, "completed": 0, "recent_increase": 3})
+
+    def test_project_without_images_falls_back_to_its_photo(self):
+        body = self.client.get("/api/dashboard/designer/", {"cursor": self.first_cursor()}).json()
+
+        (oldest,) = body["projects"]["results"]
+        self.assertEqual((oldest["variant_count"], oldest["cover_image"]), (0, "/media/p1.jpg"))
+        self.assertIsNone(oldest["residence_type"])
+        self.assertIsNone(body["projects"]["next_cursor"])
+
+    def test_next_cursor_continues_in_the_project_list(self):
+        listed = self.client.get("/api/projects/designer/", {"cursor": self.first_cursor()}).json()
+
+        self.assertEqual([item["id"] for item in listed["results"]], ["1"])
+
+    def test_stats_without_a_summary_row_are_counted(self):
+        body = self.client.get("/api/dashboard/designer/").json()
+
+        self.assertEqual(body["stats"]["total_projects"], 3)
+
+    def test_unknown_user_gets_an_empty_dashboard(self):
+        body = self.client.get("/api/dashboard/nobody/").json()
+
+        self.assertEqual(body["projects"], {"results": [], "next_cursor": None})
+        self.assertEqual(body["stats"]["total_projects"], 0)
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        self.assertEqual(self.client.get("/api/dashboard/designer/", {"cursor": "garbage"}).status_code, 400)
+
+    def first_cursor(self):
+        return self.client.get("/api/dashboard/designer/").json()["projects"]["next_cursor"]
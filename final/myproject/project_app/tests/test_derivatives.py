@@ -0,0 +1,70 @@
+import io
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from interior.services.fakes import fake_photo_bytes
+from project_app.derivatives import (
+    build_derivatives,
+    derivative_name,
+    derivative_url,
+    responsive_urls,
+    save_derivatives,
+    storage_name_from_url,
+)
+
+WIDTHS = {"IMAGE_THUMBNAIL_WIDTH": 40, "IMAGE_MEDIUM_WIDTH": 100, "IMAGE_FULL_WIDTH": 200}
+
+
+def size_of(data):
+    return Image.open(io.BytesIO(data)).size
+
+
+@override_settings(**WIDTHS)
+class DerivativeNamingTests(SimpleTestCase):
+    def test_urls_are_derived_from_the_original(self):
+        self.assertEqual(derivative_name("user_ab12.jpg", 40), "user_ab12__w40.webp")
+        self.assertEqual(
+            derivative_url("https://cdn.example.com/media/room.png?sig=1", 100),
+            "https://cdn.example.com/media/room__w100.webp",
+        )
+        self.assertIsNone(derivative_url(None, 40))
+
+    def test_responsive_urls_build_a_srcset(self):
+        urls = responsive_urls("/media/room.jpg")
+
+        self.assertEqual(urls["thumbnail_url"], "/media/room__w40.webp")
+        self.assertEqual(urls["medium_url"], "/media/room__w100.webp")
+        self.assertEqual(urls["srcset"], "/media/room__w40.webp 40w, /media/room__w100.webp 100w, /media/room.jpg 200w")
+        self.assertIsNone(responsive_urls(None)["srcset"])
+
+    @override_settings(MEDIA_URL="/media/")
+    def test_storage_name_from_url(self):
+        self.assertEqual(storage_name_from_url("/media/result_1.webp"), "result_1.webp")
+        self.assertIsNone(storage_name_from_url("https://elsewhere.example.com/x.webp"))
+
+
+@override_settings(**WIDTHS)
+class BuildDerivativesTests(SimpleTestCase):
+    def test_one_webp_per_width_keeping_the_aspect_ratio(self):
+        encoded = build_derivatives(fake_photo_bytes(400, 300))
+
+        self.assertEqual(sorted(encoded), [40, 100])
+        self.assertEqual(size_of(encoded[100]), (100, 75))
+        self.assertEqual(size_of(encoded[40]), (40, 30))
+        self.assertTrue(all(data[8:12] == b"WEBP" for data in encoded.values()))
+
+    def test_narrow_images_are_not_upscaled(self):
+        encoded = build_derivatives(fake_photo_bytes(60, 30))
+
+        self.assertEqual(size_of(encoded[100]), (60, 30))
+        self.assertEqual(size_of(encoded[40]), (40, 20))
+
+    def test_saved_next_to_the_original(self):
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            saved = save_derivatives("room.jpg", fake_photo_bytes(400, 300))
+
+            self.assertEqual(saved, {100: "room__w100.webp", 40: "room__w40.webp"})
+            self.assertTrue(all(default_storage.exists(name) for name in saved.values()))
@@ -0,0 +1,129 @@
+import json
+import threading
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+from project_app.events import astream_job_events, job_events_snapshot
+from project_app.jobs import JobProgressRecorder, claim_next_job, complete_job, enqueue_pipeline_job
+from project_app.models import PipelineJob
+
+from .base import SchemaTransactionTestCase, make_project, make_user
+
+
+def stored_events(job_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT seq, attempt, step, state FROM pipeline_job_event WHERE job_id = %s ORDER BY seq;", [job_id])
+        return cursor.fetchall()
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def parse_stream(chunks):
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+class JobProgressRecorderTests(SchemaTransactionTestCase):
+    def setUp(self):
+        user = make_user()
+        project = make_project(user, "1")
+        enqueue_pipeline_job(
+            project_id=project.project_id, req_id=None, user_id=user.user_id, payload={"source_path": "source.png"}
+        )
+        PipelineJob.objects.update(run_after=timezone.now() - timedelta(seconds=1))
+        self.job = claim_next_job("worker-a", 60)
+
+    def test_events_from_variant_threads_get_gapless_sequence_numbers(self):
+        recorder = JobProgressRecorder(self.job)
+
+        def report(index):
+            try:
+                for state in ("started", "completed"):
+                    recorder(f"variant_{index}.step3", state, {})
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=report, args=(index,)) for index in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = stored_events(self.job.job_id)
+        self.assertEqual([seq for seq, *_ in events], list(range(1, 9)))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.progress["last_seq"], 8)
+        self.assertNotIn("events", self.job.progress)
+        self.assertEqual(self.job.progress["steps"]["variant_3.step3"]["state"], "completed")
+        self.assertIn("duration_ms", self.job.progress["steps"]["variant_3.step3"])
+
+    def test_sequence_continues_across_attempts(self):
+        JobProgressRecorder(self.job)("empty_room", "started", {})
+        PipelineJob.objects.filter(pk=self.job.pk).update(attempts=2)
+        self.job.refresh_from_db()
+
+        JobProgressRecorder(self.job)("empty_room", "started", {})
+
+        self.assertEqual(
+            stored_events(self.job.job_id),
+            [(1, 1, "empty_room", "started"), (2, 2, "empty_room", "started")],
+        )
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.progress["attempt"], 2)
+
+    def test_events_after_losing_the_lease_are_dropped(self):
+        recorder = JobProgressRecorder(self.job)
+        recorder("empty_room", "started", {})
+        PipelineJob.objects.filter(pk=self.job.pk).update(locked_by="worker-b")
+
+        recorder("empty_room", "completed", {})
+
+        self.assertEqual(len(stored_events(self.job.job_id)), 1)
+
+    @override_settings(PIPELINE_EVENT_POLL_INTERVAL=0.01)
+    def test_stream_sends_events_then_the_result_and_resumes_after_last_id(self):
+        recorder = JobProgressRecorder(self.job)
+        recorder("empty_room", "started", {})
+        recorder("variant_1.persist", "completed", {"image_id": 7, "image_url": "/media/result_1.webp"})
+        complete_job(self.job.job_id, "worker-a", {"status": "completed", "images": []})
+
+        events = parse_stream(async_to_sync(collect)(astream_job_events(self.job.job_id)))
+
+        self.assertEqual([(name, event_id) for name, event_id, _ in events], [("step", "1"), ("variant", "2"), ("job", None)])
+        self.assertEqual(events[1][2]["image_id"], 7)
+        self.assertEqual(events[2][2]["status"], "completed")
+
+        resumed = parse_stream(async_to_sync(collect)(astream_job_events(self.job.job_id, last_seq=1)))
+        self.assertEqual([name for name, _, _ in resumed], ["variant", "job"])
+
+    def test_snapshot_sends_what_is_there_and_asks_for_a_reconnect(self):
+        JobProgressRecorder(self.job)("empty_room", "started", {})
+
+        body = job_events_snapshot(self.job.job_id)
+
+        self.assertTrue(body.startswith("retry: 3000\n\n"))
+        self.assertEqual([(name, event_id) for name, event_id, _ in parse_stream(body.split("\n\n"))], [("step", "1")])
+        self.assertEqual(parse_stream(job_events_snapshot(self.job.job_id, last_seq=1).split("\n\n")), [])
+
+    def test_sync_view_answers_at_once_while_the_job_runs(self):
+        JobProgressRecorder(self.job)("empty_room", "started", {})
+
+        response = self.client.get(f"/api/jobs/{self.job.job_id}/events/", HTTP_LAST_EVENT_ID="0")
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/event-stream; charset=utf-8")
+        self.assertEqual([name for name, _, _ in parse_stream(response.content.decode().split("\n\n"))], ["step"])
+
+        complete_job(self.job.job_id, "worker-a", {"status": "completed", "images": []})
+        response = self.client.get(f"/api/jobs/{self.job.job_id}/events/", HTTP_LAST_EVENT_ID="1")
+        self.assertEqual([name for name, _, _ in parse_stream(response.content.decode().split("\n\n"))], ["job"])
@@ -0,0 +1,93 @@
+import importlib
+import threading
+
+from django.db import connection
+
+from project_app.ids import AI_MAKE_IMAGE, PROJECT, IdAllocator
+
+from .base import SchemaTransactionTestCase, make_project, make_user
+
+id_sequences = importlib.import_module("project_app.migrations.0010_id_sequences")
+
+
+class SequenceAllocationTests(SchemaTransactionTestCase):
+    def test_ids_follow_allocation_order_across_processes(self):
+        # Two allocators stand in for two worker processes.
+        first, second = IdAllocator(*AI_MAKE_IMAGE), IdAllocator(*AI_MAKE_IMAGE)
+
+        ids = [first.next_id(), second.next_id(), first.next_id(), *second.allocate(3), first.next_id()]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(first._sequence, "ai_make_image_image_id_seq")
+
+    def test_migration_moves_the_sequence_past_existing_rows(self):
+        user = make_user()
+        make_project(user, "9000")
+        make_project(user, "legacy-key")
+
+        with connection.cursor() as cursor:
+            cursor.execute(id_sequences.CREATE_SEQUENCES_SQL)
+
+        self.assertGreater(IdAllocator(*PROJECT).next_id(), 9000)
+
+    def test_rerunning_the_migration_never_moves_the_sequence_back(self):
+        allocator = IdAllocator(*AI_MAKE_IMAGE)
+        before = allocator.next_id()
+
+        with connection.cursor() as cursor:
+            cursor.execute(id_sequences.CREATE_SEQUENCES_SQL)
+
+        self.assertGreater(allocator.next_id(), before)
+
+
+class BlockAllocationTests(SchemaTransactionTestCase):
+    """Tables without any sequence fall back to id_counter blocks."""
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE id_probe (probe_id VARCHAR(20) PRIMARY KEY);")
+            cursor.execute("INSERT INTO id_probe VALUES ('41'), ('legacy');")
+
+    def tearDown(self):
+        super().tearDown()
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS id_probe;")
+
+    def allocator(self):
+        allocator = IdAllocator("id_probe", "probe_id", block_size=5)
+        self.addCleanup(allocator._discard_connection)
+        return allocator
+
+    def test_blocks_start_after_the_numeric_maximum(self):
+        allocator = self.allocator()
+
+        self.assertIsNone(allocator._sequence_name(connection.cursor()))
+        self.assertEqual(allocator.allocate(3), [42, 43, 44])
+
+    def test_processes_get_disjoint_blocks(self):
+        first, second = self.allocator(), self.allocator()
+
+        ids = first.allocate(7) + second.allocate(7) + first.allocate(4)
+
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_reservations_reuse_one_connection(self):
+        allocator = self.allocator()
+        allocator.allocate(5)
+        conn = allocator._connection
+
+        allocator.allocate(5)
+        thread = threading.Thread(target=allocator.allocate, args=(5,))
+        thread.start()
+        thread.join()
+
+        self.assertIs(allocator._connection, conn)
+        self.assertEqual(allocator._next, allocator._end)
+
+    def test_reconnects_after_the_connection_drops(self):
+        allocator = self.allocator()
+        allocator.allocate(5)
+        allocator._connection.connection.close()
+
+        self.assertEqual(allocator.allocate(1), [47])
@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, override_settings
+
+from interior.services.cache import DiskLRUCache, MemoryLRUCache
+from interior.tests.test_metrics import sample
+from project_app import views
+from project_app.image_cache import TieredImageCache, get_image_cache
+
+from .base import use_temp_media
+
+
+class TieredImageCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.storage = FileSystemStorage(location=os.path.join(self.root, "media"))
+        self.storage.save("room.webp", ContentFile(b"stored bytes"))
+
+    def cache(self, memory=True, disk=True):
+        return TieredImageCache(
+            MemoryLRUCache(1024, name="test_memory") if memory else None,
+            DiskLRUCache(os.path.join(self.root, "disk"), 1024, name="test_disk") if disk else None,
+            storage=self.storage,
+        )
+
+    def test_storage_is_read_once_then_memory_serves(self):
+        cache = self.cache()
+
+        self.assertEqual(cache.get("room.webp"), b"stored bytes")
+        self.assertEqual(cache.get("room.webp"), b"stored bytes")
+
+        stats = cache.stats()
+        self.assertEqual(stats["storage_reads"], 1)
+        self.assertEqual(stats["memory"]["hits"], 1)
+
+    def test_disk_tier_survives_a_new_process_and_refills_memory(self):
+        self.cache().get("room.webp")
+
+        fresh = self.cache()
+        self.assertEqual(fresh.get("room.webp"), b"stored bytes")
+        self.assertEqual(fresh.get("room.webp"), b"stored bytes")
+
+        stats = fresh.stats()
+        self.assertEqual(stats["storage_reads"], 0)
+        self.assertEqual((stats["disk"]["hits"], stats["memory"]["hits"]), (1, 1))
+
+    def test_put_writes_through_so_a_fresh_result_is_never_read_back(self):
+        cache = self.cache()
+
+        cache.put("new.webp", b"just stored")
+
+        self.assertEqual(cache.get("new.webp"), b"just stored")
+        self.assertEqual(cache.storage_reads, 0)
+
+    def test_lookups_are_exported_for_the_whole_cache_and_each_tier(self):
+        names = (("image", "hit"), ("image", "miss"), ("test_memory", "hit"), ("test_disk", "miss"))
+        before = [sample("cache_lookups_total", cache=name, result=result) for name, result in names]
+        cache = self.cache()
+
+        cache.get("room.webp")
+        cache.get("room.webp")
+
+        after = [sample("cache_lookups_total", cache=name, result=result) for name, result in names]
+        self.assertEqual([now - then for now, then in zip(after, before)], [1, 1, 1, 1])
+
+    def test_without_tiers_every_read_goes_to_storage(self):
+        cache = self.cache(memory=False, disk=False)
+
+        cache.get("room.webp")
+        cache.get("room.webp")
+
+        self.assertEqual(cache.stats(), {"memory": None, "disk": None, "storage_reads": 2})
+
+    def test_missing_object_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache().get("missing.webp")
+
+
+@override_settings(MEDIA_URL="/media/", IMAGE_CACHE_MEMORY_BYTES=1024, IMAGE_CACHE_DISK_BYTES=0)
+class StoredImageReadTests(SimpleTestCase):
+    def setUp(self):
+        use_temp_media(self)
+
+    def test_refine_source_is_read_through_the_shared_cache(self):
+        cache = get_image_cache()
+        self.assertIsNone(cache.disk)
+        cache.storage.save("result_1.webp", ContentFile(b"result"))
+
+        self.assertEqual(views._read_stored_image("/media/result_1.webp"), b"result")
+        self.assertEqual(views._read_stored_image("/media/result_1.webp"), b"result")
+
+        self.assertEqual(cache.storage_reads, 1)
@@ -0,0 +1,187 @@
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import connection
+from django.utils import timezone
+
+from interior.services.design_pipeline import PipelineCancelled
+from interior.services.fakes import fake_image_bytes
+from project_app.jobs import (
+    JobHeartbeat,
+    VariantPersister,
+    claim_next_job,
+    complete_job,
+    enqueue_pipeline_job,
+    fail_job,
+    renew_lease,
+)
+from project_app.models import AiMakeImage, PipelineJob
+
+from .base import SchemaTransactionTestCase, make_project, make_user
+
+LEASE = 60
+
+
+class JobQueueTests(SchemaTransactionTestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.project = make_project(self.user, "1")
+
+    def _enqueue(self, **kwargs):
+        job = enqueue_pipeline_job(
+            project_id=self.project.project_id,
+            req_id=None,
+            user_id=self.user.user_id,
+            payload={"source_path": "source.png"},
+            **kwargs,
+        )
+        # run_after comes from Python's clock; make the job runnable for the database's NOW().
+        PipelineJob.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        return job
+
+    def _expire(self, job):
+        PipelineJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_claim_leases_the_job(self):
+        job = self._enqueue()
+
+        claimed = claim_next_job("worker-a", LEASE)
+
+        self.assertEqual(claimed.job_id, job.job_id)
+        self.assertEqual(claimed.status, "running")
+        self.assertEqual(claimed.locked_by, "worker-a")
+        self.assertEqual(claimed.attempts, 1)
+        self.assertGreater(claimed.lease_expires_at, timezone.now())
+        self.assertIsNone(claim_next_job("worker-b", LEASE))
+
+    def test_queued_job_waits_for_run_after(self):
+        job = self._enqueue()
+        PipelineJob.objects.filter(pk=job.pk).update(run_after=timezone.now() + timedelta(minutes=5))
+
+        self.assertIsNone(claim_next_job("worker-a", LEASE))
+
+    def test_two_workers_never_claim_the_same_job(self):
+        self._enqueue()
+        barrier = threading.Barrier(2)
+        claims = {}
+
+        def claim(worker_id):
+            try:
+                barrier.wait()
+                claims[worker_id] = claim_next_job(worker_id, LEASE)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=claim, args=(worker_id,)) for worker_id in ("worker-a", "worker-b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        winners = [job for job in claims.values() if job is not None]
+        self.assertEqual(len(claims), 2)
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(PipelineJob.objects.get().attempts, 1)
+
+    def test_renew_only_extends_own_lease(self):
+        job = self._enqueue()
+        claim_next_job("worker-a", LEASE)
+
+        self.assertTrue(renew_lease(job.job_id, "worker-a", LEASE))
+        self.assertFalse(renew_lease(job.job_id, "worker-b", LEASE))
+
+    def test_expired_lease_is_reclaimed_by_another_worker(self):
+        job = self._enqueue()
+        claim_next_job("worker-a", LEASE)
+        self._expire(job)
+
+        reclaimed = claim_next_job("worker-b", LEASE)
+
+        self.assertEqual(reclaimed.job_id, job.job_id)
+        self.assertEqual(reclaimed.locked_by, "worker-b")
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertFalse(renew_lease(job.job_id, "worker-a", LEASE))
+        self.assertFalse(complete_job(job.job_id, "worker-a", {"status": "completed"}))
+
+    def test_expired_lease_without_attempts_left_fails(self):
+        job = self._enqueue(max_attempts=1)
+        claim_next_job("worker-a", LEASE)
+        self._expire(job)
+
+        self.assertIsNone(claim_next_job("worker-b", LEASE))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIsNone(job.locked_by)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_complete_job(self):
+        job = self._enqueue()
+        claim_next_job("worker-a", LEASE)
+
+        self.assertTrue(complete_job(job.job_id, "worker-a", {"status": "completed", "count": 1}))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.result["count"], 1)
+        self.assertIsNone(job.locked_by)
+
+    def test_failure_requeues_with_backoff_then_fails(self):
+        job = self._enqueue(max_attempts=2)
+        claimed = claim_next_job("worker-a", LEASE)
+
+        with self.settings(PIPELINE_JOB_RETRY_DELAY_SECONDS=30):
+            self.assertEqual(fail_job(claimed, "worker-a", "오류"), "queued")
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=20))
+        self.assertIsNone(claim_next_job("worker-a", LEASE))
+
+        PipelineJob.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        claimed = claim_next_job("worker-b", LEASE)
+        self.assertEqual(fail_job(claimed, "worker-b", "오류"), "failed")
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.result, {"status": "failed", "reason": "오류"})
+
+    def test_heartbeat_notices_a_lost_lease(self):
+        job = self._enqueue()
+        claim_next_job("worker-a", LEASE)
+
+        with JobHeartbeat(job.job_id, "worker-a", 3) as heartbeat:
+            PipelineJob.objects.filter(pk=job.pk).update(locked_by="worker-b")
+            deadline = time.monotonic() + 5
+            while not heartbeat.lost and time.monotonic() < deadline:
+                time.sleep(0.1)
+
+        self.assertTrue(heartbeat.lost)
+
+    def test_heartbeat_keeps_the_lease_alive(self):
+        job = self._enqueue()
+        claim_next_job("worker-a", LEASE)
+        PipelineJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() + timedelta(seconds=2))
+
+        with JobHeartbeat(job.job_id, "worker-a", 3) as heartbeat:
+            time.sleep(1.5)
+
+        job.refresh_from_db()
+        self.assertFalse(heartbeat.lost)
+        self.assertGreater(job.lease_expires_at, timezone.now() + timedelta(seconds=1))
+
+
+class VariantPersisterTests(SchemaTransactionTestCase):
+    def setUp(self):
+        user = make_user()
+        project = make_project(user, "1")
+        self.job = enqueue_pipeline_job(
+            project_id=project.project_id, req_id=None, user_id=user.user_id, payload={"source_path": "source.png"}
+        )
+
+    def test_nothing_is_stored_after_the_lease_is_lost(self):
+        persister = VariantPersister(self.job, heartbeat=SimpleNamespace(lost=True))
+
+        with self.assertRaises(PipelineCancelled):
+            persister({"index": 1, "final_image": fake_image_bytes(8, 8)})
+
+        self.assertEqual(persister.stored, [])
+        self.assertFalse(AiMakeImage.objects.exists())
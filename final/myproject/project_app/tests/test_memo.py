@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from project_app.memo import lookup_refinement, normalize_prompt, refinement_key, remember_refinement
+
+from .base import SchemaTestCase, SchemaTransactionTestCase, make_image, make_project, make_user
+
+
+def memo_rows():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT image_id, hits FROM refinement_memo ORDER BY image_id;")
+        return cursor.fetchall()
+
+
+class RefinementKeyTests(SimpleTestCase):
+    def test_prompt_spelling_differences_share_a_key(self):
+        self.assertEqual(normalize_prompt("  Sofa　교체\n"), "sofa 교체")
+        self.assertEqual(
+            refinement_key(b"src", "Sofa  교체", "1024x1024", "gpt-image-1")["memo_key"],
+            refinement_key(b"src", "sofa 교체", "1024x1024", "gpt-image-1")["memo_key"],
+        )
+
+    def test_source_size_and_model_are_part_of_the_key(self):
+        base = refinement_key(b"src", "p", "1024x1024", "m")["memo_key"]
+
+        self.assertNotEqual(base, refinement_key(b"other", "p", "1024x1024", "m")["memo_key"])
+        self.assertNotEqual(base, refinement_key(b"src", "p", "512x512", "m")["memo_key"])
+        self.assertNotEqual(base, refinement_key(b"src", "p", "1024x1024", "m2")["memo_key"])
+
+
+class RefinementMemoTests(SchemaTestCase):
+    def setUp(self):
+        user = make_user()
+        self.project = make_project(user, "1")
+        make_project(user, "2")
+        self.image = make_image(self.project, 901)
+        self.key = refinement_key(b"src", "소파 교체", "1024x1024", "m")
+
+    def test_hit_returns_the_image_and_counts(self):
+        self.assertIsNone(lookup_refinement(self.key, "1"))
+        remember_refinement(self.key, project_id="1", image_id=901, result_path=self.image.ai_image_path)
+
+        hit = lookup_refinement(self.key, 1)
+
+        self.assertEqual(hit, {"image_id": 901, "image_url": "/media/result_901.webp", "req_id": None})
+        self.assertEqual(memo_rows(), [(901, 1)])
+
+    def test_other_projects_and_deleted_images_miss(self):
+        remember_refinement(self.key, project_id="1", image_id=901, result_path=self.image.ai_image_path)
+
+        self.assertIsNone(lookup_refinement(self.key, "2"))
+        self.image.delete()
+        self.assertIsNone(lookup_refinement(self.key, "1"))
+
+    def test_expired_entries_miss(self):
+        remember_refinement(self.key, project_id="1", image_id=901, result_path=self.image.ai_image_path)
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE refinement_memo SET expires_at = NOW() - INTERVAL '1 second';")
+
+        self.assertIsNone(lookup_refinement(self.key, "1"))
+
+    def test_remembering_again_points_at_the_new_image(self):
+        make_image(self.project, 902)
+        remember_refinement(self.key, project_id="1", image_id=901, result_path="a")
+        lookup_refinement(self.key, "1")
+
+        remember_refinement(self.key, project_id="1", image_id=902, result_path="b")
+
+        self.assertEqual(memo_rows(), [(902, 0)])
+
+
+class RefinementMemoTrimTests(SchemaTransactionTestCase):
+    """Trimming orders by ``last_used_at``, so each call needs its own ``NOW()``."""
+
+    @override_settings(REFINE_MEMO_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_dropped(self):
+        project = make_project(make_user(), "1")
+        keys = {}
+        for image_id in (901, 902):
+            make_image(project, image_id)
+            keys[image_id] = refinement_key(str(image_id).encode(), "p", "1024x1024", "m")
+            remember_refinement(keys[image_id], project_id="1", image_id=image_id, result_path="x")
+        lookup_refinement(keys[901], "1")
+
+        make_image(project, 903)
+        remember_refinement(refinement_key(b"903", "p", "1024x1024", "m"), project_id="1", image_id=903, result_path="x")
+
+        self.assertEqual([image_id for image_id, _ in memo_rows()], [901, 903])
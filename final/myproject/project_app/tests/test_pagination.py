@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from project_app.models import Project
+from project_app.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page, page_size
+
+from .base import SchemaTestCase, make_image, make_project, make_user
+
+FIELDS = ("create_date", "project_id")
+
+
+@override_settings(PROJECT_PAGE_SIZE=20, PROJECT_PAGE_MAX_SIZE=50)
+class PageSizeTests(SimpleTestCase):
+    def test_limit_is_clamped(self):
+        self.assertEqual([page_size(value) for value in (None, "", "abc", "0", "7", "500")], [20, 20, 20, 1, 7, 50])
+
+
+class KeysetPageTests(SchemaTestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.now = timezone.now().replace(microsecond=0)
+        # Three projects share one create_date; the project_id breaks the tie.
+        for project_id, minutes in (("1", 5), ("2", 3), ("3", 3), ("4", 3), ("5", 1)):
+            make_project(self.user, project_id, create_date=self.now - timedelta(minutes=minutes))
+
+    def walk(self, limit):
+        pages, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(Project.objects.all(), fields=FIELDS, cursor=cursor, limit=limit)
+            pages.append([row.project_id for row in rows])
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_row_once_across_equal_sort_keys(self):
+        self.assertEqual(self.walk(2), [["5", "4"], ["3", "2"], ["1"]])
+        self.assertEqual(self.walk(5), [["5", "4", "3", "2", "1"]])
+
+    def test_rows_inserted_between_pages_do_not_shift_the_next_page(self):
+        first, cursor = keyset_page(Project.objects.all(), fields=FIELDS, limit=2)
+        make_project(self.user, "6", create_date=self.now)
+
+        second, _ = keyset_page(Project.objects.all(), fields=FIELDS, cursor=cursor, limit=2)
+
+        self.assertEqual([row.project_id for row in second], ["3", "2"])
+
+    def test_cursor_round_trips_datetimes(self):
+        created = self.now - timedelta(minutes=3)
+
+        values = decode_cursor(encode_cursor([created, "3"]), Project.objects.all(), FIELDS)
+
+        self.assertEqual(values, [created, "3"])
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ("!!!", encode_cursor(["x"]), encode_cursor(["not a date", "1"]), encode_cursor({"a": 1})):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                keyset_page(Project.objects.all(), fields=FIELDS, cursor=cursor, limit=2)
+
+
+class ProjectListViewTests(SchemaTestCase):
+    def setUp(self):
+        user = make_user()
+        now = timezone.now()
+        for index in range(1, 4):
+            make_project(user, str(index), create_date=now - timedelta(minutes=10 - index))
+        project = Project.objects.get(pk="3")
+        make_image(project, 901)
+        make_image(project, 902, selected="Y")
+
+    def test_pages_with_cover_image_and_variant_count(self):
+        # The conditional-GET validators, the page, and the first requests.
+        with self.assertNumQueries(3):
+            first = self.client.get("/api/projects/designer/", {"limit": 2}).json()
+        second = self.client.get("/api/projects/designer/", {"limit": 2, "cursor": first["next_cursor"]}).json()
+
+        self.assertEqual([item["id"] for item in first["results"]], ["3", "2"])
+        self.assertEqual(first["results"][0]["variant_count"], 2)
+        self.assertEqual(first["results"][0]["cover_image"], "/media/result_902.webp")
+        self.assertEqual([item["id"] for item in second["results"]], ["1"])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        for cursor in ("garbage", encode_cursor(["not a date", "1"])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/projects/designer/", {"cursor": cursor})
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"error": "유효하지 않은 커서입니다."})
@@ -0,0 +1,67 @@
+import os
+from datetime import timedelta
+from unittest import mock
+
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
+from interior.services.fakes import fake_photo_bytes
+from project_app import persistence
+from project_app.models import AiMakeImage, Project
+from project_app.persistence import ResultPersister
+
+from .base import SchemaTestCase, make_project, make_user, use_temp_media
+
+
+class ResultPersisterTests(SchemaTestCase):
+    def setUp(self):
+        self.media = os.path.join(use_temp_media(self), "media")
+        self.project = make_project(make_user(), "1", create_date=timezone.now() - timedelta(days=1))
+
+    def stored_files(self):
+        return sorted(os.listdir(self.media)) if os.path.isdir(self.media) else []
+
+    def persister(self, count):
+        persister = ResultPersister()
+        for index in range(1, count + 1):
+            persister.add(fake_photo_bytes(64, 48, seed=index), name=f"result_{index}.webp", meta={"index": index})
+        return persister
+
+    def test_stores_originals_and_derivatives_then_inserts_all_rows(self):
+        payloads = self.persister(3).persist(project_id="1", req_id=None)
+
+        self.assertEqual([payload["index"] for payload in payloads], [1, 2, 3])
+        ids = [payload["image_id"] for payload in payloads]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(
+            list(AiMakeImage.objects.order_by("image_id").values_list("image_id", "ai_image_path")),
+            [(payload["image_id"], payload["image_url"]) for payload in payloads],
+        )
+        files = self.stored_files()
+        self.assertIn("result_1.webp", files)
+        self.assertIn("result_1__w320.webp", files)
+        self.assertGreater(Project.objects.get(pk="1").update_date, self.project.update_date)
+
+    def test_failed_upload_removes_the_stored_objects(self):
+        real_upload = persistence._upload
+
+        def flaky_upload(name, data):
+            if name == "result_2.webp":
+                raise OSError("storage down")
+            return real_upload(name, data)
+
+        with mock.patch.object(persistence, "_upload", flaky_upload):
+            with self.assertRaises(OSError):
+                self.persister(3).persist(project_id="1", req_id=None)
+
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(AiMakeImage.objects.exists())
+
+    def test_failed_insert_removes_the_stored_objects(self):
+        # Foreign keys are deferred; check them at the INSERT as a commit would.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE;")
+        with self.assertRaises(IntegrityError):
+            self.persister(2).persist(project_id="missing", req_id=None)
+
+        self.assertEqual(self.stored_files(), [])
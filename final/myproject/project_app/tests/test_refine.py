@@ -0,0 +1,144 @@
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import AsyncClient, override_settings
+
+from interior.services.fakes import fake_photo_bytes
+from interior.tests.test_refine_batch import AsyncEditProbe, EditProbe
+from project_app.models import AiMakeImage
+
+from .base import SchemaTestCase, make_image, make_project, make_user, use_temp_media
+
+SOURCE_ID = 900
+BATCH_URL = f"/api/projects/1/ai-images/{SOURCE_ID}/refine/batch/"
+
+
+def sse_events(response):
+    body = b"".join(response.streaming_content).decode()
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        events.append((fields.get("event"), json.loads(fields["data"])))
+    return events
+
+
+@override_settings(MEDIA_URL="/media/", REFINE_BATCH_MAX_PROMPTS=3, REFINE_BATCH_CONCURRENCY=2)
+class RefineBatchViewTests(SchemaTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        project = make_project(make_user(), "1")
+        default_storage.save("source.jpg", ContentFile(fake_photo_bytes(64, 48)))
+        make_image(project, SOURCE_ID, url="/media/source.jpg")
+
+    def post(self, prompts, client=None, **extra):
+        with mock.patch("project_app.views.get_openai_client", return_value=client or EditProbe(delay=0)):
+            return self.client.post(BATCH_URL, {"refinement_prompts": prompts}, content_type="application/json", **extra)
+
+    def test_every_result_is_stored_and_returned_in_prompt_order(self):
+        response = self.post(["소파 교체", "벽지 변경"])
+
+        self.assertEqual(response.status_code, 201)
+        images = response.json()["images"]
+        self.assertEqual([image["prompt"] for image in images], ["소파 교체", "벽지 변경"])
+        self.assertEqual(response.json()["errors"], [])
+        stored = AiMakeImage.objects.exclude(pk=SOURCE_ID)
+        self.assertEqual(sorted(stored.values_list("image_id", flat=True)), [image["image_id"] for image in images])
+        self.assertTrue(all(image["source_image_id"] == SOURCE_ID for image in images))
+
+    def test_failed_prompts_are_reported_next_to_the_stored_ones(self):
+        response = self.post(["소파 교체", "벽지 변경"], client=EditProbe(delay=0, fail_prompts={"소파 교체"}))
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual([image["prompt"] for image in body["images"]], ["벽지 변경"])
+        self.assertEqual([error["index"] for error in body["errors"]], [1])
+
+    def test_all_failed_stores_nothing(self):
+        response = self.post(["소파 교체"], client=EditProbe(delay=0, fail_prompts={"소파 교체"}))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(AiMakeImage.objects.count(), 1)
+
+    def test_prompt_list_is_validated(self):
+        for prompts in ([], ["  "], ["a", "b", "c", "d"], {"prompt": "a"}):
+            with self.subTest(prompts=prompts):
+                self.assertEqual(self.post(prompts).status_code, 400)
+
+    def test_stream_sends_one_event_per_prompt_then_done(self):
+        response = self.post(["소파 교체", "벽지 변경"], HTTP_ACCEPT="text/event-stream")
+
+        events = sse_events(response)
+
+        self.assertEqual([name for name, _ in events], ["refine", "refine", "done"])
+        self.assertEqual(sorted(data["prompt"] for _, data in events[:2]), ["벽지 변경", "소파 교체"])
+        self.assertEqual((events[2][1]["count"], events[2][1]["failed"]), (2, 0))
+        self.assertEqual(AiMakeImage.objects.count(), 3)
+
+    def test_stream_request_with_bad_input_gets_an_error_event(self):
+        response = self.post([], HTTP_ACCEPT="text/event-stream")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "text/event-stream; charset=utf-8")
+        self.assertTrue(response.content.decode().startswith("event: error\n"))
+
+    async def test_async_view_stores_the_batch(self):
+        with mock.patch("project_app.views.get_async_openai_client", return_value=AsyncEditProbe(delay=0)):
+            response = await AsyncClient().post(
+                BATCH_URL + "async/", {"refinement_prompts": ["소파 교체", "벽지 변경"]}, content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(json.loads(response.content)["images"]), 2)
+
+
+@override_settings(MEDIA_URL="/media/")
+class RefineMemoViewTests(SchemaTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        project = make_project(make_user(), "1")
+        default_storage.save("source.jpg", ContentFile(fake_photo_bytes(64, 48)))
+        make_image(project, SOURCE_ID, url="/media/source.jpg")
+        self.openai = EditProbe(delay=0)
+
+    def refine(self, prompt, path="", **data):
+        with mock.patch("project_app.views.get_openai_client", return_value=self.openai):
+            return self.client.post(
+                f"/api/projects/1/ai-images/{SOURCE_ID}/refine/{path}",
+                dict(data, refinement_prompt=prompt),
+                content_type="application/json",
+            )
+
+    def test_repeated_prompt_returns_the_memoised_image(self):
+        first = self.refine("소파 교체")
+        again = self.refine("  소파   교체 ")
+
+        self.assertEqual((first.status_code, again.status_code), (201, 200))
+        self.assertTrue(again.json()["cached"])
+        self.assertEqual(again.json()["image"]["image_id"], first.json()["image"]["image_id"])
+        self.assertEqual(len(self.openai.sent), 1)
+        self.assertEqual(AiMakeImage.objects.count(), 2)
+
+    def test_force_bypasses_the_memo(self):
+        first = self.refine("소파 교체")
+        forced = self.refine("소파 교체", force=True)
+
+        self.assertEqual(forced.status_code, 201)
+        self.assertNotEqual(forced.json()["image"]["image_id"], first.json()["image"]["image_id"])
+        self.assertEqual(len(self.openai.sent), 2)
+
+    async def test_async_view_reads_the_memo_written_by_the_sync_view(self):
+        first = await sync_to_async(self.refine)("소파 교체")
+
+        with mock.patch("project_app.views.get_async_openai_client", return_value=AsyncEditProbe(delay=0)) as client:
+            again = await AsyncClient().post(
+                f"/api/projects/1/ai-images/{SOURCE_ID}/refine/async/",
+                {"refinement_prompt": "소파 교체"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(json.loads(again.content)["image"]["image_id"], first.json()["image"]["image_id"])
+        self.assertEqual(client.return_value.sent, [])
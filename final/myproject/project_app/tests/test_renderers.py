@@ -0,0 +1,72 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from project_app import renderers
+from project_app.renderers import EventStreamRenderer, FastJSONRenderer
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+PAYLOADS = {
+    "datetimes": {
+        "utc": datetime.datetime(2024, 5, 1, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        "utc_micro": datetime.datetime(2024, 5, 1, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+        "kst": datetime.datetime(2024, 5, 1, 12, 0, tzinfo=KST),
+        "naive": datetime.datetime(2024, 5, 1, 12, 0, 0, 500000),
+        "date": datetime.date(2024, 5, 1),
+        "time": datetime.time(9, 30, 15, 250000),
+    },
+    "decimals": [Decimal("1.10"), Decimal("0"), Decimal("-12345.6789"), Decimal("1E+3")],
+    "separators": "줄 바꿈 문단 </script>",
+    "floats": [0.1, 1.5, -0.0, 1e15, 1e16, 123456789.125, 1e-4, 0.00001, 1e-9, 1.5e300, 2.5e-300],
+    "ints": [0, -1, 2**63 - 1, 2**64, -(2**70)],
+    "misc": {
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("프로젝트"),
+        "tuple": (1, "a", None, True),
+        "keys": {1: "int key", "한글": "값"},
+        "timedelta": datetime.timedelta(hours=1, seconds=3),
+        "empty": [{}, [], ""],
+    },
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data, media_type=None, context=None):
+        expected = JSONRenderer().render(data, media_type, context)
+        self.assertEqual(FastJSONRenderer().render(data, media_type, context), expected)
+
+    def test_output_matches_drf_byte_for_byte(self):
+        for name, data in PAYLOADS.items():
+            with self.subTest(name):
+                self.assertSameBytes(data)
+        self.assertSameBytes(PAYLOADS)
+
+    def test_separators_are_escaped(self):
+        rendered = FastJSONRenderer().render({"text": PAYLOADS["separators"]})
+
+        self.assertIn(b"\\u2028", rendered)
+        self.assertIn(b"\\u2029", rendered)
+
+    def test_indented_rendering_falls_back_to_drf(self):
+        self.assertSameBytes(PAYLOADS, "application/json; indent=2", {})
+        self.assertSameBytes(PAYLOADS, None, {"indent": 4})
+
+    def test_drf_renderer_is_used_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertSameBytes(PAYLOADS)
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class EventStreamRendererTests(SimpleTestCase):
+    def test_renders_one_error_event(self):
+        rendered = EventStreamRenderer().render({"error": "잘못된 요청"})
+
+        self.assertEqual(rendered.decode(), 'event: error\ndata: {"error": "잘못된 요청"}\n\n')
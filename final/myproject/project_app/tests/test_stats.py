@@ -0,0 +1,106 @@
+import io
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.db import connection
+
+from project_app.stats import (
+    RECENT_DAYS,
+    aggregate_user_stats,
+    forget_user,
+    get_user_stats,
+    read_user_stats,
+    rebuild_stats,
+    record_project_created,
+    record_status_change,
+)
+
+from .base import SchemaTestCase, make_project, make_user
+
+EMPTY = {"total_projects": 0, "in_progress": 0, "completed": 0, "recent_increase": 0}
+
+
+def database_today():
+    # Django keeps the session in UTC, so create_date::date is the UTC day.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT CURRENT_DATE;")
+        return cursor.fetchone()[0]
+
+
+def daily_rows(user_id="designer"):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT day, created FROM project_stats_daily WHERE user_id = %s ORDER BY day;", [user_id])
+        return cursor.fetchall()
+
+
+class StatsCounterTests(SchemaTestCase):
+    def setUp(self):
+        make_user()
+
+    def test_created_projects_count_per_status_and_day(self):
+        record_project_created("designer")
+        record_project_created("designer", "completed")
+        record_project_created("designer", "waiting")
+
+        self.assertEqual(
+            read_user_stats("designer"),
+            {"total_projects": 3, "in_progress": 1, "completed": 1, "recent_increase": 3},
+        )
+        self.assertEqual(daily_rows(), [(database_today(), 3)])
+
+    def test_status_changes_move_between_counters(self):
+        record_project_created("designer")
+
+        record_status_change("designer", "progress", "completed")
+        record_status_change("designer", "completed", "completed")
+
+        self.assertEqual(
+            read_user_stats("designer"),
+            {"total_projects": 1, "in_progress": 0, "completed": 1, "recent_increase": 1},
+        )
+
+    def test_without_a_summary_row_the_projects_are_counted(self):
+        make_project(make_user("other"), "1", status="completed")
+
+        self.assertIsNone(read_user_stats("other"))
+        self.assertEqual(get_user_stats("other"), dict(EMPTY, total_projects=1, completed=1, recent_increase=1))
+
+    def test_forget_user_drops_both_tables(self):
+        record_project_created("designer")
+
+        forget_user("designer")
+
+        self.assertIsNone(read_user_stats("designer"))
+        self.assertEqual(daily_rows(), [])
+
+
+class StatsRebuildTests(SchemaTestCase):
+    def setUp(self):
+        self.user = make_user()
+        today = database_today()
+
+        def at(day, hour, minute=0):
+            return datetime.combine(day, time(hour, minute), tzinfo=dt_timezone.utc)
+
+        # Day boundaries are the database's calendar days, not 24-hour windows from now.
+        make_project(self.user, "1", create_date=at(today - timedelta(days=RECENT_DAYS), 23, 59))
+        make_project(self.user, "2", create_date=at(today - timedelta(days=RECENT_DAYS - 1), 0, 1), status="completed")
+        make_project(self.user, "3", create_date=at(today, 0, 0))
+        make_project(make_user("other"), "4", create_date=at(today, 1))
+
+    def test_aggregate_and_rebuilt_counters_agree_on_recent_days(self):
+        expected = {"total_projects": 3, "in_progress": 2, "completed": 1, "recent_increase": 2}
+
+        self.assertEqual(aggregate_user_stats("designer"), expected)
+        self.assertEqual(rebuild_stats(), 2)
+        self.assertEqual(read_user_stats("designer"), expected)
+
+    def test_rebuild_repairs_drift_for_one_user_only(self):
+        rebuild_stats()
+        record_status_change("designer", "progress", "completed")
+        record_status_change("other", "progress", "completed")
+
+        call_command("rebuild_project_stats", "--user-id", "designer", stdout=io.StringIO())
+
+        self.assertEqual(read_user_stats("designer")["completed"], 1)
+        self.assertEqual(read_user_stats("other")["completed"], 1)
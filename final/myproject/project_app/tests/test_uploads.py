@@ -0,0 +1,61 @@
+import hashlib
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from interior.services.fakes import fake_image_bytes, fake_photo_bytes
+from project_app.models import PipelineJob, Project
+from project_app.uploads import HashingUploadHandler, digest_file
+
+from .base import SchemaTestCase, make_user, use_temp_media
+
+
+class HashingUploadHandlerTests(SimpleTestCase):
+    def test_digest_is_built_from_small_chunks(self):
+        data = fake_image_bytes(16, 16)
+        handler = HashingUploadHandler()
+        handler.new_file("image", "room.png", "image/png", len(data))
+
+        for start in range(0, len(data), 5):
+            self.assertEqual(handler.receive_data_chunk(data[start:start + 5], start), data[start:start + 5])
+        handler.file_complete(len(data))
+
+        digest = handler.digests["image"]
+        self.assertEqual(digest.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual((digest.size, digest.format, digest.extension), (len(data), "PNG", "png"))
+
+    def test_digest_file_matches_the_handler_and_rewinds(self):
+        data = fake_photo_bytes(32, 24)
+        upload = SimpleUploadedFile("room.bin", data)
+
+        digest = digest_file(upload)
+
+        self.assertEqual(digest.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(digest.mimetype, "image/jpeg")
+        self.assertEqual(upload.read(), data)
+
+
+class CreateProjectUploadTests(SchemaTestCase):
+    def setUp(self):
+        use_temp_media(self)
+        make_user()
+
+    def test_job_payload_carries_the_upload_digest(self):
+        data = fake_photo_bytes(64, 48)
+        # The name lies about the type; the stored file follows the magic bytes.
+        upload = SimpleUploadedFile("room.png", data, content_type="image/png")
+
+        response = self.client.post("/api/projects/create/", {"user_id": "designer", "image": upload})
+
+        job = PipelineJob.objects.get(pk=response.json()["job_id"])
+        self.assertEqual(job.payload["source"]["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(job.payload["source"]["mimetype"], "image/jpeg")
+        self.assertTrue(job.payload["source_path"].endswith(".jpg"))
+
+    def test_non_image_upload_is_rejected_before_any_row(self):
+        upload = SimpleUploadedFile("room.png", b"plain text", content_type="image/png")
+
+        response = self.client.post("/api/projects/create/", {"user_id": "designer", "image": upload})
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(Project.objects.exists())
@@ -0,0 +1,100 @@
+# project_app/uploads.py
+"""Upload handling that hashes and sniffs images while Django receives them.
+
+:class:`HashingUploadHandler` sits in front of Django's default handlers and
+sees every chunk once as it arrives, so the content hash and real image type
+are known without reading the upload again afterwards.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+from interior.services.artifacts import FORMAT_EXTENSIONS, FORMAT_MIMETYPES, sniff_format
+
+SNIFF_BYTES = 16
+
+
+@dataclass
+class UploadDigest:
+    sha256: str
+    size: int
+    format: Optional[str]
+
+    @property
+    def mimetype(self) -> Optional[str]:
+        return FORMAT_MIMETYPES.get(self.format or "")
+
+    @property
+    def extension(self) -> Optional[str]:
+        return FORMAT_EXTENSIONS.get(self.format or "")
+
+    def as_payload(self) -> Dict[str, object]:
+        return {"sha256": self.sha256, "size": self.size, "mimetype": self.mimetype}
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """Computes sha256, size and magic-byte format of each uploaded file.
+
+    Chunks are passed through unchanged to the next handler, which stores them.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests: Dict[str, UploadDigest] = {}
+        self._hash = None
+        self._head = b""
+        self._size = 0
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        if len(self._head) < SNIFF_BYTES:
+            self._head += raw_data[: SNIFF_BYTES - len(self._head)]
+        self._size += len(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = UploadDigest(
+            sha256=self._hash.hexdigest(),
+            size=self._size,
+            format=sniff_format(self._head),
+        )
+        return None
+
+
+def install_hashing_handler(request) -> Optional[HashingUploadHandler]:
+    """Put a :class:`HashingUploadHandler` first; returns None if the body was already parsed."""
+    django_request = getattr(request, "_request", request)
+    try:
+        handlers = django_request.upload_handlers
+    except AttributeError:
+        return None
+    if getattr(django_request, "_files", None) is not None:
+        return None
+    handler = HashingUploadHandler(django_request)
+    handlers.insert(0, handler)
+    return handler
+
+
+def digest_file(uploaded_file) -> UploadDigest:
+    """Fallback for uploads parsed before the handler was installed."""
+    sha256 = hashlib.sha256()
+    head = b""
+    size = 0
+    for chunk in uploaded_file.chunks():
+        sha256.update(chunk)
+        if len(head) < SNIFF_BYTES:
+            head += chunk[: SNIFF_BYTES - len(head)]
+        size += len(chunk)
+    uploaded_file.seek(0)
+    return UploadDigest(sha256=sha256.hexdigest(), size=size, format=sniff_format(head))
+
+
+__all__ = ["HashingUploadHandler", "UploadDigest", "digest_file", "install_hashing_handler"]
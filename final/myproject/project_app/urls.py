@@ -4,10 +4,21 @@ from .views import (
     register,
     login,
     create_project,
+    acreate_project,
     list_projects,
+    dashboard,
     list_project_ai_images,
     update_project_status,
     refine_project_image,
+    arefine_project_image,
+    refine_project_image_batch,
+    arefine_project_image_batch,
+    get_pipeline_job,
+    stream_pipeline_job,
+    astream_pipeline_job,
+    stream_project_pipeline,
+    astream_project_pipeline,
+    provider_status,
     ProjectStatsView,
     PendingUserListView,
     PendingUserApproveView,
@@ -24,13 +35,26 @@ urlpatterns = [
 
     # ✅ 프로젝트 관련
     path('projects/create/', create_project, name='project-create'),
+    path('projects/create/async/', acreate_project, name='project-create-async'),
     path('projects/<str:user_id>/', list_projects, name='project-list'),
     path('projects/<str:project_id>/update/', update_project_status, name='project-update'),
     path('projects/<str:project_id>/ai-images/', list_project_ai_images, name='project-ai-images'),
     path('projects/<str:project_id>/ai-images/<int:image_id>/refine/', refine_project_image, name='project-ai-image-refine'),
+    path('projects/<str:project_id>/ai-images/<int:image_id>/refine/async/', arefine_project_image, name='project-ai-image-refine-async'),
+    path('projects/<str:project_id>/ai-images/<int:image_id>/refine/batch/', refine_project_image_batch, name='project-ai-image-refine-batch'),
+    path('projects/<str:project_id>/ai-images/<int:image_id>/refine/batch/async/', arefine_project_image_batch, name='project-ai-image-refine-batch-async'),
+    path('projects/<str:project_id>/events/', stream_project_pipeline, name='project-pipeline-events'),
+    path('projects/<str:project_id>/events/async/', astream_project_pipeline, name='project-pipeline-events-async'),
+
+    # ✅ AI 파이프라인 작업
+    path('jobs/<int:job_id>/', get_pipeline_job, name='pipeline-job-detail'),
+    path('jobs/<int:job_id>/events/', stream_pipeline_job, name='pipeline-job-events'),
+    path('jobs/<int:job_id>/events/async/', astream_pipeline_job, name='pipeline-job-events-async'),
+    path('providers/status/', provider_status, name='provider-status'),
 
     # ✅ 통계
     path('projects/<str:user_id>/stats/', ProjectStatsView.as_view(), name='project-stats'),
+    path('dashboard/<str:user_id>/', dashboard, name='dashboard'),
 
     # ✅ 관리자 - 가입 승인
     path('admin/pending-users/', PendingUserListView.as_view(), name='admin-pending-users'),
@@ -1,42 +1,72 @@
 # project_app/views.py
+from django.conf import settings
 from django.db import connection, transaction, IntegrityError
-from django.http import JsonResponse
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from django.utils.decorators import method_decorator
 from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.decorators import api_view, parser_classes
+from rest_framework.decorators import api_view, parser_classes, renderer_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.exceptions import PermissionDenied
 from django.utils import timezone
-from datetime import datetime, timedelta
 import hashlib
-import io
+import json
 import logging
-import os
-import tempfile
 import uuid
+import httpx
 import requests
 
+from asgiref.sync import sync_to_async
+
 from django.core.exceptions import ImproperlyConfigured
-from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from PIL import Image
 
-from .models import User, Project, CustomizeReq, PendingUser, AiMakeImage
+from .conditional import (
+    conditional_get,
+    dashboard_validators,
+    project_images_validators,
+    projects_validators,
+    stats_validators,
+)
+from .derivatives import responsive_urls, storage_name_from_url
+from .events import astream_job_events, format_sse, job_events_snapshot
+from .image_cache import get_image_cache
+from .memo import lookup_refinement, refinement_key, remember_refinement
+from .pagination import InvalidCursor, keyset_page, page_size
+from .stats import forget_user, get_user_stats, record_project_created, record_status_change
+from .ids import CUSTOMIZE_REQ, PROJECT, next_id
+from .jobs import enqueue_pipeline_job
+from .uploads import digest_file, install_hashing_handler
+from .persistence import ResultPersister, result_filename
+from .renderers import EventStreamRenderer, FastJSONRenderer
+from .models import User, Project, CustomizeReq, PendingUser, AiMakeImage, PipelineJob
 from .serializers import ProjectSerializer, PendingUserSerializer, AdminUserSerializer
-from interior.services.clients import get_generative_model, get_openai_client
+from interior.services.artifacts import ImageArtifact
+from interior.services.clients import get_async_openai_client, get_openai_client, get_provider_guards
 from interior.services.design_pipeline import (
+    SUPPORTED_IMAGE_MIMETYPES,
+    REFINEMENT_MODEL,
     PipelineStepError,
-    run_design_pipeline,
+    aiter_refine_batch,
+    arefine_batch,
+    astep4_iterative_refinement,
+    iter_refine_batch,
+    refine_batch,
     step4_iterative_refinement,
 )
 
 logger = logging.getLogger(__name__)
 
+# step4 output size; part of the refinement memo key.
+DEFAULT_REFINE_SIZE = "1024x1024"
+
 
 # ✅ 비밀번호 해시 (단순 SHA256)
 def hash_password(password):
@@ -130,9 +160,118 @@ def login(request):
     }, status=status.HTTP_200_OK)
 
 
+def _save_upload(image_file, user_login_id, digest=None):
+    """Stream the upload to storage; the type comes from its magic bytes, not its name."""
+    digest = digest or digest_file(image_file)
+    if not digest.size:
+        raise ValueError("빈 이미지입니다.")
+    if digest.mimetype not in SUPPORTED_IMAGE_MIMETYPES:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {image_file.name}")
+    unique_name = f"{user_login_id}_{uuid.uuid4().hex[:8]}.{digest.extension}"
+    image_file.seek(0)
+    saved_path = default_storage.save(unique_name, image_file)
+    return saved_path, default_storage.url(saved_path), digest
+
+
+def _upload_digest(upload_hasher):
+    return upload_hasher.digests.get("image") if upload_hasher else None
+
+
+def _build_style_prompt(data):
+    style_parts = []
+    if data.get("design_style"):
+        style_parts.append(f"- 선호 스타일: {data.get('design_style')}")
+    if data.get("residence_type"):
+        style_parts.append(f"- 주거 형태: {data.get('residence_type')}")
+    if data.get("space_type"):
+        style_parts.append(f"- 공간 종류: {data.get('space_type')}")
+    if data.get("family_type"):
+        style_parts.append(f"- 가족 구성: {data.get('family_type')}")
+    if data.get("budget_range"):
+        style_parts.append(f"- 예산 범위: {data.get('budget_range')}")
+
+    return "\n".join(style_parts) or "현실적인 가구 배치를 적용해주세요."
+
+
+def _parse_variations(data):
+    variation_count = data.get("image_variations") or data.get("variations") or data.get("variation_count")
+    try:
+        variations = int(variation_count) if variation_count is not None else 1
+    except (TypeError, ValueError):
+        variations = 1
+    return max(1, variations)
+
+
+def _create_project_records(user, user_login_id, data, image_url, saved_path, digest=None):
+    """Insert project/customize_req rows and, when an image exists, the pipeline job."""
+    job = None
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            next_project_id = next_id(PROJECT)
+            cursor.execute(
+                """
+                INSERT INTO project (
+                    project_id, user_id, project_name, description, status, project_image, create_date, update_date
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, NOW(), NOW());
+                """,
+                [
+                    next_project_id,
+                    user.user_id,
+                    data.get("title", "새 인테리어 프로젝트"),
+                    f"{user.name}의 인테리어 요청",
+                    "progress",
+                    image_url,
+                ],
+            )
+            record_project_created(user.user_id, "progress")
+
+            next_req_id = next_id(CUSTOMIZE_REQ)
+            cursor.execute(
+                """
+                INSERT INTO customize_req (
+                    req_id, project_id, residence_type, space_type, budget_range,
+                    family_type, design_style, attachment_path
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+                """,
+                [
+                    next_req_id,
+                    next_project_id,
+                    data.get("residence_type"),
+                    data.get("space_type"),
+                    data.get("budget_range"),
+                    data.get("family_type"),
+                    data.get("design_style"),
+                    image_url,
+                ],
+            )
+
+        if saved_path:
+            job = enqueue_pipeline_job(
+                project_id=next_project_id,
+                req_id=next_req_id,
+                user_id=user.user_id,
+                payload={
+                    "source_path": saved_path,
+                    "source": digest.as_payload() if digest else None,
+                    "user_login_id": user_login_id,
+                    "style_prompt": _build_style_prompt(data),
+                    "refinement_prompt": data.get("refinement_prompt"),
+                    "variations": _parse_variations(data),
+                },
+            )
+
+    return next_project_id, next_req_id, job
+
+
+SKIPPED_PIPELINE_PAYLOAD = {"status": "skipped", "reason": "이미지가 제공되지 않았습니다.", "images": []}
+
+
 @api_view(['POST'])
 @parser_classes([MultiPartParser, FormParser])
 def create_project(request):
+    upload_hasher = install_hashing_handler(request)
     data = request.data
     user_login_id = data.get("user_id")
 
@@ -146,189 +285,214 @@ def create_project(request):
 
     image_file = request.FILES.get("image")
     image_url = None
-    image_bytes = None
-    image_ext = "jpg"
+    saved_path = None
+    digest = None
 
     if image_file:
         try:
-            image_bytes = image_file.read()
-            if not image_bytes:
-                raise ValueError("빈 이미지입니다.")
-            if "." in image_file.name:
-                image_ext = image_file.name.rsplit(".", 1)[-1].lower() or "jpg"
-            unique_name = f"{user_login_id}_{uuid.uuid4().hex[:8]}.{image_ext}"
-            saved_path = default_storage.save(unique_name, ContentFile(image_bytes))
-            image_url = default_storage.url(saved_path)
+            saved_path, image_url, digest = _save_upload(image_file, user_login_id, _upload_digest(upload_hasher))
         except Exception as exc:
             logger.error("원본 이미지 저장 실패: %s", exc)
             return Response({"error": "이미지 업로드에 실패했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT COALESCE(MAX(project_id), 0) + 1 FROM project;")
-        next_project_id = cursor.fetchone()[0]
+    next_project_id, _, job = _create_project_records(
+        user, user_login_id, data, image_url, saved_path, digest=digest
+    )
 
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO project (
-                project_id, user_id, project_name, description, status, project_image, create_date, update_date
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, NOW(), NOW());
-            """,
-            [
-                next_project_id,
-                user.user_id,
-                data.get("title", "새 인테리어 프로젝트"),
-                f"{user.name}의 인테리어 요청",
-                "progress",
-                image_url,
-            ],
+    if job is None:
+        return Response(
+            {
+                "message": "프로젝트가 성공적으로 생성되었습니다.",
+                "project_id": next_project_id,
+                "pipeline": SKIPPED_PIPELINE_PAYLOAD,
+            },
+            status=status.HTTP_201_CREATED,
         )
 
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT COALESCE(MAX(req_id), 0) + 1 FROM customize_req;")
-        next_req_id = cursor.fetchone()[0]
-        cursor.execute(
-            """
-            INSERT INTO customize_req (
-                req_id, project_id, residence_type, space_type, budget_range,
-                family_type, design_style, attachment_path
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
-            """,
-            [
-                next_req_id,
-                next_project_id,
-                data.get("residence_type"),
-                data.get("space_type"),
-                data.get("budget_range"),
-                data.get("family_type"),
-                data.get("design_style"),
-                image_url,
-            ],
-        )
+    return Response(
+        {
+            "message": "프로젝트가 생성되었고 AI 이미지 생성이 대기열에 등록되었습니다.",
+            "project_id": next_project_id,
+            "job_id": job.job_id,
+            "pipeline": {"status": "queued", "job_id": job.job_id, "images": []},
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
 
-    style_parts = []
-    if data.get("design_style"):
-        style_parts.append(f"- 선호 스타일: {data.get('design_style')}")
-    if data.get("residence_type"):
-        style_parts.append(f"- 주거 형태: {data.get('residence_type')}")
-    if data.get("space_type"):
-        style_parts.append(f"- 공간 종류: {data.get('space_type')}")
-    if data.get("family_type"):
-        style_parts.append(f"- 가족 구성: {data.get('family_type')}")
-    if data.get("budget_range"):
-        style_parts.append(f"- 예산 범위: {data.get('budget_range')}")
 
-    style_prompt = "\n".join(style_parts) or "현실적인 가구 배치를 적용해주세요."
-    refinement_prompt = data.get("refinement_prompt")
+# ✅ 파이프라인 작업 상태 조회
+@api_view(["GET"])
+def get_pipeline_job(request, job_id):
+    try:
+        job = PipelineJob.objects.get(pk=job_id)
+    except PipelineJob.DoesNotExist:
+        return Response({"error": "작업을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+    payload = {
+        "job_id": job.job_id,
+        "project_id": job.project_id,
+        "req_id": job.req_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "progress": job.progress,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "pipeline": job.result or {"status": job.status, "images": []},
+    }
+
+    if job.status == "completed":
+        images = AiMakeImage.objects.filter(project_id=job.project_id, req_id=job.req_id).order_by("image_id")
+        payload["images"] = [
+            {
+                "image_id": image.image_id,
+                "project_id": image.project_id,
+                "req_id": image.req_id,
+                "image_url": image.ai_image_path,
+                **responsive_urls(image.ai_image_path),
+                "is_selected": (image.is_selected or "").upper() == "Y",
+            }
+            for image in images
+        ]
 
-    pipeline_payload = {"status": "skipped", "reason": "이미지가 제공되지 않았습니다.", "images": []}
-    temp_source_path = None
+    return Response(payload, status=status.HTTP_200_OK)
 
-    if image_bytes:
-        try:
-            with tempfile.NamedTemporaryFile(suffix=f".{image_ext}", delete=False) as temp_file:
-                temp_file.write(image_bytes)
-                temp_source_path = temp_file.name
-
-            try:
-                openai_client = get_openai_client()
-                gemini_model = get_generative_model()
-            except ImproperlyConfigured as exc:
-                raise PipelineStepError(str(exc)) from exc
-
-            variation_count = data.get("image_variations") or data.get("variations") or data.get("variation_count")
-            try:
-                variations = int(variation_count) if variation_count is not None else 1
-            except (TypeError, ValueError):
-                variations = 1
-
-            pipeline_images = run_design_pipeline(
-                temp_source_path,
-                openai_client=openai_client,
-                generative_model=gemini_model,
-                style_prompt=style_prompt,
-                refinement_prompt=refinement_prompt,
-                furniture_paths=None,
-                variations=variations,
-            )
 
-            variant_payloads = []
-            pipeline_errors = pipeline_images.get("errors") or []
-
-            variants = pipeline_images.get("variants", [])
-            if not variants:
-                raise PipelineStepError("AI 파이프라인이 어떤 이미지도 생성하지 못했습니다.")
-
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT COALESCE(MAX(image_id), 0) + 1 FROM ai_make_image;")
-                next_image_id = cursor.fetchone()[0]
-
-                for offset, variant in enumerate(variants):
-                    final_image = variant.get("final_image")
-                    if not final_image:
-                        continue
-
-                    buffer = io.BytesIO()
-                    final_image.save(buffer, format="WEBP")
-                    buffer.seek(0)
-
-                    result_filename = f"{user_login_id}_{uuid.uuid4().hex[:8]}_result_{offset + 1}.webp"
-                    result_storage_path = default_storage.save(result_filename, ContentFile(buffer.getvalue()))
-                    result_url = default_storage.url(result_storage_path)
-
-                    cursor.execute(
-                        """
-                        INSERT INTO ai_make_image (image_id, project_id, req_id, ai_image_path, is_selected)
-                        VALUES (%s, %s, %s, %s, %s);
-                        """,
-                        [next_image_id + offset, next_project_id, next_req_id, result_url, "N"],
-                    )
-
-                    variant_payloads.append(
-                        {
-                            "index": variant.get("index", offset + 1),
-                            "image_url": result_url,
-                        }
-                    )
-
-            payload_status = "completed"
-            if pipeline_errors:
-                payload_status = "partial"
-
-            pipeline_payload = {
-                "status": payload_status,
-                "count": len(variant_payloads),
-                "images": variant_payloads,
-                "preview_url": variant_payloads[0]["image_url"] if variant_payloads else None,
-            }
+# ✅ 외부 AI 제공자 상태 (호출 한도 / 회로 차단기 모니터링)
+@api_view(["GET"])
+def provider_status(request):
+    providers = get_provider_guards().snapshot()
+    degraded = any(entry["state"] != "closed" for entry in providers.values())
+    return Response(
+        {"status": "degraded" if degraded else "ok", "providers": providers},
+        status=status.HTTP_200_OK,
+    )
 
-            if pipeline_errors:
-                pipeline_payload["warnings"] = pipeline_errors
-        except PipelineStepError as exc:
-            logger.error("파이프라인 단계 오류: %s", exc)
-            pipeline_payload = {"status": "failed", "reason": str(exc)}
-        except Exception as exc:
-            logger.exception("파이프라인 실행 중 알 수 없는 오류가 발생했습니다.")
-            pipeline_payload = {
-                "status": "failed",
-                "reason": f"파이프라인 실행 중 오류가 발생했습니다: {exc}",
-            }
-        finally:
-            if temp_source_path and os.path.exists(temp_source_path):
-                try:
-                    os.remove(temp_source_path)
-                except OSError:
-                    logger.warning("임시 파일 삭제 실패: %s", temp_source_path)
 
-    return Response(
-        {
-            "message": "프로젝트가 성공적으로 생성되었습니다.",
-            "project_id": next_project_id,
-            "pipeline": pipeline_payload,
+# ✅ 파이프라인 진행 상황 스트림 (SSE): 단계 시작/완료와 저장된 변형 이미지를 즉시 전달
+# 연결을 유지하는 스트림은 async 뷰(ASGI 서버 필요)만 제공한다. 동기 뷰는 현재까지의 이벤트만 보내고
+# retry 후 Last-Event-ID로 재연결하게 하여 WSGI 워커를 작업 시간 동안 붙잡지 않는다.
+def _last_event_id(request):
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id") or 0
+    try:
+        return max(0, int(raw))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _event_stream_response(stream):
+    response = StreamingHttpResponse(stream, content_type="text/event-stream; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _event_snapshot_response(job_id, request):
+    # One batch per request: the EventSource reconnects after ``retry:`` with Last-Event-ID.
+    response = HttpResponse(
+        job_events_snapshot(job_id, last_seq=_last_event_id(request)), content_type="text/event-stream; charset=utf-8"
+    )
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _job_exists(job_id):
+    return PipelineJob.objects.filter(pk=job_id).exists()
+
+
+def _latest_job_id(project_id):
+    return (
+        PipelineJob.objects.filter(project_id=project_id)
+        .order_by("-job_id")
+        .values_list("job_id", flat=True)
+        .first()
+    )
+
+
+@require_GET
+def stream_pipeline_job(request, job_id):
+    if not _job_exists(job_id):
+        return _json_response({"error": "작업을 찾을 수 없습니다."}, 404)
+    return _event_snapshot_response(job_id, request)
+
+
+@require_GET
+def stream_project_pipeline(request, project_id):
+    job_id = _latest_job_id(project_id)
+    if job_id is None:
+        return _json_response({"error": "프로젝트의 파이프라인 작업이 없습니다."}, 404)
+    return _event_snapshot_response(job_id, request)
+
+
+@require_GET
+async def astream_pipeline_job(request, job_id):
+    if not await sync_to_async(_job_exists)(job_id):
+        return _json_response({"error": "작업을 찾을 수 없습니다."}, 404)
+    return _event_stream_response(astream_job_events(job_id, last_seq=_last_event_id(request)))
+
+
+@require_GET
+async def astream_project_pipeline(request, project_id):
+    job_id = await sync_to_async(_latest_job_id)(project_id)
+    if job_id is None:
+        return _json_response({"error": "프로젝트의 파이프라인 작업이 없습니다."}, 404)
+    return _event_stream_response(astream_job_events(job_id, last_seq=_last_event_id(request)))
+
+
+def _store_refined_image(refined_image, project_id, req_id):
+    persister = ResultPersister()
+    persister.add(refined_image, name=result_filename(project_id, "refined"))
+    (stored,) = persister.persist(project_id=project_id, req_id=req_id)
+    return stored["image_id"], stored["image_url"]
+
+
+def _read_stored_image(image_url):
+    """Bytes of one of our stored images via the image cache; other URLs are fetched over HTTP."""
+    storage_name = storage_name_from_url(image_url)
+    if storage_name:
+        return get_image_cache().get(storage_name)
+    download_resp = requests.get(image_url, timeout=30)
+    download_resp.raise_for_status()
+    return download_resp.content
+
+
+async def _aread_stored_image(image_url):
+    storage_name = storage_name_from_url(image_url)
+    if storage_name:
+        return await sync_to_async(get_image_cache().get)(storage_name)
+    async with httpx.AsyncClient(timeout=30) as client:
+        download_resp = await client.get(image_url)
+        download_resp.raise_for_status()
+    return download_resp.content
+
+
+def _refined_payload(project_id, image_id, req_id, next_image_id, image_url, cached=False):
+    return {
+        "message": "이전에 생성한 부분 수정 이미지를 반환합니다." if cached else "부분 수정 이미지가 생성되었습니다.",
+        "cached": cached,
+        "image": {
+            "image_id": next_image_id,
+            "project_id": project_id,
+            "req_id": req_id,
+            "image_url": image_url,
+            "source_image_id": image_id,
         },
-        status=status.HTTP_201_CREATED,
+    }
+
+
+def _force_refresh(request, data):
+    raw = request.GET.get("force") or data.get("force")
+    return str(raw).lower() in ("1", "true", "yes")
+
+
+def _remember_refined_image(memo_key, project_id, next_image_id, image_url):
+    remember_refinement(
+        memo_key,
+        project_id=project_id,
+        image_id=next_image_id,
+        result_path=storage_name_from_url(image_url) or image_url,
     )
 
 
@@ -347,14 +511,24 @@ def refine_project_image(request, project_id, image_id):
         return Response({"error": "AI 이미지 경로가 비어 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        download_resp = requests.get(target_image.ai_image_path, timeout=30)
-        download_resp.raise_for_status()
+        source_bytes = _read_stored_image(target_image.ai_image_path)
     except Exception as exc:
         logger.error("AI 이미지 다운로드 실패(image_id=%s): %s", image_id, exc)
         return Response({"error": "기존 이미지를 다운로드하지 못했습니다."}, status=status.HTTP_502_BAD_GATEWAY)
 
+    memo_key = refinement_key(source_bytes, refinement_prompt, DEFAULT_REFINE_SIZE, REFINEMENT_MODEL)
+    if not _force_refresh(request, request.data):
+        memoised = lookup_refinement(memo_key, project_id)
+        if memoised:
+            return Response(
+                _refined_payload(
+                    project_id, image_id, memoised["req_id"], memoised["image_id"], memoised["image_url"], cached=True
+                ),
+                status=status.HTTP_200_OK,
+            )
+
     try:
-        base_image = Image.open(io.BytesIO(download_resp.content))
+        base_image = ImageArtifact.from_bytes(source_bytes)
     except Exception as exc:
         logger.error("AI 이미지 로딩 실패(image_id=%s): %s", image_id, exc)
         return Response({"error": "기존 이미지를 읽을 수 없습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -377,74 +551,475 @@ def refine_project_image(request, project_id, image_id):
         logger.exception("부분 수정 중 예기치 못한 오류(image_id=%s)", image_id)
         return Response({"error": "부분 수정 중 알 수 없는 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    buffer = io.BytesIO()
-    refined_image.save(buffer, format="WEBP")
-    buffer.seek(0)
+    next_image_id, image_url = _store_refined_image(refined_image, project_id, target_image.req_id)
+    _remember_refined_image(memo_key, project_id, next_image_id, image_url)
+
+    return Response(
+        _refined_payload(project_id, image_id, target_image.req_id, next_image_id, image_url),
+        status=status.HTTP_201_CREATED,
+    )
+
 
-    result_filename = f"{project_id}_{uuid.uuid4().hex[:8]}_refined.webp"
-    storage_path = default_storage.save(result_filename, ContentFile(buffer.getvalue()))
-    image_url = default_storage.url(storage_path)
+# ✅ 비동기(ASGI) 버전: 동기 버전과 같이 작업을 대기열에 등록하고 이벤트 루프를 막지 않는다.
+def _json_response(payload, status_code):
+    return JsonResponse(
+        payload,
+        status=status_code,
+        safe=False,
+        json_dumps_params={"ensure_ascii": False},
+    )
 
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT COALESCE(MAX(image_id), 0) + 1 FROM ai_make_image;")
-        next_image_id = cursor.fetchone()[0]
-        cursor.execute(
-            """
-            INSERT INTO ai_make_image (image_id, project_id, req_id, ai_image_path, is_selected)
-            VALUES (%s, %s, %s, %s, %s);
-            """,
-            [next_image_id, project_id, target_image.req_id, image_url, "N"],
+
+def _request_data(request):
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+    return request.POST
+
+
+@csrf_exempt
+@require_POST
+async def acreate_project(request):
+    upload_hasher = install_hashing_handler(request)
+    data = request.POST
+    user_login_id = data.get("user_id")
+
+    if not user_login_id:
+        return _json_response({"error": "user_id는 필수입니다."}, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        user = await User.objects.aget(user_id=user_login_id)
+    except User.DoesNotExist:
+        return _json_response({"error": "유효하지 않은 사용자입니다."}, status.HTTP_400_BAD_REQUEST)
+
+    image_file = request.FILES.get("image")
+    image_url = None
+    saved_path = None
+    digest = None
+
+    if image_file:
+        try:
+            saved_path, image_url, digest = await sync_to_async(_save_upload)(
+                image_file, user_login_id, _upload_digest(upload_hasher)
+            )
+        except Exception as exc:
+            logger.error("원본 이미지 저장 실패: %s", exc)
+            return _json_response({"error": "이미지 업로드에 실패했습니다."}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    next_project_id, _, job = await sync_to_async(_create_project_records)(
+        user, user_login_id, data, image_url, saved_path, digest=digest
+    )
+
+    if job is None:
+        return _json_response(
+            {
+                "message": "프로젝트가 성공적으로 생성되었습니다.",
+                "project_id": next_project_id,
+                "pipeline": SKIPPED_PIPELINE_PAYLOAD,
+            },
+            status.HTTP_201_CREATED,
         )
 
-    return Response(
+    return _json_response(
         {
-            "message": "부분 수정 이미지가 생성되었습니다.",
-            "image": {
-                "image_id": next_image_id,
-                "project_id": project_id,
-                "req_id": target_image.req_id,
-                "image_url": image_url,
-                "source_image_id": image_id,
-            },
+            "message": "프로젝트가 생성되었고 AI 이미지 생성이 대기열에 등록되었습니다.",
+            "project_id": next_project_id,
+            "job_id": job.job_id,
+            "pipeline": {"status": "queued", "job_id": job.job_id, "images": []},
         },
-        status=status.HTTP_201_CREATED,
+        status.HTTP_202_ACCEPTED,
     )
 
 
+@csrf_exempt
+@require_POST
+async def arefine_project_image(request, project_id, image_id):
+    data = _request_data(request)
+    refinement_prompt = data.get("refinement_prompt")
+    if not refinement_prompt:
+        return _json_response({"error": "refinement_prompt 값이 필요합니다."}, status.HTTP_400_BAD_REQUEST)
 
-# ✅ 프로젝트 목록 조회 (유저별)
-@api_view(["GET"])
-def list_projects(request, user_id):
+    try:
+        target_image = await AiMakeImage.objects.aget(project_id=project_id, image_id=image_id)
+    except AiMakeImage.DoesNotExist:
+        return _json_response({"error": "AI 이미지를 찾을 수 없습니다."}, status.HTTP_404_NOT_FOUND)
+
+    if not target_image.ai_image_path:
+        return _json_response({"error": "AI 이미지 경로가 비어 있습니다."}, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        source_bytes = await _aread_stored_image(target_image.ai_image_path)
+    except Exception as exc:
+        logger.error("AI 이미지 다운로드 실패(image_id=%s): %s", image_id, exc)
+        return _json_response({"error": "기존 이미지를 다운로드하지 못했습니다."}, status.HTTP_502_BAD_GATEWAY)
+
+    memo_key = refinement_key(source_bytes, refinement_prompt, DEFAULT_REFINE_SIZE, REFINEMENT_MODEL)
+    if not _force_refresh(request, data):
+        memoised = await sync_to_async(lookup_refinement)(memo_key, project_id)
+        if memoised:
+            return _json_response(
+                _refined_payload(
+                    project_id, image_id, memoised["req_id"], memoised["image_id"], memoised["image_url"], cached=True
+                ),
+                status.HTTP_200_OK,
+            )
+
+    try:
+        base_image = ImageArtifact.from_bytes(source_bytes)
+    except Exception as exc:
+        logger.error("AI 이미지 로딩 실패(image_id=%s): %s", image_id, exc)
+        return _json_response({"error": "기존 이미지를 읽을 수 없습니다."}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    try:
+        openai_client = get_async_openai_client()
+    except ImproperlyConfigured as exc:
+        return _json_response({"error": str(exc)}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    try:
+        refined_image = await astep4_iterative_refinement(
+            base_image,
+            refinement_prompt,
+            openai_client,
+        )
+    except PipelineStepError as exc:
+        logger.error("부분 수정 실패(image_id=%s): %s", image_id, exc)
+        return _json_response({"error": str(exc)}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+    except Exception:  # pragma: no cover - defensive
+        logger.exception("부분 수정 중 예기치 못한 오류(image_id=%s)", image_id)
+        return _json_response({"error": "부분 수정 중 알 수 없는 오류가 발생했습니다."}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    next_image_id, image_url = await sync_to_async(_store_refined_image)(
+        refined_image, project_id, target_image.req_id
+    )
+    await sync_to_async(_remember_refined_image)(memo_key, project_id, next_image_id, image_url)
+
+    return _json_response(
+        _refined_payload(project_id, image_id, target_image.req_id, next_image_id, image_url),
+        status.HTTP_201_CREATED,
+    )
+
+
+
+# ✅ 일괄 부분 수정: 같은 이미지에 여러 프롬프트를 동시에 적용 (원본은 한 번만 읽고 인코딩)
+def _refinement_prompts(data):
+    prompts = data.get("refinement_prompts")
+    if hasattr(data, "getlist") and len(data.getlist("refinement_prompts")) > 1:
+        prompts = data.getlist("refinement_prompts")
+    elif isinstance(prompts, str):
+        try:
+            prompts = json.loads(prompts)
+        except ValueError:
+            prompts = [prompts]
+    if not isinstance(prompts, list):
+        return None
+    prompts = [str(prompt).strip() for prompt in prompts if str(prompt).strip()]
+    max_prompts = getattr(settings, "REFINE_BATCH_MAX_PROMPTS", 8)
+    if not prompts or len(prompts) > max_prompts:
+        return None
+    return prompts
+
+
+def _wants_stream(request, data):
+    raw = request.GET.get("stream") or data.get("stream")
+    return str(raw).lower() in ("1", "true", "yes") or "text/event-stream" in request.headers.get("Accept", "")
+
+
+def _refined_item(project_id, image_id, req_id, stored):
+    return {
+        "index": stored["index"],
+        "prompt": stored["prompt"],
+        "image_id": stored["image_id"],
+        "project_id": project_id,
+        "req_id": req_id,
+        "image_url": stored["image_url"],
+        "source_image_id": image_id,
+    }
+
+
+def _refine_error(outcome):
+    return {"index": outcome["index"], "prompt": outcome["prompt"], "error": outcome["error"]}
+
+
+def _store_refined_batch(outcomes, project_id, image_id, req_id):
+    """Store every successful outcome and insert all rows in one transaction."""
+    persister = ResultPersister()
+    errors = []
+    for outcome in outcomes:
+        if outcome["image"] is None:
+            errors.append(_refine_error(outcome))
+            continue
+        persister.add(
+            outcome["image"],
+            name=result_filename(project_id, f"refined_{outcome['index']}"),
+            meta={"index": outcome["index"], "prompt": outcome["prompt"]},
+        )
+    stored = persister.persist(project_id=project_id, req_id=req_id)
+    return [_refined_item(project_id, image_id, req_id, item) for item in stored], errors
+
+
+def _refined_batch_payload(image_id, images, errors):
+    return {
+        "message": f"부분 수정 이미지 {len(images)}개가 생성되었습니다.",
+        "source_image_id": image_id,
+        "images": images,
+        "errors": errors,
+    }
+
+
+def _refine_event(project_id, image_id, req_id, outcome):
+    """Store one streamed outcome on its own and return its SSE chunk and payload."""
+    if outcome["image"] is not None:
+        try:
+            images, _ = _store_refined_batch([outcome], project_id, image_id, req_id)
+        except Exception as exc:
+            logger.exception("일괄 부분 수정 결과 저장 실패(image_id=%s)", image_id)
+            outcome = dict(outcome, image=None, error=str(exc))
+        else:
+            return format_sse("refine", dict(images[0], error=None)), images[0]
+    return format_sse("refine", _refine_error(outcome)), None
+
+
+def _refine_done_event(image_id, images, total):
+    return format_sse(
+        "done", {"source_image_id": image_id, "count": len(images), "failed": total - len(images), "images": images}
+    )
+
+
+def _stream_refined_batch(outcomes, project_id, image_id, req_id, total):
+    """SSE chunks: one ``refine`` event per prompt as it finishes (stored right away), then ``done``."""
+    images = []
+    for outcome in outcomes:
+        chunk, item = _refine_event(project_id, image_id, req_id, outcome)
+        if item:
+            images.append(item)
+        yield chunk
+    yield _refine_done_event(image_id, images, total)
+
+
+async def _astream_refined_batch(outcomes, project_id, image_id, req_id, total):
+    images = []
+    async for outcome in outcomes:
+        chunk, item = await sync_to_async(_refine_event)(project_id, image_id, req_id, outcome)
+        if item:
+            images.append(item)
+        yield chunk
+    yield _refine_done_event(image_id, images, total)
+
+
+@api_view(["POST"])
+@renderer_classes([FastJSONRenderer, EventStreamRenderer])
+def refine_project_image_batch(request, project_id, image_id):
+    prompts = _refinement_prompts(request.data)
+    if prompts is None:
+        return Response(
+            {"error": f"refinement_prompts는 1~{getattr(settings, 'REFINE_BATCH_MAX_PROMPTS', 8)}개의 프롬프트 목록이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        target_image = AiMakeImage.objects.get(project_id=project_id, image_id=image_id)
+    except AiMakeImage.DoesNotExist:
+        return Response({"error": "AI 이미지를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+    if not target_image.ai_image_path:
+        return Response({"error": "AI 이미지 경로가 비어 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        source_bytes = _read_stored_image(target_image.ai_image_path)
+        base_image = ImageArtifact.from_bytes(source_bytes)
+    except Exception as exc:
+        logger.error("AI 이미지 다운로드 실패(image_id=%s): %s", image_id, exc)
+        return Response({"error": "기존 이미지를 다운로드하지 못했습니다."}, status=status.HTTP_502_BAD_GATEWAY)
+
+    try:
+        openai_client = get_openai_client()
+    except ImproperlyConfigured as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    concurrency = getattr(settings, "REFINE_BATCH_CONCURRENCY", 4)
+    if _wants_stream(request, request.data):
+        outcomes = iter_refine_batch(base_image, prompts, openai_client, max_concurrency=concurrency)
+        return _event_stream_response(
+            _stream_refined_batch(outcomes, project_id, image_id, target_image.req_id, len(prompts))
+        )
+
+    outcomes = refine_batch(base_image, prompts, openai_client, max_concurrency=concurrency)
+    if not any(outcome["image"] is not None for outcome in outcomes):
+        return Response(
+            {"error": "모든 부분 수정 요청이 실패했습니다.", "errors": [_refine_error(o) for o in outcomes]},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    images, errors = _store_refined_batch(outcomes, project_id, image_id, target_image.req_id)
+    return Response(_refined_batch_payload(image_id, images, errors), status=status.HTTP_201_CREATED)
+
+
+@csrf_exempt
+@require_POST
+async def arefine_project_image_batch(request, project_id, image_id):
+    data = _request_data(request)
+    prompts = _refinement_prompts(data)
+    if prompts is None:
+        return _json_response(
+            {"error": f"refinement_prompts는 1~{getattr(settings, 'REFINE_BATCH_MAX_PROMPTS', 8)}개의 프롬프트 목록이어야 합니다."},
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        target_image = await AiMakeImage.objects.aget(project_id=project_id, image_id=image_id)
+    except AiMakeImage.DoesNotExist:
+        return _json_response({"error": "AI 이미지를 찾을 수 없습니다."}, status.HTTP_404_NOT_FOUND)
+
+    if not target_image.ai_image_path:
+        return _json_response({"error": "AI 이미지 경로가 비어 있습니다."}, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        source_bytes = await _aread_stored_image(target_image.ai_image_path)
+        base_image = ImageArtifact.from_bytes(source_bytes)
+    except Exception as exc:
+        logger.error("AI 이미지 다운로드 실패(image_id=%s): %s", image_id, exc)
+        return _json_response({"error": "기존 이미지를 다운로드하지 못했습니다."}, status.HTTP_502_BAD_GATEWAY)
+
+    try:
+        openai_client = get_async_openai_client()
+    except ImproperlyConfigured as exc:
+        return _json_response({"error": str(exc)}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    concurrency = getattr(settings, "REFINE_BATCH_CONCURRENCY", 4)
+    if _wants_stream(request, data):
+        outcomes = aiter_refine_batch(base_image, prompts, openai_client, max_concurrency=concurrency)
+        return _event_stream_response(
+            _astream_refined_batch(outcomes, project_id, image_id, target_image.req_id, len(prompts))
+        )
+
+    outcomes = await arefine_batch(base_image, prompts, openai_client, max_concurrency=concurrency)
+    if not any(outcome["image"] is not None for outcome in outcomes):
+        return _json_response(
+            {"error": "모든 부분 수정 요청이 실패했습니다.", "errors": [_refine_error(o) for o in outcomes]},
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    images, errors = await sync_to_async(_store_refined_batch)(outcomes, project_id, image_id, target_image.req_id)
+    return _json_response(_refined_batch_payload(image_id, images, errors), status.HTTP_201_CREATED)
+
+
+# ✅ 프로젝트 목록 조회 (유저별, 커서 페이지네이션)
+PROJECT_LIST_FIELDS = (
+    "project_id",
+    "project_name",
+    "description",
+    "status",
+    "project_image",
+    "create_date",
+    "update_date",
+)
+PROJECT_CURSOR_FIELDS = ("create_date", "project_id")
+
+
+def _first_request_prefetch():
+    # A sliced Prefetch becomes one ROW_NUMBER() query for the whole page.
+    return Prefetch(
+        "custom_requests",
+        queryset=CustomizeReq.objects.only(
+            "req_id",
+            "project_id",
+            "residence_type",
+            "space_type",
+            "budget_range",
+            "family_type",
+            "design_style",
+            "attachment_path",
+        ).order_by("req_id")[:1],
+        to_attr="first_requests",
+    )
+
+
+def _project_image_annotations():
+    # Correlated subqueries on ai_make_image(project_id, image_id): no extra query per project.
+    images = AiMakeImage.objects.filter(project_id=OuterRef("pk"))
+    return {
+        "variant_count": Coalesce(
+            Subquery(images.order_by().values("project_id").annotate(count=Count("pk")).values("count")[:1]),
+            0,
+        ),
+        # The selected design, otherwise the first one generated.
+        "cover_image": Subquery(
+            images.order_by(F("is_selected").desc(nulls_last=True), "image_id").values("ai_image_path")[:1]
+        ),
+    }
+
+
+def _project_page(user_id, cursor=None, limit=None):
+    """One page of the user's projects, newest first, in two queries."""
     projects = (
         Project.objects.filter(user_id=user_id)
-        .order_by("-create_date")
-        .prefetch_related("custom_requests")
+        .only(*PROJECT_LIST_FIELDS)
+        .annotate(**_project_image_annotations())
+        .prefetch_related(_first_request_prefetch())
     )
+    return keyset_page(projects, fields=PROJECT_CURSOR_FIELDS, cursor=cursor, limit=page_size(limit))
+
+
+def _project_list_item(project):
+    customize = project.first_requests[0] if project.first_requests else None
+    return {
+        "id": project.project_id,
+        "title": project.project_name,
+        "description": project.description,
+        "status": project.status,
+        "created_at": project.create_date,
+        "updated_at": project.update_date,
+        "project_image": project.project_image,
+        "project_image_sizes": responsive_urls(project.project_image),
+        "cover_image": project.cover_image or project.project_image,
+        "cover_image_sizes": responsive_urls(project.cover_image or project.project_image),
+        "variant_count": project.variant_count,
+        "residence_type": getattr(customize, "residence_type", None),
+        "space_type": getattr(customize, "space_type", None),
+        "budget_range": getattr(customize, "budget_range", None),
+        "family_type": getattr(customize, "family_type", None),
+        "design_style": getattr(customize, "design_style", None),
+        "attachment_path": getattr(customize, "attachment_path", None),
+    }
+
+
+@conditional_get(projects_validators)
+@api_view(["GET"])
+def list_projects(request, user_id):
+    try:
+        projects, next_cursor = _project_page(
+            user_id, request.query_params.get("cursor"), request.query_params.get("limit")
+        )
+    except InvalidCursor as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-    payload = []
-    for project in projects:
-        customize = project.custom_requests.first()
-        payload.append(
-            {
-                "id": project.project_id,
-                "title": project.project_name,
-                "description": project.description,
-                "status": project.status,
-                "created_at": project.create_date,
-                "updated_at": project.update_date,
-                "project_image": project.project_image,
-                "residence_type": getattr(customize, "residence_type", None),
-                "space_type": getattr(customize, "space_type", None),
-                "budget_range": getattr(customize, "budget_range", None),
-                "family_type": getattr(customize, "family_type", None),
-                "design_style": getattr(customize, "design_style", None),
-                "attachment_path": getattr(customize, "attachment_path", None),
-            }
+    return Response(
+        {"results": [_project_list_item(project) for project in projects], "next_cursor": next_cursor},
+        status=status.HTTP_200_OK,
+    )
+
+
+# ✅ 대시보드 (첫 페이지 + 표지 이미지/시안 수 + 통계를 한 번에, 쿼리 3개)
+@conditional_get(dashboard_validators)
+@api_view(["GET"])
+def dashboard(request, user_id):
+    try:
+        projects, next_cursor = _project_page(
+            user_id, request.query_params.get("cursor"), request.query_params.get("limit")
         )
+    except InvalidCursor as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response(payload, status=status.HTTP_200_OK)
+    return Response(
+        {
+            "projects": {"results": [_project_list_item(project) for project in projects], "next_cursor": next_cursor},
+            "stats": get_user_stats(user_id),
+        },
+        status=status.HTTP_200_OK,
+    )
 
 
+@conditional_get(project_images_validators)
 @api_view(["GET"])
 def list_project_ai_images(request, project_id):
     images = (
@@ -462,6 +1037,7 @@ def list_project_ai_images(request, project_id):
                 "project_id": image.project_id,
                 "req_id": getattr(req, "req_id", None),
                 "image_url": image.ai_image_path,
+                **responsive_urls(image.ai_image_path),
                 "is_selected": (image.is_selected or "").upper() == "Y",
                 "design_style": getattr(req, "design_style", None),
                 "residence_type": getattr(req, "residence_type", None),
@@ -479,40 +1055,24 @@ def list_project_ai_images(request, project_id):
 def update_project_status(request, project_id):
     new_status = request.data.get("status")
 
-    try:
-        project = Project.objects.get(project_id=project_id)
-    except Project.DoesNotExist:
-        return Response({"error": "프로젝트를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
-
-    project.status = new_status
-    project.save()
+    with transaction.atomic():
+        try:
+            project = Project.objects.select_for_update().get(project_id=project_id)
+        except Project.DoesNotExist:
+            return Response({"error": "프로젝트를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        old_status = project.status
+        project.status = new_status
+        project.save()
+        record_status_change(project.user_id, old_status, new_status)
     return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
 
 
-# ✅ 통계 (유저별)
+# ✅ 통계 (유저별) — 요약 테이블을 기본 키로 조회, 요약이 없으면 한 번의 집계 쿼리
+@method_decorator(conditional_get(stats_validators), name="get")
 class ProjectStatsView(APIView):
     def get(self, request, user_id):
-        try:
-            # ✅ FK 조인 안 하고 바로 user_id로 필터
-            projects = Project.objects.filter(user_id=user_id)
-        except Exception:
-            return Response({"error": "유효하지 않은 사용자입니다."}, status=status.HTTP_400_BAD_REQUEST)
-
-        total_projects = projects.count()
-        in_progress = projects.filter(status="progress").count()
-        completed = projects.filter(status="completed").count()
-
-        now = timezone.now()
-        last_month = now - timedelta(days=30)
-        created_recently = projects.filter(create_date__gte=last_month).count()
-
-        data = {
-            "total_projects": total_projects,
-            "in_progress": in_progress,
-            "completed": completed,
-            "recent_increase": created_recently,
-        }
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(get_user_stats(user_id), status=status.HTTP_200_OK)
 
 
 class AdminValidationMixin:
@@ -648,6 +1208,8 @@ class AdminUserDeleteView(AdminValidationMixin, APIView):
             if row[0] == "ADMIN":
                 return Response({"error": "다른 관리자 계정은 삭제할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-            cursor.execute("DELETE FROM users WHERE user_id = %s", [user_id])
+            with transaction.atomic():
+                cursor.execute("DELETE FROM users WHERE user_id = %s", [user_id])
+                forget_user(user_id)
 
         return Response({"message": "사용자 계정을 삭제했습니다."}, status=status.HTTP_200_OK)
@@ -21,9 +21,22 @@ if [ -n "$RUNNING" ]; then
     exit 0
 fi
 
+# Prometheus 다중 프로세스 지표 디렉터리 (서버와 워커가 공유, 시작할 때마다 초기화)
+export PROMETHEUS_MULTIPROC_DIR=/home/ubuntu/deploy/final/myproject/var/prometheus
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # nohup으로 백그라운드 실행 (가상환경 전용)
 nohup /home/ubuntu/deploy/final/myproject/venv/bin/python manage.py runserver 0.0.0.0:8000 --noreload > backend.log 2>&1 &
 disown
 
+# AI 파이프라인 워커 실행 (create_project가 등록한 작업을 처리)
+WORKER_RUNNING=$(ps aux | grep "manage.py run_pipeline_worker" | grep -v grep)
+if [ -z "$WORKER_RUNNING" ]; then
+    nohup /home/ubuntu/deploy/final/myproject/venv/bin/python manage.py run_pipeline_worker > worker.log 2>&1 &
+    disown
+fi
+
 echo "✅ Django 서버가 백그라운드에서 실행 중입니다."
 echo "로그 파일: /home/ubuntu/deploy/final/myproject/backend.log"
+echo "워커 로그: /home/ubuntu/deploy/final/myproject/worker.log"
@@ -11,3 +11,10 @@ else
     kill -9 $PID
     echo "🛑 Django 서버(PID: $PID)를 종료했습니다."
 fi
+
+WORKER_PID=$(ps aux | grep "manage.py run_pipeline_worker" | grep -v grep | awk '{print $2}')
+
+if [ -n "$WORKER_PID" ]; then
+    kill -TERM $WORKER_PID
+    echo "🛑 파이프라인 워커(PID: $WORKER_PID)에 종료 신호를 보냈습니다."
+fi